@@ -4,13 +4,13 @@ from colorama import just_fix_windows_console
 import crescent
 import hikari
 import miru
-import sys
+from crescent.utils import create_task
 from hikari.intents import Intents
-from PCBot.botdata import (
-    BotData, token_path, lavalink_password_path,
-    guild_id_path, get_token_file_path, ongaku_available
+from PCBot.botdata import BotData, ongaku_available, settings
+from PCBot.pluginmanager import (
+    register_commands, reload_plugins, restore_handlers
 )
-from PCBot.pluginmanager import reload_plugins
+from PCBot.pluginwatcher import watch_plugins
 # from PCBot.testing.mocking import make_guild_member, mock_command
 # from PCBot.testing.hikari.test_users_comparision import (
 #   make_interactions_member
@@ -19,42 +19,38 @@ from PCBot.pluginmanager import reload_plugins
 if ongaku_available:
     import ongaku
 
-# Load bot token
-with open(get_token_file_path(token_path)) as f:
-    token = f.read().strip()
-
-if sys.version_info.minor >= 11:
-    with open(get_token_file_path(lavalink_password_path)) as f:
-        lavalink_password = f.read().strip()
-
-# Load guild id
-with open(get_token_file_path(guild_id_path)) as f:
-    guild_id = int(f.read().strip())
+# Check secrets before starting, other secrets are loaded when first used
+settings.validate()
 
 # Create bot
 # GUILD_MESSAGES is required for miru
 # default_guild is needed to get register_commands to do a guild specific push
 bot = hikari.GatewayBot(
-    token, force_color=True,
+    settings.token, force_color=True,
     intents=Intents.GUILDS | Intents.GUILD_MESSAGES
             | hikari.Intents.GUILD_VOICE_STATES | Intents.MESSAGE_CONTENT
 )
 miru_client = miru.Client(bot)
 
 if ongaku_available:
-    ongaku_client = ongaku.Client(bot, password=lavalink_password)
+    ongaku_client = ongaku.Client(bot, password=settings.lavalink_password)
     model = BotData(miru_client, ongaku_client)
 else:
     model = BotData(miru_client)
-crescent_client = crescent.Client(bot, model, default_guild=guild_id)
+crescent_client = crescent.Client(bot, model, default_guild=settings.guild_id)
 
 
 async def load_plugins():
     """Load working plugins while ignoring others."""
     try:
         await reload_plugins(crescent_client.plugins, 'PCBot.plugins')
+        restore_handlers(crescent_client.plugins, bot)
     finally:
-        await crescent_client.commands.register_commands()
+        await register_commands(crescent_client, force=True)
+
+    # Reload plugins on save while testing, deployments run with -O
+    if __debug__:
+        create_task(watch_plugins(crescent_client, 'PCBot.plugins'))
 
 
 # Load plugins
@@ -4,6 +4,8 @@ import dataclasses
 import miru
 import os
 import sys
+from functools import cached_property
+from logging import getLogger
 
 try:
     import ongaku
@@ -11,14 +13,7 @@ try:
 except:
     ongaku_available = False
 
-@dataclasses.dataclass
-class BotData:
-    """Store data used in plugins, passed to crescent at startup as a model."""
-
-    miru: miru.Client
-    if ongaku_available:
-        ongaku_client: ongaku.Client
-
+logger = getLogger(__name__)
 
 token_path = './secrets/token'
 lavalink_password_path = './secrets/lavalink'
@@ -35,3 +30,83 @@ def get_token_file_path(file: str) -> str:
     if os.path.isfile(file + '.txt'):
         return file + '.txt'
     return file
+
+
+class Settings:
+    """Store secrets, each of which is only read from disk when first used.
+
+       This module is not reloaded so secrets are kept across plugin reloads.
+    """
+
+    def validate(self) -> None:
+        """Check secrets exist before starting, only reading required ones."""
+        required_paths = [token_path, guild_id_path]
+        if ongaku_available:
+            required_paths.append(lavalink_password_path)
+        missing = [
+          path for path in required_paths
+          if not os.path.isfile(get_token_file_path(path))
+        ]
+        if missing:
+            raise Exception(f'Required secrets are missing: {", ".join(missing)}')
+
+        # Read now so that bad values are found at startup instead of later
+        self.token
+        self.guild_id
+        if ongaku_available:
+            self.lavalink_password
+
+        for path in [gh_pem_path, aoc_cookie_path]:
+            if not os.path.isfile(get_token_file_path(path)):
+                logger.warning(f'Optional secret {path} is missing')
+
+    def _read(self, path: str) -> str:
+        file_path = get_token_file_path(path)
+        if not os.path.isfile(file_path):
+            raise Exception(f'Required secret {path} is missing')
+        with open(file_path) as f:
+            secret = f.read().strip()
+        if secret == '':
+            raise Exception(f'Secret {path} is empty')
+        return secret
+
+    @cached_property
+    def token(self) -> str:
+        """Discord bot token."""
+        return self._read(token_path)
+
+    @cached_property
+    def guild_id(self) -> int:
+        """Discord guild to register commands in."""
+        guild_id = self._read(guild_id_path)
+        if not guild_id.isdecimal():
+            raise Exception(f'Guild id in {guild_id_path} is not a number')
+        return int(guild_id)
+
+    @cached_property
+    def lavalink_password(self) -> str:
+        """Password used between the bot and the lavalink server."""
+        return self._read(lavalink_password_path)
+
+    @cached_property
+    def aoc_cookie(self) -> str:
+        """Advent of code session cookie."""
+        return self._read(aoc_cookie_path)
+
+    @cached_property
+    def gh_private_pem(self) -> bytes:
+        """Github app private key."""
+        return self._read(gh_pem_path).encode()
+
+
+settings = Settings()
+
+
+@dataclasses.dataclass
+class BotData:
+    """Store data used in plugins, passed to crescent at startup as a model."""
+
+    miru: miru.Client
+    if ongaku_available:
+        ongaku_client: ongaku.Client
+    settings: Settings = dataclasses.field(default_factory=lambda: settings)
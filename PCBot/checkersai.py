@@ -0,0 +1,324 @@
+"""This module contains the search used by the checkers bot opponent."""
+# pyright: strict
+
+# The search is a negamax alpha-beta search that deepens one move at a time
+# until it runs out of time, keeping the best move from the last search that
+# finished. Positions are hashed with Zobrist keys, updated as moves are made,
+# into a fixed size transposition table shared between searches. Each jump of a
+# multi-jump is searched as its own move without using up depth, the turn
+# only passing once the token can't capture again. Captures are mandatory so
+# quiescence search keeps following them past the last move and a position is
+# only ever scored once the player moving has nothing to capture.
+
+from random import Random
+from time import perf_counter
+from typing import NamedTuple, Optional
+from PCBot.checkersengine import (
+  apply_move, CheckersMove, CheckersMoveResult, CheckersPosition,
+  get_captured_square, get_jumps, get_simple_moves, is_capture, square_count
+)
+
+man_value: int = 100
+king_value: int = 160
+advanced_value: int = 4
+back_row_value: int = 6
+centre_value: int = 3
+win_score: int = 100_000
+# Scores further from zero than this are a win or loss a number of moves away
+win_threshold: int = win_score - 1000
+
+# Rows 0 to 3 and 4 to 7
+player1_advanced: int = 0x0000FFFF
+player2_advanced: int = 0xFFFF0000
+player1_back_row: int = 0xF0000000
+player2_back_row: int = 0x0000000F
+centre: int = 1 << 13 | 1 << 14 | 1 << 17 | 1 << 18
+
+max_search_depth: int = 40
+# How often, in nodes, to check if the search is out of time
+timeout_check_interval: int = 256
+transposition_table_bits: int = 16
+
+# Bounds of a transposition table score
+exact_bound: int = 0
+lower_bound: int = 1
+upper_bound: int = 2
+
+# Token kinds are player 1 man and king then player 2 man and king
+zobrist_random = Random(0)
+zobrist_tokens: tuple[tuple[int, ...], ...] = tuple(
+  tuple(zobrist_random.getrandbits(64) for _ in range(square_count))
+  for _ in range(4)
+)
+zobrist_player2: int = zobrist_random.getrandbits(64)
+zobrist_chains: tuple[int, ...] = tuple(
+  zobrist_random.getrandbits(64) for _ in range(square_count)
+)
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult(NamedTuple):
+    move: Optional[CheckersMove]
+    # From the point of view of the player moving
+    score: int
+    depth: int
+    nodes: int
+    seconds: float
+
+
+class TranspositionEntry(NamedTuple):
+    key: int
+    depth: int
+    score: int
+    bound: int
+    move: Optional[CheckersMove]
+    generation: int
+
+
+class TranspositionTable:
+    """Fixed size table of searched positions. A slot keeps the deepest search
+       stored in it, unless that came from searching an earlier move."""
+
+    entries: list[Optional[TranspositionEntry]]
+    mask: int
+    generation: int = 0
+
+    def __init__(self, bits: int = transposition_table_bits):
+        self.entries = [None] * (1 << bits)
+        self.mask = (1 << bits) - 1
+
+    def get(self, key: int) -> Optional[TranspositionEntry]:
+        entry: Optional[TranspositionEntry] = self.entries[key & self.mask]
+        if entry is None or entry.key != key:
+            return None
+        return entry
+
+    def store(
+      self, key: int, depth: int, score: int, bound: int,
+      move: Optional[CheckersMove]
+    ) -> None:
+        slot: int = key & self.mask
+        entry: Optional[TranspositionEntry] = self.entries[slot]
+        if (entry is not None and entry.generation == self.generation and
+            entry.depth > depth):
+            return
+        self.entries[slot] = TranspositionEntry(
+          key, depth, score, bound, move, self.generation
+        )
+
+
+def get_hash(
+  position: CheckersPosition, player1_to_move: bool, chain: Optional[int]
+) -> int:
+    key: int = 0 if player1_to_move else zobrist_player2
+    if chain is not None:
+        key ^= zobrist_chains[chain]
+    for square in range(square_count):
+        square_bit: int = 1 << square
+        king: int = 1 if position.kings & square_bit else 0
+        if position.player1 & square_bit:
+            key ^= zobrist_tokens[king][square]
+        elif position.player2 & square_bit:
+            key ^= zobrist_tokens[2 + king][square]
+    return key
+
+
+def evaluate(position: CheckersPosition, player1_to_move: bool) -> int:
+    """Score a position for the player moving, mostly by tokens left."""
+    player1, player2, kings = position
+    player1_men: int = player1 & ~kings
+    player2_men: int = player2 & ~kings
+    score: int = (
+      (player1_men.bit_count() - player2_men.bit_count()) * man_value +
+      ((player1 & kings).bit_count() - (player2 & kings).bit_count())
+        * king_value +
+      ((player1_men & player1_advanced).bit_count() -
+       (player2_men & player2_advanced).bit_count()) * advanced_value +
+      ((player1_men & player1_back_row).bit_count() -
+       (player2_men & player2_back_row).bit_count()) * back_row_value +
+      ((player1 & centre).bit_count() - (player2 & centre).bit_count())
+        * centre_value
+    )
+    return score if player1_to_move else -score
+
+
+def get_moves(
+  position: CheckersPosition, player1_to_move: bool, chain: Optional[int]
+) -> list[CheckersMove]:
+    """Find every step a player can make next, a capture being mandatory."""
+    if chain is not None:
+        return get_jumps(position, player1_to_move, 1 << chain)
+    return (get_jumps(position, player1_to_move) or
+            get_simple_moves(position, player1_to_move))
+
+
+class CheckersSearch:
+    """State for a single search, see find_best_move."""
+
+    table: TranspositionTable
+    deadline: float
+    nodes: int = 0
+    best_move: Optional[CheckersMove] = None
+    # Indexed by source square * 32 + target square
+    history: list[int]
+
+    def __init__(self, table: TranspositionTable, deadline: float):
+        self.table = table
+        self.deadline = deadline
+        self.history = [0] * (square_count * square_count)
+
+    def order_moves(
+      self, position: CheckersPosition, moves: list[CheckersMove],
+      table_move: Optional[CheckersMove]
+    ) -> list[CheckersMove]:
+        """Sort moves so the best from an earlier search goes first, then
+           captures of kings, other captures and moves that often cut off."""
+        def move_order(move: CheckersMove) -> int:
+            if move == table_move:
+                return 1 << 62
+            if is_capture(move):
+                if position.kings & 1 << get_captured_square(move):
+                    return 1 << 61
+                return 1 << 60
+            return self.history[move[0] * square_count + move[1]]
+        return sorted(moves, key=move_order, reverse=True)
+
+    def search(
+      self, position: CheckersPosition, player1_to_move: bool,
+      chain: Optional[int], key: int, depth: int, ply: int, alpha: int,
+      beta: int
+    ) -> int:
+        """Find the score of position for the player moving, a token on
+           chain having just captured and needing to keep going."""
+        self.nodes += 1
+        if (self.nodes % timeout_check_interval == 0 and
+            perf_counter() > self.deadline):
+            raise SearchTimeout()
+
+        moves: list[CheckersMove] = get_moves(position, player1_to_move, chain)
+        if len(moves) == 0:
+            return ply - win_score
+        # Quiescence, only a forced capture is searched past the last move
+        if depth <= 0 and not is_capture(moves[0]):
+            return evaluate(position, player1_to_move)
+
+        original_alpha: int = alpha
+        table_move: Optional[CheckersMove] = None
+        if depth > 0:
+            entry: Optional[TranspositionEntry] = self.table.get(key)
+            if entry is not None:
+                table_move = entry.move
+                if entry.depth >= depth and ply > 0:
+                    score: int = entry.score
+                    if score > win_threshold:
+                        score -= ply
+                    elif score < -win_threshold:
+                        score += ply
+                    if (entry.bound == exact_bound or
+                        (entry.bound == lower_bound and score >= beta) or
+                        (entry.bound == upper_bound and score <= alpha)):
+                        return score
+
+        best_score: int = -win_score - 1
+        best_move: Optional[CheckersMove] = None
+        own_token_kind: int = 0 if player1_to_move else 2
+        for move in self.order_moves(position, moves, table_move):
+            source, target = move
+            token_kind: int = own_token_kind + (position.kings >> source & 1)
+            result: CheckersMoveResult = apply_move(
+              position, player1_to_move, move
+            )
+            child_key: int = (
+              key ^ zobrist_tokens[token_kind][source] ^
+              zobrist_tokens[token_kind | result.promoted][target]
+            )
+            if chain is not None:
+                child_key ^= zobrist_chains[chain]
+            if result.captured is not None:
+                child_key ^= zobrist_tokens[
+                  2 - own_token_kind + (position.kings >> result.captured & 1)
+                ][result.captured]
+
+            if (result.captured is not None and not result.promoted and
+                len(get_jumps(result.position, player1_to_move, 1 << target))
+                  > 0):
+                score = self.search(
+                  result.position, player1_to_move, target,
+                  child_key ^ zobrist_chains[target], depth, ply + 1, alpha,
+                  beta
+                )
+            else:
+                score = -self.search(
+                  result.position, not player1_to_move, None,
+                  child_key ^ zobrist_player2, depth - 1, ply + 1, -beta,
+                  -alpha
+                )
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if ply == 0:
+                    self.best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                if depth > 0 and not is_capture(move):
+                    self.history[source * square_count + target] += \
+                      depth * depth
+                break
+
+        if depth > 0:
+            bound: int = exact_bound
+            if best_score <= original_alpha:
+                bound = upper_bound
+            elif best_score >= beta:
+                bound = lower_bound
+            stored_score: int = best_score
+            if stored_score > win_threshold:
+                stored_score += ply
+            elif stored_score < -win_threshold:
+                stored_score -= ply
+            self.table.store(key, depth, stored_score, bound, best_move)
+        return best_score
+
+
+def find_best_move(
+  table: TranspositionTable, position: CheckersPosition,
+  player1_to_move: bool, chain: Optional[int], seconds: float,
+  max_depth: int = max_search_depth
+) -> SearchResult:
+    """Search deeper until seconds have passed, returning the best move found
+       by the deepest search that finished."""
+    start_time: float = perf_counter()
+    moves: list[CheckersMove] = get_moves(position, player1_to_move, chain)
+    if len(moves) <= 1:
+        return SearchResult(
+          moves[0] if moves else None, 0, 0, 0, perf_counter() - start_time
+        )
+
+    table.generation += 1
+    search = CheckersSearch(table, start_time + seconds)
+    key: int = get_hash(position, player1_to_move, chain)
+    best_move: CheckersMove = moves[0]
+    best_score: int = 0
+    depth: int = 0
+    try:
+        for search_depth in range(1, max_depth + 1):
+            score: int = search.search(
+              position, player1_to_move, chain, key, search_depth, 0,
+              -win_score - 1, win_score + 1
+            )
+            assert search.best_move is not None
+            best_move = search.best_move
+            best_score = score
+            depth = search_depth
+            # Deeper searches can't find a faster win or escape a loss
+            if abs(score) > win_threshold:
+                break
+    except SearchTimeout:
+        pass
+    return SearchResult(
+      best_move, best_score, depth, search.nodes, perf_counter() - start_time
+    )
@@ -0,0 +1,195 @@
+"""This module contains the on disk archive of finished checkers games."""
+# pyright: strict
+
+# Games are appended as PDN text to one file while an index file holds an
+# append only log of fixed size records, each of which is a game_record in the
+# same order as CheckersArchiveEntry and says where the PDN of a game is. Only
+# the index is read on load and while doing so the games of each pair of
+# players and the wins between them are counted, so head to head stats never
+# need to read any PDN and an archived game is found with a single seek.
+
+from logging import getLogger, Logger
+from pathlib import Path
+from struct import pack, Struct
+from typing import BinaryIO, NamedTuple, Optional
+
+logger: Logger = getLogger(__name__)
+
+games_path = './data/checkers-games.pdn'
+index_path = './data/checkers-games.idx'
+
+# Increment when the layout of records changes
+index_format_version: int = 1
+index_header: bytes = b'PCCA' + pack('<H', index_format_version)
+
+game_record = Struct('<QQQBHQI')
+
+# Values of CheckersArchiveEntry.winner
+no_winner: int = 0
+player1_winner: int = 1
+player2_winner: int = 2
+
+
+class CheckersArchiveEntry(NamedTuple):
+    # Unix timestamp in seconds
+    finished_at: int
+    player1_id: int
+    player2_id: int
+    winner: int
+    move_count: int
+    # Where the PDN is in the games file, in bytes
+    offset: int
+    length: int
+
+
+class CheckersHeadToHead(NamedTuple):
+    """Results of the games between two users from the first user's side."""
+    games: int
+    wins: int
+    losses: int
+    # Ids of the games, oldest first
+    game_ids: list[int]
+
+
+class CheckersArchive:
+    """Append only store of finished games indexed by the players."""
+
+    games_path: Path
+    index_path: Path
+    # Indexed by game id
+    entries: list[CheckersArchiveEntry]
+    # Lowest and highest user id to the ids of their games, oldest first
+    pair_games: dict[tuple[int, int], list[int]]
+    # Winner and loser user id to the number of wins
+    pair_wins: dict[tuple[int, int], int]
+    # User id to the ids of their games, oldest first
+    user_games: dict[int, list[int]]
+
+    _games_file: Optional[BinaryIO] = None
+    _index_file: Optional[BinaryIO] = None
+
+    def __init__(
+      self, games_path: str = games_path, index_path: str = index_path
+    ):
+        self.games_path = Path(games_path)
+        self.index_path = Path(index_path)
+        self.entries = []
+        self.pair_games = {}
+        self.pair_wins = {}
+        self.user_games = {}
+
+    def load(self) -> None:
+        """Read the index from disk and rebuild the player lookups."""
+        self.close()
+        self.entries = []
+        self.pair_games = {}
+        self.pair_wins = {}
+        self.user_games = {}
+
+        data: bytes = b''
+        if self.index_path.is_file():
+            data = self.index_path.read_bytes()
+        if not data.startswith(index_header):
+            if len(data) != 0:
+                logger.warning(f'Ignoring {self.index_path} with unknown '
+                               'format')
+            return
+
+        end: int = len(data) - (len(data) - len(index_header)) \
+          % game_record.size
+        if end != len(data):
+            logger.warning('Ignoring partially written game in '
+                           f'{self.index_path}')
+        games_size: int = 0
+        if self.games_path.is_file():
+            games_size = self.games_path.stat().st_size
+        for fields in game_record.iter_unpack(
+          memoryview(data)[len(index_header):end]
+        ):
+            entry = CheckersArchiveEntry(*fields)
+            if entry.offset + entry.length > games_size:
+                logger.warning(f'Ignoring game missing from {self.games_path}')
+                break
+            self._index(entry)
+
+    def add(
+      self, pdn: str, finished_at: int, player1_id: int, player2_id: int,
+      winner: int, move_count: int
+    ) -> int:
+        """Record a game, returning its id."""
+        if self._games_file is None or self._index_file is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self.games_path.parent.mkdir(parents=True, exist_ok=True)
+            new_index: bool = not self.index_path.is_file()
+            self._games_file = open(self.games_path, 'ab')
+            self._index_file = open(self.index_path, 'ab')
+            if new_index:
+                self._index_file.write(index_header)
+
+        # Games are separated by a blank line so the file is valid PDN
+        text: bytes = pdn.strip().encode() + b'\n\n'
+        entry = CheckersArchiveEntry(
+          finished_at, player1_id, player2_id, winner, move_count,
+          self._games_file.seek(0, 2), len(text)
+        )
+        # The game is written first so the index never points past the end
+        self._games_file.write(text)
+        self._games_file.flush()
+        self._index_file.write(game_record.pack(*entry))
+        self._index_file.flush()
+        return self._index(entry)
+
+    def get_entry(self, game_id: int) -> Optional[CheckersArchiveEntry]:
+        if not 0 <= game_id < len(self.entries):
+            return None
+        return self.entries[game_id]
+
+    def read_game(self, game_id: int) -> Optional[str]:
+        entry: Optional[CheckersArchiveEntry] = self.get_entry(game_id)
+        if entry is None:
+            return None
+        with open(self.games_path, 'rb') as games_file:
+            games_file.seek(entry.offset)
+            return games_file.read(entry.length).decode().strip()
+
+    def get_user_games(self, user_id: int) -> list[int]:
+        return self.user_games.get(user_id, [])
+
+    def get_head_to_head(
+      self, user_id: int, opponent_id: int
+    ) -> CheckersHeadToHead:
+        game_ids: list[int] = self.pair_games.get(
+          (min(user_id, opponent_id), max(user_id, opponent_id)), []
+        )
+        return CheckersHeadToHead(
+          len(game_ids), self.pair_wins.get((user_id, opponent_id), 0),
+          self.pair_wins.get((opponent_id, user_id), 0), game_ids
+        )
+
+    def close(self) -> None:
+        for archive_file in (self._games_file, self._index_file):
+            if archive_file is not None:
+                archive_file.close()
+        self._games_file = None
+        self._index_file = None
+
+    def _index(self, entry: CheckersArchiveEntry) -> int:
+        game_id: int = len(self.entries)
+        self.entries.append(entry)
+        player1_id: int = entry.player1_id
+        player2_id: int = entry.player2_id
+        self.pair_games.setdefault(
+          (min(player1_id, player2_id), max(player1_id, player2_id)), []
+        ).append(game_id)
+        self.user_games.setdefault(player1_id, []).append(game_id)
+        if player2_id != player1_id:
+            self.user_games.setdefault(player2_id, []).append(game_id)
+
+        if entry.winner == player1_winner:
+            pair: tuple[int, int] = (player1_id, player2_id)
+        elif entry.winner == player2_winner:
+            pair = (player2_id, player1_id)
+        else:
+            return game_id
+        self.pair_wins[pair] = self.pair_wins.get(pair, 0) + 1
+        return game_id
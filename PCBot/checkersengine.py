@@ -0,0 +1,270 @@
+"""This module contains the bitboard move generator used by checkers."""
+# pyright: strict
+
+# Only the 32 dark squares can hold tokens so they are numbered from the top
+# left, four per row, and square s is in row s // 4. The tokens of each player
+# and which tokens are kings are each stored as an int with one bit per
+# square. Dark squares alternate between starting each row and ending it so a
+# diagonal step shifts by a different amount from even and odd rows, with the
+# squares on an edge that would wrap around to the next row masked out first.
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+board_size: int = 8
+square_count: int = 32
+
+all_squares: int = 0xFFFFFFFF
+even_rows: int = 0x0F0F0F0F
+odd_rows: int = 0xF0F0F0F0
+# Dark squares in odd rows start at column 0 and in even rows end at column 7
+left_edge: int = 0x10101010
+right_edge: int = 0x08080808
+player1_back_row: int = 0xF0000000
+player2_back_row: int = 0x0000000F
+
+# Enough for every position in a few games of searching
+legal_move_cache_size: int = 1 << 16
+
+
+class CheckersDirection(NamedTuple):
+    """How far a diagonal step moves a square, which is negative for up, and
+       the squares that can take the step."""
+    even_shift: int
+    even_mask: int
+    odd_shift: int
+    odd_mask: int
+
+
+up_left = CheckersDirection(-4, even_rows, -5, odd_rows & ~left_edge)
+up_right = CheckersDirection(-3, even_rows & ~right_edge, -4, odd_rows)
+down_left = CheckersDirection(4, even_rows, 3, odd_rows & ~left_edge)
+down_right = CheckersDirection(5, even_rows & ~right_edge, 4, odd_rows)
+up_directions: tuple[CheckersDirection, ...] = (up_left, up_right)
+down_directions: tuple[CheckersDirection, ...] = (down_left, down_right)
+
+
+class CheckersPosition(NamedTuple):
+    """The squares holding each player's tokens and which of them are kings.
+       Player 1 moves up the board and player 2 moves down."""
+    player1: int
+    player2: int
+    kings: int = 0
+
+
+initial_position = CheckersPosition(0xFFF00000, 0x00000FFF)
+
+
+class CheckersMoveResult(NamedTuple):
+    position: CheckersPosition
+    captured: Optional[int]
+    promoted: bool
+
+
+# Source and target square
+CheckersMove = tuple[int, int]
+# Every square a token stops on during a turn, more than two if it captures
+# several tokens
+CheckersMovePath = tuple[int, ...]
+
+
+def get_square(row: int, column: int) -> Optional[int]:
+    """Convert a row and column into a square, or None for a light square."""
+    if row % 2 == column % 2:
+        return None
+    return row * 4 + column // 2
+
+
+def get_row_column(square: int) -> tuple[int, int]:
+    row: int = square >> 2
+    return row, (square & 3) * 2 + 1 - (row & 1)
+
+
+def shift_squares(squares: int, direction: CheckersDirection) -> int:
+    """Move every square in squares one step in direction, dropping any that
+       would leave the board."""
+    even: int = squares & direction.even_mask
+    odd: int = squares & direction.odd_mask
+    if direction.even_shift < 0:
+        return even >> -direction.even_shift | odd >> -direction.odd_shift
+    return (even << direction.even_shift | odd << direction.odd_shift) \
+      & all_squares
+
+
+def step_back(square: int, direction: CheckersDirection) -> int:
+    """Find the square that a step in direction reached square from."""
+    # The step came from the other kind of row
+    if square >> 2 & 1:
+        return square - direction.even_shift
+    return square - direction.odd_shift
+
+
+def is_capture(move: CheckersMove) -> bool:
+    return abs((move[1] >> 2) - (move[0] >> 2)) == 2
+
+
+def get_movers(
+  position: CheckersPosition, player1_to_move: bool
+) -> tuple[tuple[CheckersDirection, int], ...]:
+    """Pair each direction with the tokens of the player that can move in
+       it."""
+    if player1_to_move:
+        own: int = position.player1
+        return (
+          (up_left, own), (up_right, own),
+          (down_left, own & position.kings), (down_right, own & position.kings)
+        )
+    own = position.player2
+    return (
+      (down_left, own), (down_right, own),
+      (up_left, own & position.kings), (up_right, own & position.kings)
+    )
+
+
+def get_simple_moves(
+  position: CheckersPosition, player1_to_move: bool
+) -> list[CheckersMove]:
+    """Find every move to an adjacent empty square."""
+    empty: int = ~(position.player1 | position.player2) & all_squares
+    moves: list[CheckersMove] = []
+    for direction, movers in get_movers(position, player1_to_move):
+        targets: int = shift_squares(movers, direction) & empty
+        while targets:
+            target_bit: int = targets & -targets
+            targets ^= target_bit
+            target: int = target_bit.bit_length() - 1
+            moves.append((step_back(target, direction), target))
+    return moves
+
+
+def get_jumps(
+  position: CheckersPosition, player1_to_move: bool,
+  sources: int = all_squares
+) -> list[CheckersMove]:
+    """Find every capture by tokens on the sources squares."""
+    empty: int = ~(position.player1 | position.player2) & all_squares
+    opponent: int = position.player2 if player1_to_move else position.player1
+    moves: list[CheckersMove] = []
+    for direction, movers in get_movers(position, player1_to_move):
+        captured: int = shift_squares(movers & sources, direction) & opponent
+        targets: int = shift_squares(captured, direction) & empty
+        while targets:
+            target_bit: int = targets & -targets
+            targets ^= target_bit
+            target: int = target_bit.bit_length() - 1
+            moves.append(
+              (step_back(step_back(target, direction), direction), target)
+            )
+    return moves
+
+
+def get_captured_square(move: CheckersMove) -> int:
+    """Find the square jumped over by a capture."""
+    source, target = move
+    # Squares in even rows are one column to the right of their number
+    return (source + target + 1 - (source >> 2 & 1)) >> 1
+
+
+def apply_move(
+  position: CheckersPosition, player1_to_move: bool, move: CheckersMove
+) -> CheckersMoveResult:
+    """Move a token without checking the move is valid, removing any captured
+       token and promoting it if it reaches the far side of the board."""
+    source_bit: int = 1 << move[0]
+    target_bit: int = 1 << move[1]
+    player1, player2, kings = position
+
+    captured: Optional[int] = None
+    if is_capture(move):
+        captured = get_captured_square(move)
+        captured_mask: int = ~(1 << captured)
+        player1 &= captured_mask
+        player2 &= captured_mask
+        kings &= captured_mask
+
+    promoted: bool = False
+    if kings & source_bit:
+        kings ^= source_bit | target_bit
+    elif target_bit & (player2_back_row if player1_to_move
+                       else player1_back_row):
+        kings |= target_bit
+        promoted = True
+
+    if player1_to_move:
+        player1 ^= source_bit | target_bit
+    else:
+        player2 ^= source_bit | target_bit
+    return CheckersMoveResult(
+      CheckersPosition(player1, player2, kings), captured, promoted
+    )
+
+
+def apply_path(
+  position: CheckersPosition, player1_to_move: bool, path: CheckersMovePath
+) -> CheckersPosition:
+    for source, target in zip(path, path[1:]):
+        position = apply_move(position, player1_to_move, (source, target)).position
+    return position
+
+
+def _add_jump_paths(
+  position: CheckersPosition, player1_to_move: bool, path: CheckersMovePath,
+  paths: list[CheckersMovePath]
+) -> None:
+    """Follow every capture from the end of path until the token can't
+       capture again or is promoted, which ends the turn."""
+    for jump in get_jumps(position, player1_to_move, 1 << path[-1]):
+        result: CheckersMoveResult = apply_move(position, player1_to_move, jump)
+        jump_path: CheckersMovePath = path + (jump[1],)
+        if result.promoted or len(
+          get_jumps(result.position, player1_to_move, 1 << jump[1])
+        ) == 0:
+            paths.append(jump_path)
+        else:
+            _add_jump_paths(result.position, player1_to_move, jump_path, paths)
+
+
+@lru_cache(maxsize=legal_move_cache_size)
+def get_legal_moves(
+  position: CheckersPosition, player1_to_move: bool,
+  chain: Optional[int] = None
+) -> tuple[CheckersMovePath, ...]:
+    """Find every move the player can make, capturing when possible and then
+       for as long as possible. A chain is the square of a token part way
+       through capturing that has to keep going."""
+    paths: list[CheckersMovePath] = []
+    if chain is not None:
+        _add_jump_paths(position, player1_to_move, (chain,), paths)
+        return tuple(paths)
+
+    sources: int = 0
+    for source, _ in get_jumps(position, player1_to_move):
+        sources |= 1 << source
+    if sources == 0:
+        return tuple(get_simple_moves(position, player1_to_move))
+
+    while sources:
+        source_bit: int = sources & -sources
+        sources ^= source_bit
+        _add_jump_paths(
+          position, player1_to_move, (source_bit.bit_length() - 1,), paths
+        )
+    return tuple(paths)
+
+
+def perft(
+  position: CheckersPosition, player1_to_move: bool, depth: int
+) -> int:
+    """Count the positions reached by playing every legal move to depth."""
+    if depth == 0:
+        return 1
+    moves: tuple[CheckersMovePath, ...] = get_legal_moves(
+      position, player1_to_move
+    )
+    if depth == 1:
+        return len(moves)
+    return sum(
+      perft(apply_path(position, player1_to_move, path),
+            not player1_to_move, depth - 1)
+      for path in moves
+    )
@@ -0,0 +1,236 @@
+"""This module contains reading and writing checkers games as PDN."""
+# pyright: strict
+
+# Portable Draughts Notation numbers the dark squares from 1 to 32 starting on
+# the side of Black, who moves first, so player 1 is Black and PDN square 1 is
+# engine square 31. A move lists the squares its token stops on joined by x if
+# it captures or - if not, though a multi-jump can just give the first and
+# last squares. Results give White's score first, like chess notation.
+
+from re import compile, Pattern
+from typing import Iterable, NamedTuple, Optional
+from PCBot.checkersengine import (
+  apply_path, CheckersMovePath, CheckersPosition, get_legal_moves,
+  initial_position, is_capture, square_count
+)
+
+# English draughts
+pdn_game_type: str = '21'
+player1_win_result: str = '0-1'
+player2_win_result: str = '1-0'
+unfinished_result: str = '*'
+results: frozenset[str] = frozenset(
+  (player1_win_result, player2_win_result, unfinished_result, '1/2-1/2')
+)
+line_length: int = 80
+
+tag_pattern: Pattern[str] = compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# Comments, variations and annotation glyphs are ignored
+ignored_pattern: Pattern[str] = compile(r'\{[^}]*\}|\([^()]*\)|\$\d+')
+move_pattern: Pattern[str] = compile(r'(?:\d+\.+)?(\d+(?:[-x]\d+)+)[!?]*')
+move_number_pattern: Pattern[str] = compile(r'\d+\.+')
+
+
+class PdnGame(NamedTuple):
+    tags: dict[str, str]
+    start_position: CheckersPosition
+    start_player1_to_move: bool
+    moves: tuple[CheckersMovePath, ...]
+    result: str
+    # After every move
+    position: CheckersPosition
+    player1_to_move: bool
+    # Square of a token part way through capturing if the last move is only
+    # the start of a multi-jump
+    chain: Optional[int] = None
+
+
+def to_pdn_square(square: int) -> int:
+    return square_count - square
+
+
+def from_pdn_square(number: int) -> int:
+    if not 1 <= number <= square_count:
+        raise ValueError(f'{number} is not a square')
+    return square_count - number
+
+
+def format_move(path: CheckersMovePath) -> str:
+    separator: str = 'x' if is_capture((path[0], path[1])) else '-'
+    return separator.join(str(to_pdn_square(square)) for square in path)
+
+
+def format_fen(position: CheckersPosition, player1_to_move: bool) -> str:
+    """Describe a position in the FEN tag format, like B:W21,K22:B1,2."""
+    pieces: list[str] = []
+    for colour, tokens in (('W', position.player2), ('B', position.player1)):
+        squares: list[str] = [
+          ('K' if position.kings & 1 << square else '') +
+            str(to_pdn_square(square))
+          for square in sorted(
+            (square for square in range(square_count) if tokens & 1 << square),
+            key=to_pdn_square
+          )
+        ]
+        pieces.append(colour + ','.join(squares))
+    return ('B' if player1_to_move else 'W') + ':' + ':'.join(pieces)
+
+
+def parse_fen(fen: str) -> tuple[CheckersPosition, bool]:
+    fields: list[str] = fen.strip().rstrip('.').split(':')
+    if len(fields) != 3 or fields[0].upper() not in ('B', 'W'):
+        raise ValueError(f'{fen} is not a FEN position')
+    player1: int = 0
+    player2: int = 0
+    kings: int = 0
+    for field in fields[1:]:
+        colour: str = field[:1].upper()
+        if colour not in ('B', 'W'):
+            raise ValueError(f'{fen} is not a FEN position')
+        for piece in filter(None, field[1:].split(',')):
+            king: bool = piece[:1].upper() == 'K'
+            if not piece.lstrip('Kk').isdecimal():
+                raise ValueError(f'{piece} is not a FEN piece')
+            square_bit: int = 1 << from_pdn_square(int(piece.lstrip('Kk')))
+            # Moves would corrupt a position with two tokens on a square
+            if (player1 | player2) & square_bit:
+                raise ValueError(f'{piece.lstrip("Kk")} is given more than '
+                                 'once')
+            if colour == 'B':
+                player1 |= square_bit
+            else:
+                player2 |= square_bit
+            if king:
+                kings |= square_bit
+    return (
+      CheckersPosition(player1, player2, kings), fields[0].upper() == 'B'
+    )
+
+
+def escape_tag(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def unescape_tag(value: str) -> str:
+    return value.replace('\\"', '"').replace('\\\\', '\\')
+
+
+def format_movetext(
+  moves: Iterable[CheckersMovePath], start_player1_to_move: bool = True
+) -> str:
+    """Number and join moves, wrapping them into lines."""
+    tokens: list[str] = []
+    if not start_player1_to_move:
+        tokens.append('1...')
+    for index, path in enumerate(moves, 0 if start_player1_to_move else 1):
+        if index % 2 == 0:
+            tokens.append(f'{index // 2 + 1}.')
+        tokens.append(format_move(path))
+
+    lines: list[str] = []
+    line: str = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > line_length:
+            lines.append(line)
+            line = token
+        else:
+            line = f'{line} {token}' if line else token
+    if line:
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def write_pdn(
+  tags: dict[str, str], moves: Iterable[CheckersMovePath], result: str,
+  start_position: CheckersPosition = initial_position,
+  start_player1_to_move: bool = True
+) -> str:
+    """Write a game with its tags, adding the game type, result and any
+       starting position."""
+    all_tags: dict[str, str] = dict(tags)
+    all_tags['Result'] = result
+    all_tags['GameType'] = pdn_game_type
+    if start_position != initial_position or not start_player1_to_move:
+        all_tags['FEN'] = format_fen(start_position, start_player1_to_move)
+
+    text: str = ''.join(
+      f'[{name} "{escape_tag(value)}"]\n' for name, value in all_tags.items()
+    )
+    movetext: str = format_movetext(moves, start_player1_to_move)
+    return f'{text}\n{movetext} {result}' if movetext else f'{text}\n{result}'
+
+
+def read_pdn(text: str) -> PdnGame:
+    """Read a game, checking every move is legal. Raises ValueError
+       describing the first problem found."""
+    tags: dict[str, str] = {
+      name: unescape_tag(value) for name, value in tag_pattern.findall(text)
+    }
+    if tags.get('GameType', pdn_game_type).split(',')[0] != pdn_game_type:
+        raise ValueError('Only English draughts games can be read')
+
+    start_position: CheckersPosition = initial_position
+    start_player1_to_move: bool = True
+    if 'FEN' in tags:
+        start_position, start_player1_to_move = parse_fen(tags['FEN'])
+
+    movetext: str = tag_pattern.sub(' ', text)
+    previous_movetext: Optional[str] = None
+    while movetext != previous_movetext:
+        previous_movetext = movetext
+        movetext = ignored_pattern.sub(' ', movetext)
+
+    position: CheckersPosition = start_position
+    player1_to_move: bool = start_player1_to_move
+    moves: list[CheckersMovePath] = []
+    chain: Optional[int] = None
+    result: str = tags.get('Result', unfinished_result)
+    for token in movetext.split():
+        if token in results:
+            result = token
+            continue
+        if move_number_pattern.fullmatch(token):
+            continue
+        move_match = move_pattern.fullmatch(token)
+        if move_match is None:
+            raise ValueError(f'{token} is not a move')
+        if chain is not None:
+            raise ValueError(f'{format_move(moves[-1])} does not finish '
+                             'capturing')
+
+        path: CheckersMovePath = tuple(
+          from_pdn_square(int(number))
+          for number in move_match.group(1).replace('x', '-').split('-')
+        )
+        legal_moves: tuple[CheckersMovePath, ...] = get_legal_moves(
+          position, player1_to_move
+        )
+        if path not in legal_moves:
+            # Multi-jumps are often shortened to the first and last square
+            matches: list[CheckersMovePath] = [
+              legal_move for legal_move in legal_moves
+              if legal_move[0] == path[0] and legal_move[-1] == path[-1]
+            ]
+            # Or not finished yet if the game is part way through a turn
+            started: list[CheckersMovePath] = [
+              legal_move for legal_move in legal_moves
+              if legal_move[:len(path)] == path
+            ]
+            if len(matches) == 1 and len(path) == 2:
+                path = matches[0]
+            elif started and is_capture((path[0], path[1])):
+                chain = path[-1]
+            elif len(matches) > 1:
+                raise ValueError(f'{move_match.group(1)} could be several moves')
+            else:
+                raise ValueError(f'{move_match.group(1)} is not a legal move')
+
+        position = apply_path(position, player1_to_move, path)
+        moves.append(path)
+        if chain is None:
+            player1_to_move = not player1_to_move
+
+    return PdnGame(
+      tags, start_position, start_player1_to_move, tuple(moves), result,
+      position, player1_to_move, chain
+    )
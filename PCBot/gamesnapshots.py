@@ -0,0 +1,138 @@
+"""This module contains the on disk store for in progress game snapshots."""
+# pyright: strict
+
+# Snapshots are kept in an append only log of records, each of which is
+#   u8  kind          1 for a snapshot, 2 for a removal
+#   u64 key           game message id
+#   u32 length        length of payload
+#   ... payload       marshal encoded snapshot, empty for removals
+# Later records replace earlier ones with the same key. The log is rewritten
+# with only the latest snapshots once enough records have been superseded.
+
+from logging import getLogger, Logger
+from marshal import dumps, loads
+from os import fsync, replace
+from pathlib import Path
+from struct import pack, Struct
+from typing import Any, BinaryIO, Optional
+
+logger: Logger = getLogger(__name__)
+
+snapshot_path = './data/game-snapshots.bin'
+
+# Increment when the layout of records or snapshots changes
+snapshot_format_version: int = 1
+snapshot_header: bytes = b'PCGS' + pack('<H', snapshot_format_version)
+
+record_header = Struct('<BQI')
+record_kind_snapshot: int = 1
+record_kind_removal: int = 2
+
+# Compact once the log holds this many more records than there are snapshots
+compaction_threshold: int = 256
+
+
+class GameSnapshotStore:
+    """Append only store of the latest snapshot for each in progress game."""
+
+    path: Path
+    snapshots: dict[int, bytes]
+    record_count: int = 0
+
+    _file: Optional[BinaryIO] = None
+
+    def __init__(self, path: str = snapshot_path):
+        self.path = Path(path)
+        self.snapshots = {}
+
+    def load(self) -> dict[int, Any]:
+        """Read every snapshot from disk and compact the log."""
+        self.snapshots = {}
+        self.record_count = 0
+
+        data: bytes = b''
+        if self.path.is_file():
+            data = self.path.read_bytes()
+
+        if data.startswith(snapshot_header):
+            offset: int = len(snapshot_header)
+            while offset + record_header.size <= len(data):
+                kind: int
+                key: int
+                length: int
+                kind, key, length = record_header.unpack_from(data, offset)
+                offset += record_header.size
+                if offset + length > len(data):
+                    # Partially written final record
+                    break
+
+                if kind == record_kind_snapshot:
+                    self.snapshots[key] = data[offset:offset + length]
+                else:
+                    self.snapshots.pop(key, None)
+                offset += length
+                self.record_count += 1
+        elif len(data) != 0:
+            logger.warning(f'Ignoring {self.path} with unknown format')
+
+        snapshots: dict[int, Any] = {}
+        for key, payload in list(self.snapshots.items()):
+            try:
+                snapshots[key] = loads(payload)
+            except (EOFError, ValueError, TypeError):
+                logger.warning(f'Ignoring corrupt snapshot for game {key}')
+                del self.snapshots[key]
+
+        self.compact()
+        return snapshots
+
+    def save(self, key: int, snapshot: Any) -> None:
+        """Record the latest snapshot for a game."""
+        payload: bytes = dumps(snapshot)
+        if self.snapshots.get(key) == payload:
+            return
+        self.snapshots[key] = payload
+        self._append(record_kind_snapshot, key, payload)
+
+    def remove(self, key: int) -> None:
+        """Forget the snapshot for a game that has finished."""
+        if self.snapshots.pop(key, None) is None:
+            return
+        self._append(record_kind_removal, key, b'')
+
+    def compact(self) -> None:
+        """Rewrite the log so it only contains the latest snapshots."""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path: Path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as file:
+            file.write(snapshot_header)
+            for key, payload in self.snapshots.items():
+                file.write(record_header.pack(
+                  record_kind_snapshot, key, len(payload)
+                ))
+                file.write(payload)
+            file.flush()
+            fsync(file.fileno())
+        replace(temp_path, self.path)
+        self.record_count = len(self.snapshots)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, kind: int, key: int, payload: bytes) -> None:
+        if self._file is None:
+            if not self.path.is_file():
+                self.compact()
+            self._file = open(self.path, 'ab')
+
+        self._file.write(record_header.pack(kind, key, len(payload)) + payload)
+        self._file.flush()
+        self.record_count += 1
+
+        if self.record_count - len(self.snapshots) >= compaction_threshold:
+            self.compact()
+
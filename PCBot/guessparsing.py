@@ -0,0 +1,125 @@
+"""This module contains the parsers for guesses sent to text based games."""
+# pyright: strict
+
+# Every message in a game's thread or replying to a game is passed to its
+# parser, most of which are just chat so each parser rejects anything that
+# is too long or starts with the wrong character before using its pattern.
+# Patterns only match ASCII so letters can be looked up in column_indices.
+
+from re import ASCII, compile, IGNORECASE, Pattern
+from string import ascii_lowercase, ascii_uppercase, whitespace
+from typing import NamedTuple, Optional
+
+
+class ParsedGuess(NamedTuple):
+    """A guess with its text normalised to lowercase and any cells in it as
+       (row, column) counted from the top left of the grid."""
+    text: str
+    cells: tuple[tuple[int, int], ...] = ()
+    # Letter before the cells that changes the move, such as f for flag
+    prefix: str = ''
+
+
+def get_column_label(column: int) -> str:
+    """Convert a column index into letters, A to Z then AA onwards."""
+    if column < 26:
+        return ascii_uppercase[column]
+    return ascii_uppercase[column // 26 - 1] + ascii_uppercase[column % 26]
+
+
+# Column letters in either case to their index, enough for every grid
+column_indices: dict[str, int] = {
+  label: column
+  for column in range(26 * 27)
+  for label in (get_column_label(column), get_column_label(column).lower())
+}
+
+# A set so that letters are not matched as substrings
+guess_letters: frozenset[str] = frozenset(ascii_lowercase)
+
+minesweeper_pattern: Pattern[str] = compile(
+  r'\s*(f?)\s*([a-z]{1,2})\s*(\d{1,2})\s*', IGNORECASE | ASCII
+)
+# Longest message that could still be a move, allowing for some spaces
+minesweeper_max_length: int = 16
+minesweeper_first_chars: frozenset[str] = frozenset(
+  ascii_lowercase + ascii_uppercase + whitespace
+)
+minesweeper_commands: frozenset[str] = frozenset(('hint', 'undo'))
+
+checkers_board_size: int = 8
+checkers_pattern: Pattern[str] = compile(
+  r'\s*([a-h])([1-8])\s*[,\s]\s*([a-h])([1-8])\s*', IGNORECASE | ASCII
+)
+checkers_max_length: int = 24
+checkers_first_chars: frozenset[str] = frozenset(
+  'abcdefghABCDEFGH' + whitespace
+)
+
+word_pattern: Pattern[str] = compile(r'[a-z]*')
+
+
+def parse_minesweeper_guess(guess: str) -> Optional[ParsedGuess]:
+    """Parse a command like hint or a cell like C7, with an f prefix like
+       fB2 to flag."""
+    if len(guess) > minesweeper_max_length or not guess \
+      or guess[0] not in minesweeper_first_chars:
+        return None
+
+    guess_matches = minesweeper_pattern.fullmatch(guess)
+    if guess_matches is None:
+        command: str = guess.strip().lower()
+        if command in minesweeper_commands:
+            return ParsedGuess(command)
+        return None
+    prefix, column, row = guess_matches.groups()
+    prefix = prefix.lower()
+    return ParsedGuess(
+      prefix + column.lower() + row,
+      ((int(row) - 1, column_indices[column]),), prefix
+    )
+
+
+def parse_checkers_guess(guess: str) -> Optional[ParsedGuess]:
+    """Parse a move from one square to another like C3 D4 or c3,d4."""
+    if len(guess) > checkers_max_length or len(guess) < 4 \
+      or guess[0] not in checkers_first_chars:
+        return None
+
+    guess_matches = checkers_pattern.fullmatch(guess)
+    if guess_matches is None:
+        return None
+    token_column, token_row, target_column, target_row = \
+      guess_matches.groups()
+    return ParsedGuess(
+      f'{token_column}{token_row} {target_column}{target_row}'.lower(),
+      ((checkers_board_size - int(token_row), column_indices[token_column]),
+       (checkers_board_size - int(target_row), column_indices[target_column]))
+    )
+
+
+def parse_letter_guess(guess: str) -> Optional[ParsedGuess]:
+    """Parse a message that is a single letter."""
+    if len(guess) != 1:
+        return None
+    # Some characters casefold to several letters, like ﬅ to st
+    letter: str = guess.casefold()
+    if letter not in guess_letters:
+        return None
+    return ParsedGuess(letter)
+
+
+def parse_number_guess(guess: str) -> Optional[ParsedGuess]:
+    """Parse a message made of only digits."""
+    number: str = guess.strip()
+    if not number.isdecimal():
+        return None
+    return ParsedGuess(number)
+
+
+def parse_word_guess(guess: str) -> Optional[ParsedGuess]:
+    """Parse a message made of only letters."""
+    word: str = guess.strip().casefold()
+    if word_pattern.fullmatch(word) is None:
+        return None
+    return ParsedGuess(word)
@@ -0,0 +1,113 @@
+"""This module contains the on disk store for timed minesweeper results."""
+# pyright: strict
+
+# Results are kept in an append only log of fixed size records, each of which
+# is a result_record in the same order as MinesweeperResult. Every result is
+# read on load but only the fastest ranking_size results for each grid size
+# and bomb count are kept in memory, sorted, so that showing a leaderboard
+# never needs to look at older results.
+
+from bisect import insort
+from logging import getLogger, Logger
+from pathlib import Path
+from struct import pack, Struct
+from typing import BinaryIO, NamedTuple, Optional
+
+logger: Logger = getLogger(__name__)
+
+results_path = './data/minesweeper-results.bin'
+
+# Increment when the layout of records changes
+results_format_version: int = 1
+results_header: bytes = b'PCMR' + pack('<H', results_format_version)
+
+result_record = Struct('<IQQBHH')
+
+ranking_size: int = 10
+
+
+class MinesweeperResult(NamedTuple):
+    """A won timed game, ordered so faster results sort first."""
+    time_ms: int
+    # Unix timestamp in seconds
+    finished_at: int
+    user_id: int
+    size: int
+    bomb_count: int
+    # Fewest clicks to clear the grid, see minesweepersolver.count_3bv
+    bbbv: int
+
+
+class MinesweeperLeaderboard:
+    """Append only store of timed results with a ranking for each grid."""
+
+    path: Path
+    # Grid size and bomb count to the fastest results, fastest first
+    rankings: dict[tuple[int, int], list[MinesweeperResult]]
+    result_count: int = 0
+
+    _file: Optional[BinaryIO] = None
+
+    def __init__(self, path: str = results_path):
+        self.path = Path(path)
+        self.rankings = {}
+
+    def load(self) -> None:
+        """Read every result from disk and rebuild the rankings."""
+        self.close()
+        self.rankings = {}
+        self.result_count = 0
+
+        data: bytes = b''
+        if self.path.is_file():
+            data = self.path.read_bytes()
+        if not data.startswith(results_header):
+            if len(data) != 0:
+                logger.warning(f'Ignoring {self.path} with unknown format')
+            return
+
+        end: int = len(data) - (len(data) - len(results_header)) \
+          % result_record.size
+        if end != len(data):
+            logger.warning(f'Ignoring partially written result in {self.path}')
+        for fields in result_record.iter_unpack(
+          memoryview(data)[len(results_header):end]
+        ):
+            self._rank(MinesweeperResult(*fields))
+        self.result_count = (end - len(results_header)) // result_record.size
+
+    def add(self, result: MinesweeperResult) -> Optional[int]:
+        """Record a result, returning its place if it is in the ranking."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_file: bool = not self.path.is_file()
+            self._file = open(self.path, 'ab')
+            if new_file:
+                self._file.write(results_header)
+
+        self._file.write(result_record.pack(*result))
+        self._file.flush()
+        self.result_count += 1
+        return self._rank(result)
+
+    def get_ranking(
+      self, size: int, bomb_count: int
+    ) -> list[MinesweeperResult]:
+        return self.rankings.get((size, bomb_count), [])
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rank(self, result: MinesweeperResult) -> Optional[int]:
+        ranking: list[MinesweeperResult] = self.rankings.setdefault(
+          (result.size, result.bomb_count), []
+        )
+        if len(ranking) == ranking_size and result >= ranking[-1]:
+            return None
+
+        insort(ranking, result)
+        if len(ranking) > ranking_size:
+            ranking.pop()
+        return ranking.index(result) + 1
@@ -0,0 +1,411 @@
+"""This module contains a minesweeper solver that only uses logic."""
+# pyright: strict
+
+# Grids are flat sequences of cells stored row by row, so the cell in row r
+# and column c is at index r * size + c. Adjacent bomb counts use 9 for bombs
+# and only the counts of revealed cells are used when solving.
+
+from functools import cache
+from math import comb
+from typing import NamedTuple, Optional, Sequence
+
+bomb_cell_value: int = 9
+# Largest number of covered cells to use the total bomb count for
+total_constraint_max_cells: int = 24
+# Largest group of linked cells to try every bomb arrangement of
+max_enumeration_cells: int = 20
+
+# Covered cells and how many bombs are within them
+Constraint = tuple[frozenset[int], int]
+
+
+class SolverHint(NamedTuple):
+    """Suggested cell, bomb_probability is exactly 0 or 1 when certain."""
+    cell: int
+    bomb_probability: float
+
+
+@cache
+def get_adjacent_cells(size: int) -> tuple[tuple[int, ...], ...]:
+    """Find the indices of the cells surrounding each cell in a grid."""
+    return tuple(
+      tuple(
+        adjacent_row * size + adjacent_column
+        for adjacent_row in range(max(row - 1, 0), min(row + 2, size))
+        for adjacent_column in range(max(column - 1, 0),
+                                     min(column + 2, size))
+        if adjacent_row != row or adjacent_column != column
+      )
+      for row in range(size) for column in range(size)
+    )
+
+
+def count_adjacent_bombs(size: int, bomb_cells: Sequence[int]) -> bytearray:
+    """Find the number of bombs next to each cell, bombs are set to 9."""
+    adjacent_cells: tuple[tuple[int, ...], ...] = get_adjacent_cells(size)
+    adjacent_bombs = bytearray(size * size)
+    for bomb_idx in bomb_cells:
+        for adjacent_idx in adjacent_cells[bomb_idx]:
+            adjacent_bombs[adjacent_idx] += 1
+    for bomb_idx in bomb_cells:
+        adjacent_bombs[bomb_idx] = bomb_cell_value
+    return adjacent_bombs
+
+
+def get_constraints(
+  size: int, adjacent_bombs: Sequence[int], revealed: Sequence[bool],
+  known_bombs: set[int]
+) -> set[Constraint]:
+    """Find how many bombs are around each revealed number."""
+    adjacent_cells: tuple[tuple[int, ...], ...] = get_adjacent_cells(size)
+    constraints: set[Constraint] = set()
+    for idx, is_revealed in enumerate(revealed):
+        if not is_revealed or adjacent_bombs[idx] == bomb_cell_value:
+            continue
+        unknown: list[int] = []
+        remaining: int = adjacent_bombs[idx]
+        for adjacent_idx in adjacent_cells[idx]:
+            if adjacent_idx in known_bombs:
+                remaining -= 1
+            elif not revealed[adjacent_idx]:
+                unknown.append(adjacent_idx)
+        if unknown:
+            constraints.add((frozenset(unknown), remaining))
+    return constraints
+
+
+def find_certain_cells(
+  size: int, adjacent_bombs: Sequence[int], revealed: Sequence[bool],
+  known_bombs: set[int], bomb_count: int
+) -> tuple[set[int], set[int]]:
+    """Find covered cells that must be safe or must be bombs.
+
+       Each revealed number gives a constraint on how many of its covered
+       neighbours are bombs. Constraints that are satisfied or full decide
+       their cells, and a constraint within another one leaves the difference
+       to be decided the same way. Returns new safe cells and new bombs.
+    """
+    safe: set[int] = set()
+    bombs: set[int] = set(known_bombs)
+    constraints: set[Constraint] = get_constraints(
+      size, adjacent_bombs, revealed, bombs
+    )
+
+    # Every covered cell together must hold the remaining bombs, only worth
+    # comparing with other constraints near the end of a game
+    covered: frozenset[int] = frozenset(
+      idx for idx, is_revealed in enumerate(revealed)
+      if not is_revealed and idx not in bombs
+    )
+    remaining_bombs: int = bomb_count - len(bombs)
+    if covered and (len(covered) <= total_constraint_max_cells
+                    or remaining_bombs in (0, len(covered))):
+        constraints.add((covered, remaining_bombs))
+
+    while constraints:
+        decided_safe: set[int] = set()
+        decided_bombs: set[int] = set()
+        for cells, remaining in constraints:
+            if remaining == 0:
+                decided_safe.update(cells)
+            elif remaining == len(cells):
+                decided_bombs.update(cells)
+
+        if not decided_safe and not decided_bombs:
+            # Compare constraints that share a cell
+            by_cell: dict[int, list[Constraint]] = {}
+            for constraint in constraints:
+                for idx in constraint[0]:
+                    by_cell.setdefault(idx, []).append(constraint)
+            new_constraints: set[Constraint] = set()
+            for smaller_cells, smaller_remaining in constraints:
+                first_idx: int = next(iter(smaller_cells))
+                for larger_cells, larger_remaining in by_cell[first_idx]:
+                    if len(larger_cells) <= len(smaller_cells) \
+                      or not smaller_cells < larger_cells:
+                        continue
+                    new_constraints.add((
+                      larger_cells - smaller_cells,
+                      larger_remaining - smaller_remaining
+                    ))
+            new_constraints -= constraints
+            if not new_constraints:
+                break
+            constraints |= new_constraints
+            continue
+
+        safe |= decided_safe
+        bombs |= decided_bombs
+        # Remove decided cells from every constraint
+        reduced: set[Constraint] = set()
+        for cells, remaining in constraints:
+            remaining -= len(cells & decided_bombs)
+            cells = cells - decided_safe - decided_bombs
+            if cells:
+                reduced.add((cells, remaining))
+        constraints = reduced
+
+    return safe, bombs - known_bombs
+
+
+def is_solvable_without_guessing(
+  size: int, adjacent_bombs: Sequence[int], bomb_count: int, start_idx: int
+) -> bool:
+    """Check if every safe cell can be found by logic from the first reveal."""
+    adjacent_cells: tuple[tuple[int, ...], ...] = get_adjacent_cells(size)
+    revealed: list[bool] = [False] * (size * size)
+    revealed_count: int = 0
+    bombs: set[int] = set()
+
+    to_reveal: list[int] = [start_idx]
+    while True:
+        # Reveal cells the same way as MinesweeperGrid.reveal_cell
+        for idx in to_reveal:
+            if revealed[idx]:
+                continue
+            revealed[idx] = True
+            revealed_count += 1
+            if adjacent_bombs[idx] == 0:
+                to_reveal.extend(
+                  adjacent_idx for adjacent_idx in adjacent_cells[idx]
+                  if not revealed[adjacent_idx]
+                )
+
+        if revealed_count == size * size - bomb_count:
+            return True
+
+        safe, new_bombs = find_certain_cells(
+          size, adjacent_bombs, revealed, bombs, bomb_count
+        )
+        if not safe:
+            return False
+        bombs |= new_bombs
+        to_reveal = list(safe)
+
+
+def _count_arrangements(
+  cells: list[int], constraints: list[Constraint]
+) -> tuple[dict[int, int], dict[int, list[int]]]:
+    """Count every bomb arrangement of linked cells that fits the constraints.
+
+       Returns the number of arrangements for each bomb count, along with how
+       many of those arrangements have a bomb in each cell.
+    """
+    positions: dict[int, int] = {cell: i for i, cell in enumerate(cells)}
+    cell_constraints: list[list[int]] = [[] for _ in cells]
+    # Bombs still to place and cells still to decide for each constraint
+    needed: list[int] = []
+    undecided: list[int] = []
+    for constraint_idx, (constraint_cells, remaining) in enumerate(constraints):
+        needed.append(remaining)
+        undecided.append(len(constraint_cells))
+        for cell in constraint_cells:
+            cell_constraints[positions[cell]].append(constraint_idx)
+
+    arrangements: dict[int, int] = {}
+    cell_arrangements: dict[int, list[int]] = {}
+    placed: list[int] = [0] * len(cells)
+
+    def place(position: int, bomb_count: int) -> None:
+        if position == len(cells):
+            arrangements[bomb_count] = arrangements.get(bomb_count, 0) + 1
+            counts: list[int] = cell_arrangements.setdefault(
+              bomb_count, [0] * len(cells)
+            )
+            for i, is_bomb in enumerate(placed):
+                counts[i] += is_bomb
+            return
+
+        for is_bomb in (0, 1):
+            fits: bool = True
+            for constraint_idx in cell_constraints[position]:
+                needed[constraint_idx] -= is_bomb
+                undecided[constraint_idx] -= 1
+                if not 0 <= needed[constraint_idx] \
+                  <= undecided[constraint_idx]:
+                    fits = False
+            if fits:
+                placed[position] = is_bomb
+                place(position + 1, bomb_count + is_bomb)
+            for constraint_idx in cell_constraints[position]:
+                needed[constraint_idx] += is_bomb
+                undecided[constraint_idx] += 1
+        placed[position] = 0
+
+    place(0, 0)
+    return arrangements, cell_arrangements
+
+
+def _combine_counts(
+  first: dict[int, int], second: dict[int, int]
+) -> dict[int, int]:
+    combined: dict[int, int] = {}
+    for first_bombs, first_count in first.items():
+        for second_bombs, second_count in second.items():
+            total_bombs: int = first_bombs + second_bombs
+            combined[total_bombs] = (combined.get(total_bombs, 0)
+                                     + first_count * second_count)
+    return combined
+
+
+def find_bomb_probabilities(
+  size: int, adjacent_bombs: Sequence[int], revealed: Sequence[bool],
+  known_bombs: set[int], bomb_count: int
+) -> dict[int, float]:
+    """Find the chance of each covered cell that is not known to be a bomb
+       being one.
+
+       Cells next to revealed numbers are split into groups that share
+       constraints and every arrangement of each group is counted, weighted by
+       the ways to place the other bombs in the cells away from any numbers.
+       Groups with more than max_enumeration_cells cells fall back to the
+       highest chance given by any single constraint.
+    """
+    constraints: set[Constraint] = get_constraints(
+      size, adjacent_bombs, revealed, known_bombs
+    )
+    remaining_bombs: int = bomb_count - len(known_bombs)
+    covered: list[int] = [
+      idx for idx, is_revealed in enumerate(revealed)
+      if not is_revealed and idx not in known_bombs
+    ]
+
+    # Split cells next to numbers into groups linked by shared constraints,
+    # ordered so each constraint is finished soon after it is started
+    by_cell: dict[int, list[Constraint]] = {}
+    for constraint in constraints:
+        for idx in constraint[0]:
+            by_cell.setdefault(idx, []).append(constraint)
+    groups: list[tuple[list[int], list[Constraint]]] = []
+    grouped: set[int] = set()
+    for first_idx in sorted(by_cell):
+        if first_idx in grouped:
+            continue
+        grouped.add(first_idx)
+        group_cells: list[int] = [first_idx]
+        group_constraints: set[Constraint] = set()
+        for idx in group_cells:
+            for constraint in by_cell[idx]:
+                if constraint in group_constraints:
+                    continue
+                group_constraints.add(constraint)
+                for linked_idx in sorted(constraint[0] - grouped):
+                    grouped.add(linked_idx)
+                    group_cells.append(linked_idx)
+        groups.append((group_cells, list(group_constraints)))
+
+    probabilities: dict[int, float] = {}
+    counted: list[tuple[list[int], dict[int, int], dict[int, list[int]]]] = []
+    for group_cells, group_constraints in groups:
+        if len(group_cells) <= max_enumeration_cells:
+            arrangements, cell_arrangements = _count_arrangements(
+              group_cells, group_constraints
+            )
+            if arrangements:
+                counted.append((group_cells, arrangements, cell_arrangements))
+                continue
+        for idx in group_cells:
+            probabilities[idx] = max(
+              remaining / len(cells) for cells, remaining in by_cell[idx]
+            )
+    # Bombs expected in groups that were too large count against the rest
+    remaining_bombs -= round(sum(probabilities.values()))
+    other_cells: int = len(covered) - len(by_cell)
+
+    def get_weight(group_bombs: int) -> int:
+        """Ways to place the remaining bombs in the cells away from numbers."""
+        if not 0 <= remaining_bombs - group_bombs <= other_cells:
+            return 0
+        return comb(other_cells, remaining_bombs - group_bombs)
+
+    total_counts: dict[int, int] = {0: 1}
+    for _, arrangements, _ in counted:
+        total_counts = _combine_counts(total_counts, arrangements)
+    total_weight: int = sum(
+      count * get_weight(bombs) for bombs, count in total_counts.items()
+    )
+    if total_weight == 0:
+        # Only reachable with inconsistent input, guess evenly
+        return {idx: remaining_bombs / max(len(covered), 1) for idx in covered}
+
+    for group_idx, (group_cells, arrangements, cell_arrangements) \
+      in enumerate(counted):
+        other_counts: dict[int, int] = {0: 1}
+        for other_idx, (_, other_arrangements, _) in enumerate(counted):
+            if other_idx != group_idx:
+                other_counts = _combine_counts(other_counts, other_arrangements)
+        bomb_weights: list[int] = [0] * len(group_cells)
+        for group_bombs, counts in cell_arrangements.items():
+            weight: int = sum(
+              count * get_weight(group_bombs + other_bombs)
+              for other_bombs, count in other_counts.items()
+            )
+            for i, count in enumerate(counts):
+                bomb_weights[i] += count * weight
+        for idx, bomb_weight in zip(group_cells, bomb_weights):
+            probabilities[idx] = bomb_weight / total_weight
+
+    if other_cells:
+        expected_bombs: int = sum(
+          count * get_weight(bombs) * (remaining_bombs - bombs)
+          for bombs, count in total_counts.items()
+        )
+        other_probability: float = expected_bombs / total_weight / other_cells
+        for idx in covered:
+            if idx not in by_cell:
+                probabilities[idx] = other_probability
+    return probabilities
+
+
+def get_hint(
+  size: int, adjacent_bombs: Sequence[int], revealed: Sequence[bool],
+  flagged: Sequence[bool], bomb_count: int
+) -> Optional[SolverHint]:
+    """Suggest a cell that is safe, a bomb that has not been flagged or
+       failing that the cell least likely to be a bomb.
+
+       Flags are not trusted since the player may have placed them wrongly.
+    """
+    safe, bombs = find_certain_cells(
+      size, adjacent_bombs, revealed, set(), bomb_count
+    )
+    if safe:
+        return SolverHint(min(safe), 0)
+    unflagged_bombs: list[int] = [idx for idx in bombs if not flagged[idx]]
+    if unflagged_bombs:
+        return SolverHint(min(unflagged_bombs), 1)
+
+    probabilities: dict[int, float] = find_bomb_probabilities(
+      size, adjacent_bombs, revealed, bombs, bomb_count
+    )
+    if not probabilities:
+        return None
+    cell: int = min(probabilities, key=lambda idx: (probabilities[idx], idx))
+    return SolverHint(cell, probabilities[cell])
+
+
+def count_3bv(size: int, adjacent_bombs: Sequence[int]) -> int:
+    """Count the fewest clicks needed to clear a grid without flagging,
+       each opening of empty cells is one click and so is every other safe
+       cell not next to one."""
+    adjacent_cells: tuple[tuple[int, ...], ...] = get_adjacent_cells(size)
+    opened: list[bool] = [False] * (size * size)
+    clicks: int = 0
+    for idx, bombs in enumerate(adjacent_bombs):
+        if bombs != 0 or opened[idx]:
+            continue
+        clicks += 1
+        opened[idx] = True
+        opening: list[int] = [idx]
+        for opening_idx in opening:
+            if adjacent_bombs[opening_idx] != 0:
+                continue
+            for adjacent_idx in adjacent_cells[opening_idx]:
+                if not opened[adjacent_idx]:
+                    opened[adjacent_idx] = True
+                    opening.append(adjacent_idx)
+
+    return clicks + sum(
+      not is_opened and bombs != bomb_cell_value
+      for is_opened, bombs in zip(opened, adjacent_bombs)
+    )
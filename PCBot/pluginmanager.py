@@ -1,20 +1,28 @@
 """This module contains functions used to load and manage plugins."""
 # pyright: strict
 
+import ast
 from collections import Counter
-from crescent import Plugin, PluginManager
+from concurrent.futures import (
+  FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+)
+from crescent import Client, Plugin, PluginManager
 from crescent.internal import AppCommandMeta, Includable
+from hashlib import blake2b
 from hikari import GatewayBot
 from importlib import import_module, reload
 from importlib.abc import ExecutionLoader, Loader
 from importlib.machinery import ModuleSpec
 from importlib.util import find_spec
 from logging import getLogger, Logger
+from os import stat_result
 from pathlib import Path
-from sys import exc_info
-from traceback import extract_tb, format_exc, FrameSummary, StackSummary
+from sys import modules
+from tabulate import tabulate  # pyright: ignore [reportMissingModuleSource]
+from time import perf_counter
+from traceback import extract_tb, format_exception, FrameSummary, StackSummary
 from types import ModuleType
-from typing import Any, Optional
+from typing import Any, Collection, NamedTuple, Optional
 
 # TODO: Avoid unloading reload.py
 # TODO: Specifically list which exceptions are possible during plugin loading
@@ -25,6 +33,25 @@ from typing import Any, Optional
 
 logger: Logger = getLogger(__name__)
 
+# Plugin imports mostly wait on disk and native library loading
+plugin_import_workers: int = 8
+
+
+class PluginFingerprint(NamedTuple):
+    """Identifies the version of a plugin file that was last loaded."""
+
+    mtime_ns: int
+    size: int
+    digest: bytes
+    dependencies: frozenset[str]
+
+
+# Kept across reloads of this module, see the end of the file
+# Fingerprints of plugin files when they were last imported
+plugin_fingerprints: dict[str, PluginFingerprint]
+# Commands as they were when last registered with discord
+registered_command_signature: Optional[list[str]]
+
 
 def get_plugin_names(plugin_manager: PluginManager) -> Counter[str]:
     """Provide a list of loaded plugins."""
@@ -83,15 +110,86 @@ def reload_plugin_manager() -> None:
     reload(module)
 
 
-def reload_handlers(plugin_manager: PluginManager):
-    """Reload plugins that provide functionally to other plugins."""
+def reload_handlers(
+  plugin_manager: PluginManager,
+  plugin_paths: Optional[Collection[str]] = None
+):
+    """Reload plugins that provide functionally to other plugins.
+
+       If plugin_paths is provided then only those plugins are reloaded.
+    """
     if 'PCBot.plugins.replyhandler' not in plugin_manager.plugins.keys():
         return
+    if plugin_paths is not None \
+      and 'PCBot.plugins.replyhandler' not in plugin_paths:
+        return
 
     reply_handler: ModuleType = import_module('PCBot.plugins.replyhandler')
     reply_handler.reset_reply_handler()
 
 
+def restore_handlers(
+  plugin_manager: PluginManager, app: GatewayBot,
+  plugin_paths: Optional[Collection[str]] = None
+) -> None:
+    """Restore state for plugins that provide functionally to other plugins.
+
+       Needs to run after other plugins are loaded, see reload_handlers.
+    """
+    if 'PCBot.plugins.replyhandler' not in plugin_manager.plugins.keys():
+        return
+    if plugin_paths is not None \
+      and 'PCBot.plugins.replyhandler' not in plugin_paths:
+        return
+
+    reply_handler: ModuleType = import_module('PCBot.plugins.replyhandler')
+    reply_handler.restore_games(app)
+
+
+def report_plugin_error(path: str, error: BaseException) -> None:
+    """Print the part of a traceback that is within the erroring plugin."""
+    logger.error(f'The following error occurred while loading {path}:')
+    # From https://stackoverflow.com/a/45771867
+    # Try to find first trace line within erroring plugin
+    spec: Optional[ModuleSpec] = None
+    try:
+        spec = find_spec(path)
+    except (ImportError, ValueError):
+        pass
+    if spec is None:
+        # If failed to find plugin then just print entire traceback
+        print(''.join(format_exception(error)), end='')
+        return
+    loader: Optional[Loader] = spec.loader
+    if not isinstance(loader, ExecutionLoader):
+        # If failed to get data from loader then just print entire traceback
+        print(''.join(format_exception(error)), end='')
+        return
+    # TODO: Fix reportUnknownVariableType
+    file_name: str = loader.get_filename()  # pyright: ignore [reportCallIssue, reportUnknownVariableType]
+    extracts: StackSummary = extract_tb(error.__traceback__)
+    count: int = len(extracts)
+    # Find the first occurrence of the plugin file name
+    extract: FrameSummary
+    for extract in extracts:
+        if extract[0] == file_name:
+            break
+        count -= 1
+    traceback_output: str = ''.join(format_exception(error, limit=-count))
+    # Some exceptions fail to display properly
+    # This method with format_exc is actually the best method I have
+    # found as iterating through a traceback with tb.tb_next actually
+    # doesn't include the required line at the bottom, neither does
+    # inspect.trace's list
+    # So just missing the traceback line and some module info is
+    # fine as I can work around it
+    if not traceback_output.startswith('Traceback'):
+        print('Traceback (most recent call last):')
+    if traceback_output.endswith('\n'):
+        traceback_output = traceback_output[:-1]
+    print(traceback_output)
+
+
 def reload_plugin(
   plugin_manager: PluginManager, path: str, strict: bool = True
 ) -> None:
@@ -99,43 +197,194 @@ def reload_plugin(
     try:
         plugin_manager.load(path, strict=strict)
         plugin_manager.load(path, refresh=True, strict=strict)
-    except:
-        logger.error(f'The following error occurred while loading {path}:')
-        # From https://stackoverflow.com/a/45771867
-        # Try to find first trace line within erroring plugin
-        spec: Optional[ModuleSpec] = find_spec(path)
-        if spec is None:
-            # If failed to find plugin then just print entire traceback
-            print(format_exc())
-        else:
-            loader: Optional[Loader] = spec.loader
-            if not isinstance(loader, ExecutionLoader):
-                # If failed to get data from loader then just print entire traceback
-                print(format_exc())
-                return
-            # TODO: Fix reportUnknownVariableType
-            file_name: str = loader.get_filename()  # pyright: ignore [reportCallIssue, reportUnknownVariableType]
-            extracts: StackSummary = extract_tb(exc_info()[2])
-            count: int = len(extracts)
-            # Find the first occurrence of the plugin file name
-            extract: FrameSummary
-            for extract in extracts:
-                if extract[0] == file_name:
-                    break
-                count -= 1
-            traceback_output: str = format_exc(limit=-count)
-            # Some exceptions fail to display properly
-            # This method with format_exc is actually the best method I have
-            # found as iterating through a traceback with tb.tb_next actually
-            # doesn't include the required line at the bottom, neither does
-            # inspect.trace's list
-            # So just missing the traceback line and some module info is
-            # fine as I can work around it
-            if not traceback_output.startswith('Traceback'):
-                print('Traceback (most recent call last):')
-            if traceback_output.endswith('\n'):
-                traceback_output = traceback_output[:-1]
-            print(traceback_output)
+    except BaseException as error:
+        report_plugin_error(path, error)
+
+
+def get_plugin_dependencies(
+  source: bytes, file_name: str, package: str
+) -> frozenset[str]:
+    """Find the other plugins in package that a plugin file imports."""
+    try:
+        tree: ast.Module = ast.parse(source, file_name)
+    except (SyntaxError, ValueError):
+        # Let the import report the error instead
+        return frozenset()
+
+    dependencies: set[str] = set()
+    node: ast.AST
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            dependencies.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module is not None \
+          and node.level == 0:
+            dependencies.add(node.module)
+            if node.module == package:
+                dependencies.update(
+                  f'{package}.{alias.name}' for alias in node.names
+                )
+    return frozenset(
+      dependency for dependency in dependencies
+      if dependency.startswith(package + '.')
+    )
+
+
+def get_plugin_files(path: str) -> dict[str, Path]:
+    """Find every plugin file in a package, keyed by module path."""
+    pathlib_path = Path(*path.split("."))
+    return {
+      ".".join(glob_path.as_posix()[:-3].split("/")): glob_path
+      for glob_path in sorted(pathlib_path.glob(r'**/[!_]*.py'))
+    }
+
+
+def get_plugin_fingerprint(
+  file_path: Path, package: str, old: Optional[PluginFingerprint] = None
+) -> Optional[PluginFingerprint]:
+    """Fingerprint a plugin file, only rereading it if its mtime changed."""
+    try:
+        stats: stat_result = file_path.stat()
+        if old is not None and old.mtime_ns == stats.st_mtime_ns \
+          and old.size == stats.st_size:
+            return old
+        source: bytes = file_path.read_bytes()
+    except OSError:
+        return None
+
+    digest: bytes = blake2b(source, digest_size=16).digest()
+    if old is not None and old.digest == digest:
+        # Only touched so keep previous parse
+        dependencies: frozenset[str] = old.dependencies
+    else:
+        dependencies = get_plugin_dependencies(source, str(file_path), package)
+    return PluginFingerprint(
+      stats.st_mtime_ns, stats.st_size, digest, dependencies
+    )
+
+
+def get_changed_plugins(path: str) -> set[str]:
+    """Find plugins that changed since they were loaded and their dependents.
+
+       Plugins that failed to load are only retried once they change.
+    """
+    plugin_files: dict[str, Path] = get_plugin_files(path)
+    changed: set[str] = {
+      plugin_path for plugin_path in plugin_fingerprints
+      if plugin_path not in plugin_files
+    }
+    dependencies: dict[str, frozenset[str]] = {}
+    plugin_path: str
+    file_path: Path
+    for plugin_path, file_path in plugin_files.items():
+        old: Optional[PluginFingerprint] = plugin_fingerprints.get(plugin_path)
+        fingerprint: Optional[PluginFingerprint] = \
+          get_plugin_fingerprint(file_path, path, old)
+        if fingerprint is None:
+            changed.add(plugin_path)
+            continue
+        dependencies[plugin_path] = fingerprint.dependencies
+        if old is None or old.digest != fingerprint.digest:
+            changed.add(plugin_path)
+        elif old is not fingerprint:
+            plugin_fingerprints[plugin_path] = fingerprint
+
+    # Plugins that import a changed plugin would keep using the old version
+    pending: list[str] = list(changed)
+    while pending:
+        changed_path: str = pending.pop()
+        for plugin_path, deps in dependencies.items():
+            if changed_path in deps and plugin_path not in changed:
+                changed.add(plugin_path)
+                pending.append(plugin_path)
+    return changed
+
+
+def get_command_signature(client: Client) -> list[str]:
+    """Describe every command in the form that discord cares about."""
+    meta: AppCommandMeta
+    return sorted(
+      repr((
+        meta.app_command.type, meta.app_command.name,
+        meta.app_command.description, meta.app_command.guild_id,
+        meta.app_command.options, meta.app_command.default_member_permissions,
+        meta.app_command.is_dm_enabled, meta.app_command.nsfw,
+        meta.group and (meta.group.name, meta.group.description),
+        meta.sub_group and (meta.sub_group.name, meta.sub_group.description)
+      ))
+      for meta in client.commands.crescent_commands
+    )
+
+
+async def register_commands(client: Client, force: bool = False) -> bool:
+    """Register commands with discord if they changed since last time.
+
+       Returns whether commands were registered.
+    """
+    global registered_command_signature
+    signature: list[str] = get_command_signature(client)
+    if not force and signature == registered_command_signature:
+        return False
+    await client.commands.register_commands()
+    registered_command_signature = signature
+    return True
+
+
+def order_plugins(dependencies: dict[str, frozenset[str]]) -> list[str]:
+    """Sort plugins so that each one comes after the plugins it imports.
+
+       Ties are broken by name so the order is the same on every load.
+    """
+    ordered: list[str] = []
+    remaining: dict[str, set[str]] = {
+      path: {dep for dep in deps if dep in dependencies and dep != path}
+      for path, deps in dependencies.items()
+    }
+    while remaining:
+        ready: list[str] = sorted(
+          path for path, deps in remaining.items() if not deps
+        )
+        if not ready:
+            # Import cycle, load the rest in name order and let imports sort it
+            logger.warning('Plugin import cycle between '
+                           f'{", ".join(sorted(remaining))}')
+            ready = sorted(remaining)
+        for path in ready:
+            del remaining[path]
+            ordered.append(path)
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return ordered
+
+
+def import_plugin_module(path: str) -> float:
+    """Import or reexecute a plugin module, returning how long it took."""
+    start_time: float = perf_counter()
+    module: Optional[ModuleType] = modules.get(path)
+    if module is None:
+        import_module(path)
+    else:
+        reload(module)
+    return perf_counter() - start_time
+
+
+def log_plugin_timings(
+  timings: dict[str, tuple[Optional[float], Optional[float]]], total: float
+) -> None:
+    """Log how long each plugin took to import and register, slowest first."""
+    def format_time(duration: Optional[float]) -> str:
+        return 'failed' if duration is None else f'{duration * 1000:.1f}'
+
+    rows: list[tuple[str, str, str]] = [
+      (path.rsplit('.', 1)[-1], format_time(import_time),
+       format_time(register_time))
+      for path, (import_time, register_time) in sorted(
+        timings.items(), key=lambda item: -(item[1][0] or 0)
+      )
+    ]
+    table: str = tabulate(rows, headers=['Plugin', 'Import ms', 'Register ms'],
+                          disable_numparse=True)
+    logger.info(f'Loaded {len(rows)} plugins in {total * 1000:.1f} ms\n'
+                f'{table}')
 
 
 # From https://github.com/hikari-crescent/hikari-crescent/blob/v0.6.6/crescent/plugin.py
@@ -143,16 +392,103 @@ def reload_plugin(
 # fuction(file?) remains under mpl since it is "Covered Software" by 3.3 and
 # then mention Exhibit B
 async def reload_plugins(
-    plugin_manager: PluginManager, path: str, strict: bool = True
+    plugin_manager: PluginManager, path: str, strict: bool = True,
+    plugin_paths: Optional[Collection[str]] = None
 ) -> None:
-    """Load new plugins, reloads existing ones and unload old ones."""
-    pathlib_path = Path(*path.split("."))
+    """Load new plugins, reloads existing ones and unload old ones.
+
+       If plugin_paths is provided then only those plugins are reloaded.
+    """
+    start_time: float = perf_counter()
+    plugin_files: dict[str, Path] = get_plugin_files(path)
+
+    plugin_path: str
+    if plugin_paths is None:
+        # Used to avoid the a load erroring because it tried to load
+        # an already loaded plugin
+        plugin_manager.unload_all()
+        plugin_fingerprints.clear()
+    else:
+        for plugin_path in plugin_paths:
+            if plugin_path in plugin_manager.plugins:
+                plugin_manager.unload(plugin_path)
+            plugin_fingerprints.pop(plugin_path, None)
+        plugin_files = {
+          plugin_path: file_path
+          for plugin_path, file_path in plugin_files.items()
+          if plugin_path in plugin_paths
+        }
+
+    # Fingerprint before importing so an edit during loading is seen next time
+    dependencies: dict[str, frozenset[str]] = {}
+    file_path: Path
+    for plugin_path, file_path in plugin_files.items():
+        fingerprint: Optional[PluginFingerprint] = \
+          get_plugin_fingerprint(file_path, path)
+        if fingerprint is None:
+            dependencies[plugin_path] = frozenset()
+            continue
+        plugin_fingerprints[plugin_path] = fingerprint
+        dependencies[plugin_path] = fingerprint.dependencies
+    load_order: list[str] = order_plugins(dependencies)
+
+    # Import modules in parallel, each one only starting once every plugin it
+    # imports has finished so that it picks up their new versions
+    import_times: dict[str, Optional[float]] = {}
+    errors: dict[str, BaseException] = {}
+    waiting: dict[str, set[str]] = {
+      plugin_path: set(dependencies[plugin_path] & set(load_order))
+      for plugin_path in load_order
+    }
+    running: dict[Future[float], str] = {}
+    with ThreadPoolExecutor(max_workers=plugin_import_workers,
+                            thread_name_prefix='plugin-import') as executor:
+        while waiting or running:
+            for plugin_path in [
+              plugin_path for plugin_path in load_order
+              if plugin_path in waiting and not waiting[plugin_path]
+            ]:
+                del waiting[plugin_path]
+                running[executor.submit(import_plugin_module, plugin_path)] = \
+                  plugin_path
+            if not running:
+                # Only an import cycle can leave plugins waiting, start them
+                for deps in waiting.values():
+                    deps.clear()
+                continue
+
+            done: set[Future[float]]
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            future: Future[float]
+            for future in done:
+                plugin_path = running.pop(future)
+                error: Optional[BaseException] = future.exception()
+                if error is None:
+                    import_times[plugin_path] = future.result()
+                else:
+                    import_times[plugin_path] = None
+                    errors[plugin_path] = error
+                for deps in waiting.values():
+                    deps.discard(plugin_path)
+
+    # Register with crescent on this thread in a fixed order
+    timings: dict[str, tuple[Optional[float], Optional[float]]] = {}
+    for plugin_path in load_order:
+        register_time: Optional[float] = None
+        if plugin_path in errors:
+            report_plugin_error(plugin_path, errors[plugin_path])
+        else:
+            register_start: float = perf_counter()
+            try:
+                plugin_manager.load(plugin_path, strict=strict)
+                register_time = perf_counter() - register_start
+            except Exception as error:
+                report_plugin_error(plugin_path, error)
+        timings[plugin_path] = (import_times[plugin_path], register_time)
+
+    log_plugin_timings(timings, perf_counter() - start_time)
 
-    # Used to avoid the a load erroring because it tried to load
-    # an already loaded plugin
-    plugin_manager.unload_all()
 
-    glob_path: Path
-    for glob_path in sorted(pathlib_path.glob(r'**/[!_]*.py')):
-        plugin_path: str = ".".join(glob_path.as_posix()[:-3].split("/"))
-        reload_plugin(plugin_manager, plugin_path)
+if 'plugin_fingerprints' not in globals():
+    plugin_fingerprints = {}
+    registered_command_signature = None
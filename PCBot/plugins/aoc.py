@@ -10,9 +10,7 @@ from json import load
 from logging import getLogger
 from operator import itemgetter
 from os import path
-from PCBot.botdata import (
-  aoc_cookie_path, BotData, get_token_file_path, guild_id_path
-)
+from PCBot.botdata import BotData
 from requests import get
 from tabulate import tabulate
 from time import time
@@ -25,14 +23,6 @@ plugin = crescent.Plugin[GatewayBot, BotData]()
 
 year = 2025
 
-# Load aoc cookie
-with open(get_token_file_path(aoc_cookie_path)) as file:
-    session_cookie = file.read().strip()
-
-# Load guild id
-with open(get_token_file_path(guild_id_path)) as file:
-    guild_id = int(file.read().strip())
-
 
 async def fetch_leaderboard(ctx: crescent.Context | None = None) -> None:
     """Check if leaderboard is stale and update if needed."""
@@ -50,7 +40,7 @@ async def fetch_leaderboard(ctx: crescent.Context | None = None) -> None:
 
         leaderboard_url = \
           f"https://adventofcode.com/{year}/leaderboard/private/view/2494838.json"
-        headers = {'Cookie': session_cookie}
+        headers = {'Cookie': plugin.model.settings.aoc_cookie}
         request = get(leaderboard_url, headers=headers)
 
         if request.status_code != 200:
@@ -66,7 +56,7 @@ async def update_names() -> None:
     user_mapping = {
         user["aoc"]: [
             await plugin.app.rest.fetch_member(
-              guild_id, user=user["discord"]
+              plugin.model.settings.guild_id, user=user["discord"]
             )
         ]
         for user in mapping
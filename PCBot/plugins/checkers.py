@@ -4,31 +4,53 @@
 # TODO: cell size still being the same.
 # It's wrong and different on web, desktop, modern mobile, and native mobile.
 
+from asyncio import get_running_loop
 from colorama import Back, Fore, Style
+from concurrent.futures import ThreadPoolExecutor
 from crescent import command, Context, option, Plugin
 from crescent.ext import docstrings
 from crescent.utils import create_task
 from dataclasses import dataclass
 from enum import Enum
 from hikari import (
-  ButtonStyle, ChannelType, GatewayBot, Message, GuildThreadChannel, Snowflake,
-  TextableGuildChannel, User
+  Bytes, ButtonStyle, ChannelType, GatewayBot, Message, GuildThreadChannel,
+  RESTAware, Snowflake, TextableGuildChannel, User
 )
 from logging import getLogger, Logger
 from miru import ViewContext
 from miru.ext.menu import Menu, Screen, ScreenButton, ScreenContent
 from miru.internal.types import InteractiveButtonStylesT
-from re import Match, IGNORECASE, search
-from typing import Awaitable, Callable, Optional
+from time import perf_counter_ns, strftime, time
+from typing import Any, Awaitable, Callable, Optional
 from PCBot.botdata import BotData
+from PCBot.checkersai import (
+  find_best_move, SearchResult, TranspositionTable
+)
+from PCBot.checkersarchive import (
+  CheckersArchive, CheckersHeadToHead, no_winner, player1_winner,
+  player2_winner
+)
+from PCBot.checkersengine import (
+  apply_move, board_size, CheckersMove, CheckersMovePath, CheckersMoveResult,
+  CheckersPosition, get_captured_square, get_jumps, get_legal_moves,
+  get_row_column, get_square, initial_position, is_capture, square_count
+)
+from PCBot.checkerspdn import (
+  PdnGame, player1_win_result, player2_win_result, read_pdn,
+  unfinished_result, write_pdn
+)
+from PCBot.guessparsing import parse_checkers_guess, ParsedGuess
 from PCBot.plugins.replyhandler import (
-  add_game, get_interaction_channel, GuessOutcome, remove_game, TextGuessGame
+  add_game, drop_pending_edit, get_interaction_channel, GuessOutcome,
+  record_first_board, register_game_type, remove_game, start_game_thread,
+  TextGuessGame, touch_game
 )
 
 logger: Logger = getLogger(__name__)
 plugin = Plugin[GatewayBot, BotData]()
 
-board_size: int = 8
+# How long the bot searches for each move
+bot_move_seconds: float = 2.0
 
 
 class CheckersPlayer(Enum):
@@ -56,6 +78,8 @@ class CheckersScreenStage(Enum):
 class CheckersInputMethod(Enum):
     SCREEN = 1
     REPLY  = 2
+    BOT    = 3
+    PDN    = 4
 
 
 @dataclass(frozen=True)
@@ -69,9 +93,9 @@ class CheckersBoardPosition:
         return f'{column_letter}{row_number}'
 
 
-@dataclass
+@dataclass(frozen=True)
 class CheckersBoardCell:
-    token = CheckersTokenType.EMPTY
+    token: CheckersTokenType = CheckersTokenType.EMPTY
     player: Optional[CheckersPlayer] = None
 
     def can_move_up(self) -> bool:
@@ -87,228 +111,265 @@ class CheckersBoardCell:
         )
 
 
-class CheckersBoard:
-    """Class to store information about the checkers board."""
-    # TODO: Switch to dict[CheckersBoardPosition, CheckersBoardCell]?
-    board: list[list[CheckersBoardCell]]
-    _valid_moves: Optional[
-      dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]]
-    ] = None
-
-    def __init__(self):
-        self.board = [
-          [CheckersBoardCell() for _ in range(board_size)]
-          for _ in range(board_size)
-        ]
+# Cells are shared so looking one up never allocates, indexed by is king
+empty_cell = CheckersBoardCell()
+player1_cells: tuple[CheckersBoardCell, CheckersBoardCell] = (
+  CheckersBoardCell(CheckersTokenType.REGULAR, CheckersPlayer.PLAYER1),
+  CheckersBoardCell(CheckersTokenType.KING, CheckersPlayer.PLAYER1)
+)
+player2_cells: tuple[CheckersBoardCell, CheckersBoardCell] = (
+  CheckersBoardCell(CheckersTokenType.REGULAR, CheckersPlayer.PLAYER2),
+  CheckersBoardCell(CheckersTokenType.KING, CheckersPlayer.PLAYER2)
+)
 
-        for row in range(3):
-            for column in range(board_size):
-                if row % 2 == column % 2:
-                    self.board[board_size - row - 1][column].token = CheckersTokenType.REGULAR
-                    self.board[board_size - row - 1][column].player = CheckersPlayer.PLAYER1
+square_positions: tuple[CheckersBoardPosition, ...] = tuple(
+  CheckersBoardPosition(*get_row_column(square))
+  for square in range(square_count)
+)
+# Entries of the valid move sets for each target square, indexed by capturing
+square_targets: tuple[
+  tuple[tuple[bool, CheckersBoardPosition], tuple[bool, CheckersBoardPosition]],
+  ...
+] = tuple(((False, position), (True, position)) for position in square_positions)
+square_bits: dict[CheckersBoardPosition, int] = {
+  position: 1 << square for square, position in enumerate(square_positions)
+}
+
+
+# Three-per-em space
+cell_padding = ' '
+# Thin space
+# Used for regular chars(letters and space)
+full_padding: str = cell_padding + ' '
+
+# ESC[1;2m and ESC[22m, neither are in colorama as it doesn't do style
+ansi_underline = '[1;2m'
+ansi_reset_underline = '[22m'
+
+
+def get_board_styles(legacy: bool) -> tuple[str, str, str]:
+    """Find the underline, reset underline and reset all codes to use."""
+    if legacy:
+        return '', '', ''
+    return ansi_underline, ansi_reset_underline, Style.RESET_ALL
+
+
+def render_cell(
+  cell: CheckersBoardCell, light: bool, highlight_token: bool,
+  highlight_cell: bool, legacy: bool
+) -> str:
+    """Convert a cell into the text and colour codes used to show it."""
+    underline, reset_underline, _ = get_board_styles(legacy)
+    cell_message: str = ''
+    if not legacy:
+        match cell.player:
+            case CheckersPlayer.PLAYER1:
+                if highlight_token:
+                    cell_message += Fore.CYAN
                 else:
-                    self.board[row][column].token = CheckersTokenType.REGULAR
-                    self.board[row][column].player = CheckersPlayer.PLAYER2
+                    cell_message += Fore.BLUE
+            case CheckersPlayer.PLAYER2:
+                if highlight_token:
+                    cell_message += Fore.MAGENTA
+                else:
+                    cell_message += Fore.RED
+            case None:
+                pass
 
-    def get_board(
-      self, stage: CheckersScreenStage, token: Optional[CheckersBoardPosition],
-      legacy: bool
-    ) -> str:
-        """Convert a board into a string."""
-        board_message: str = '```ansi\n'
-
-        target_positions: Optional[set[CheckersBoardPosition]] = None
-        if (stage is CheckersScreenStage.TARGET and
-          self._valid_moves is not None and
-          token in self._valid_moves):
-            target_positions = {move[1] for move in self._valid_moves[token]}
-
-        # Three-per-em space
-        cell_padding = ' '
-        # Thin space
-        # Used for regular chars(letters and space)
-        full_padding: str = cell_padding + ' '
-
-        underline: str
-        reset_underline: str
-        reset_all: str
-        if legacy:
-            underline = ''
-            reset_underline = ''
-            reset_all = ''
+        if light:
+            cell_message += Back.WHITE
+        elif highlight_cell:
+            cell_message += Back.BLUE # Gray on Discord
         else:
-            # ESC[1;2m and ESC[22m, neither are in colorama as it doesn't do style
-            underline = '[1;2m'
-            reset_underline = '[22m'
-            reset_all = Style.RESET_ALL
+            cell_message += Back.BLACK # Firefly dark blue on Discord
+
+    if cell.token is CheckersTokenType.EMPTY:
+        return cell_message + full_padding + ' ' + full_padding
+
+    cell_message += cell_padding
+    if (cell.token is CheckersTokenType.REGULAR and
+          cell.player is CheckersPlayer.PLAYER1):
+        # Bold Circled White Bullet
+        cell_message += underline + '⦾' + reset_underline
+    elif (cell.token is CheckersTokenType.KING and
+          cell.player is CheckersPlayer.PLAYER1):
+        # White Chess King
+        cell_message += '♔'
+    elif (cell.token is CheckersTokenType.REGULAR and
+          cell.player is CheckersPlayer.PLAYER2):
+        # Bold Circled Bullet
+        cell_message += underline + '⦿' + reset_underline
+    elif (cell.token is CheckersTokenType.KING and
+          cell.player is CheckersPlayer.PLAYER2):
+        # Black Chess King
+        cell_message += '♚'
+    return cell_message + cell_padding
+
+
+def render_header(legacy: bool) -> str:
+    underline, _, reset_all = get_board_styles(legacy)
+    header: str = '```ansi\n' + reset_all + underline + '  '
+    for column in range(board_size):
+        column_letter: str = chr(ord('A') + column)
+        header += full_padding + column_letter + full_padding
+    return header
+
+
+def render_row_label(row: int, legacy: bool) -> str:
+    underline, reset_underline, reset_all = get_board_styles(legacy)
+    row_number = str(board_size - row)
+    return '\n' + reset_all + underline + row_number + reset_underline + ' '
+
+
+# Every way a cell can be shown, indexed by cell, if it is a light square, if
+# its token can move, if it is a target and if using legacy mode
+cell_fragments: dict[tuple[CheckersBoardCell, bool, bool, bool, bool], str] = {
+  (cell, light, highlight_token, highlight_cell, legacy):
+    render_cell(cell, light, highlight_token, highlight_cell, legacy)
+  for cell in (empty_cell, *player1_cells, *player2_cells)
+  for light in (False, True)
+  for highlight_token in (False, True)
+  for highlight_cell in (False, True)
+  for legacy in (False, True)
+}
+# Indexed by legacy
+board_headers: tuple[str, str] = (render_header(False), render_header(True))
+row_labels: tuple[tuple[str, ...], tuple[str, ...]] = tuple(
+  tuple(render_row_label(row, legacy) for row in range(board_size))
+  for legacy in (False, True)
+)
 
 
-        board_message += reset_all + underline + '  '
-        for column in range(board_size):
-            column_letter: str = chr(ord('A') + column)
-            board_message += full_padding + column_letter + full_padding
+class CheckersBoard:
+    """Class to store information about the checkers board."""
+    position: CheckersPosition
+    # Position, player and chain that _valid_moves was found for
+    _valid_moves_key: Optional[
+      tuple[CheckersPosition, CheckersPlayer, Optional[int]]
+    ] = None
+    _valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]]
+    # The last text shown for each row and what it was shown for
+    _rows: list[str]
+    _row_keys: list[int]
 
+    def __init__(self):
+        self.position = initial_position
+        self._rows = [''] * board_size
+        self._row_keys = [-1] * board_size
+
+    def get_cell(self, row: int, column: int) -> CheckersBoardCell:
+        square: Optional[int] = get_square(row, column)
+        if square is None:
+            return empty_cell
+        square_bit: int = 1 << square
+        king: bool = self.position.kings & square_bit != 0
+        if self.position.player1 & square_bit:
+            return player1_cells[king]
+        if self.position.player2 & square_bit:
+            return player2_cells[king]
+        return empty_cell
+
+    def get_cells(self) -> bytes:
+        """Pack each cell into a byte, token type then player."""
+        cells = bytearray()
         for row in range(board_size):
-            row_number = str(board_size - row)
-            board_message += '\n' + reset_all
-            board_message += underline + row_number + reset_underline
-            board_message += ' '
-
             for column in range(board_size):
-                cell: CheckersBoardCell = self.board[row][column]
-                position = CheckersBoardPosition(row, column)
-
-                highlight_token: bool = (
-                  stage is CheckersScreenStage.TOKEN and
-                  self._valid_moves is not None and
-                  position in self._valid_moves and
-                  # TODO: Check if this is needed
-                  len(self._valid_moves[position]) > 0
+                cell: CheckersBoardCell = self.get_cell(row, column)
+                cells.append(
+                  cell.token.value |
+                  (0 if cell.player is None else cell.player.value) << 2
                 )
+        return bytes(cells)
+
+    def load_cells(self, cells: bytes) -> None:
+        player1: int = 0
+        player2: int = 0
+        kings: int = 0
+        for idx, cell_info in enumerate(cells):
+            square: Optional[int] = get_square(*divmod(idx, board_size))
+            if square is None or cell_info >> 2 == 0:
+                continue
+            if cell_info >> 2 == CheckersPlayer.PLAYER1.value:
+                player1 |= 1 << square
+            else:
+                player2 |= 1 << square
+            if cell_info & 0x3 == CheckersTokenType.KING.value:
+                kings |= 1 << square
+        self.position = CheckersPosition(player1, player2, kings)
 
-                highlight_cell: bool = (
-                  target_positions is not None and
-                  position in target_positions
+    def get_board(
+      self, stage: CheckersScreenStage, token: Optional[CheckersBoardPosition],
+      legacy: bool,
+      valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]]
+    ) -> str:
+        """Convert a board into a string, only redrawing rows that changed
+           since the last call."""
+        token_squares: int = 0
+        target_squares: int = 0
+        if stage is CheckersScreenStage.TOKEN:
+            for position in valid_moves:
+                token_squares |= square_bits[position]
+        elif stage is CheckersScreenStage.TARGET and token in valid_moves:
+            for _, target in valid_moves[token]:
+                target_squares |= square_bits[target]
+
+        player1, player2, kings = self.position
+        for row in range(board_size):
+            # Everything that changes how the row is shown, four bits each
+            shift: int = row * 4
+            row_key: int = (
+              (player1 >> shift & 0xF) | (player2 >> shift & 0xF) << 4 |
+              (kings >> shift & 0xF) << 8 | (token_squares >> shift & 0xF) << 12 |
+              (target_squares >> shift & 0xF) << 16 | legacy << 20
+            )
+            if row_key != self._row_keys[row]:
+                self._rows[row] = self._render_row(
+                  row, token_squares, target_squares, legacy
                 )
+                self._row_keys[row] = row_key
 
-                if not legacy:
-                    match cell.player:
-                        case CheckersPlayer.PLAYER1:
-                            if highlight_token:
-                                board_message += Fore.CYAN
-                            else:
-                                board_message += Fore.BLUE
-                        case CheckersPlayer.PLAYER2:
-                            if highlight_token:
-                                board_message += Fore.MAGENTA
-                            else:
-                                board_message += Fore.RED
-                        case None:
-                            pass
-
-                    if row % 2 == column % 2:
-                        board_message += Back.WHITE
-                    elif highlight_cell:
-                        board_message += Back.BLUE # Gray on Discord
-                    else:
-                        board_message += Back.BLACK # Firefly dark blue on Discord
+        return board_headers[legacy] + ''.join(self._rows) + '```'
 
-                if cell.token is CheckersTokenType.EMPTY:
-                    board_message += full_padding + ' ' + full_padding
-                else:
-                    board_message += cell_padding
-                    if (cell.token is CheckersTokenType.REGULAR and
-                          cell.player is CheckersPlayer.PLAYER1):
-                        # Bold Circled White Bullet
-                        board_message += underline + '⦾' + reset_underline
-                    elif (cell.token is CheckersTokenType.KING and
-                          cell.player is CheckersPlayer.PLAYER1):
-                        # White Chess King
-                        board_message += '♔'
-                    elif (cell.token is CheckersTokenType.REGULAR and
-                          cell.player is CheckersPlayer.PLAYER2):
-                        # Bold Circled Bullet
-                        board_message += underline + '⦿' + reset_underline
-                    elif (cell.token is CheckersTokenType.KING and
-                          cell.player is CheckersPlayer.PLAYER2):
-                        # Black Chess King
-                        board_message += '♚'
-                    board_message += cell_padding
-
-        return board_message + '```'
+    def _render_row(
+      self, row: int, token_squares: int, target_squares: int, legacy: bool
+    ) -> str:
+        fragments: list[str] = [row_labels[legacy][row]]
+        for column in range(board_size):
+            square: Optional[int] = get_square(row, column)
+            square_bit: int = 0 if square is None else 1 << square
+            fragments.append(cell_fragments[(
+              self.get_cell(row, column), square is None,
+              token_squares & square_bit != 0, target_squares & square_bit != 0,
+              legacy
+            )])
+        return ''.join(fragments)
 
     def get_valid_moves(
-      self, player: CheckersPlayer, repeated_capture: bool = False,
-      force: bool = False
+      self, player: CheckersPlayer, chain: Optional[int] = None
     ) -> dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]]:
-        if self._valid_moves is not None and not force:
+        """Find the first step of each legal move, with chain being the square
+           of a token part way through capturing."""
+        key: tuple[CheckersPosition, CheckersPlayer, Optional[int]] = (
+          self.position, player, chain
+        )
+        if key == self._valid_moves_key:
             return self._valid_moves
 
-        self._valid_moves = {}
-
-        for row in range(board_size):
-            for column in range(board_size):
-                cell: CheckersBoardCell = self.board[row][column]
-                valid_moves: set[tuple[bool, CheckersBoardPosition]] = set()
-
-                if cell.player is not player:
-                    continue
-
-                can_move_up:   bool = cell.can_move_up()
-                can_move_down: bool = cell.can_move_down()
-
-                # Up and left
-                if can_move_up and row > 0 and column > 0:
-                    next_cell: CheckersBoardCell = (
-                        self.board[row - 1][column - 1]
-                    )
-                    if next_cell.token is CheckersTokenType.EMPTY:
-                        if not repeated_capture:
-                            valid_moves.add(
-                              (False, CheckersBoardPosition(row - 1, column - 1))
-                            )
-                    elif next_cell.player is not player and row > 1 and column > 1:
-                        next_cell = self.board[row - 2][column - 2]
-                        if next_cell.token is CheckersTokenType.EMPTY:
-                            valid_moves.add(
-                              (True, CheckersBoardPosition(row - 2, column - 2))
-                            )
-
-                # Up and right
-                if can_move_up and row > 0 and column < board_size - 1:
-                    next_cell: CheckersBoardCell = (
-                        self.board[row - 1][column + 1]
-                    )
-                    if next_cell.token is CheckersTokenType.EMPTY:
-                        if not repeated_capture:
-                            valid_moves.add(
-                              (False, CheckersBoardPosition(row - 1, column + 1))
-                            )
-                    elif next_cell.player is not player and row > 1 and column < board_size - 2:
-                        next_cell = self.board[row - 2][column + 2]
-                        if next_cell.token is CheckersTokenType.EMPTY:
-                            valid_moves.add(
-                              (True, CheckersBoardPosition(row - 2, column + 2))
-                            )
-
-                # Down and left
-                if can_move_down and row < board_size - 1 and column > 0:
-                    next_cell: CheckersBoardCell = (
-                        self.board[row + 1][column - 1]
-                    )
-                    if next_cell.token is CheckersTokenType.EMPTY:
-                        if not repeated_capture:
-                            valid_moves.add(
-                              (False, CheckersBoardPosition(row + 1, column - 1))
-                            )
-                    elif next_cell.player is not player and row < board_size - 2 and column > 1:
-                        next_cell = self.board[row + 2][column - 2]
-                        if next_cell.token is CheckersTokenType.EMPTY:
-                            valid_moves.add(
-                              (True, CheckersBoardPosition(row + 2, column - 2))
-                            )
-
-                # Down and right
-                if can_move_down and row < board_size - 1 and column < board_size - 1:
-                    next_cell: CheckersBoardCell = (
-                        self.board[row + 1][column + 1]
-                    )
-                    if next_cell.token is CheckersTokenType.EMPTY:
-                        if not repeated_capture:
-                            valid_moves.add(
-                              (False, CheckersBoardPosition(row + 1, column + 1))
-                            )
-                    elif next_cell.player is not player and row < board_size - 2 and column < board_size - 2:
-                        next_cell = self.board[row + 2][column + 2]
-                        if next_cell.token is CheckersTokenType.EMPTY:
-                            valid_moves.add(
-                              (True, CheckersBoardPosition(row + 2, column + 2))
-                            )
-
-                if len(valid_moves) > 0:
-                    self._valid_moves[CheckersBoardPosition(row, column)] = valid_moves
+        valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]] = {}
+        # Squares are numbered by row then column so tokens keep board order
+        for path in sorted(get_legal_moves(
+          self.position, player is CheckersPlayer.PLAYER1, chain
+        )):
+            token: CheckersBoardPosition = square_positions[path[0]]
+            if token not in valid_moves:
+                valid_moves[token] = set()
+            valid_moves[token].add(
+              square_targets[path[1]][is_capture((path[0], path[1]))]
+            )
 
-        return self._valid_moves
+        self._valid_moves_key = key
+        self._valid_moves = valid_moves
+        return valid_moves
 
 
 class CheckersGame(TextGuessGame):
@@ -316,6 +377,8 @@ class CheckersGame(TextGuessGame):
     user_id: Snowflake
     challengee_id: Snowflake
     legacy: bool
+    # The bot is always player 2
+    against_bot: bool
 
     in_thread: bool = False
 
@@ -326,24 +389,34 @@ class CheckersGame(TextGuessGame):
     repeated_capture: bool = False
     user_lost_token_count: int = 0
     challengee_lost_token_count: int = 0
+    # Every move so far, the last one may be part way through capturing
+    history: list[CheckersMovePath]
+    # Where a game loaded from PDN started
+    start_position: CheckersPosition = initial_position
+    start_player1_to_move: bool = True
+    # Set once archived, or for a game loaded already finished
+    archived: bool = False
 
     _last_token: Optional[CheckersBoardPosition] = None
     _last_target: Optional[CheckersBoardPosition] = None
     _last_captured: Optional[CheckersBoardPosition] = None
     _last_captured_type: Optional[CheckersTokenType] = None
     _last_input_method: Optional[CheckersInputMethod] = None
+    _bot_thinking: bool = False
 
     def __init__(
       self, user_id: Snowflake, challengee_id: Snowflake, legacy: bool,
-      screen: 'CheckersScreen'
+      against_bot: bool, screen: 'CheckersScreen'
     ):
         super().__init__(user_id, True)
 
         self.user_id = user_id
         self.challengee_id = challengee_id
         self.legacy = legacy
+        self.against_bot = against_bot
         self.screen = screen
         self.board = CheckersBoard()
+        self.history = []
 
     # TODO: Report already made moves
     def add_guess(self, user_id: Snowflake, guess: str) -> GuessOutcome:
@@ -359,19 +432,12 @@ class CheckersGame(TextGuessGame):
                 if user_id != self.challengee_id:
                     return GuessOutcome.Invalid
 
-        regex: str = r'^\s*([a-h][1-8])\s*[,\s]\s*([a-h][1-8])\s*$'
-        guess_matches: Optional[Match[str]] = search(regex, guess, IGNORECASE)
-        if not guess_matches:
+        parsed_guess: Optional[ParsedGuess] = parse_checkers_guess(guess)
+        if parsed_guess is None:
             return GuessOutcome.Invalid
-        guess_groups: tuple[str, ...] = guess_matches.groups()
-
-        token_column: int = ord(guess_groups[0][0].upper()) - ord('A')
-        token_row: int = board_size - int(guess_groups[0][1])
-        token = CheckersBoardPosition(token_row, token_column)
 
-        target_column: int = ord(guess_groups[1][0].upper()) - ord('A')
-        target_row: int = board_size - int(guess_groups[1][1])
-        target = CheckersBoardPosition(target_row, target_column)
+        token = CheckersBoardPosition(*parsed_guess.cells[0])
+        target = CheckersBoardPosition(*parsed_guess.cells[1])
         non_capture_target_info: tuple[bool, CheckersBoardPosition] = (
           False, target
         )
@@ -380,7 +446,7 @@ class CheckersGame(TextGuessGame):
         )
 
         valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]] = (
-          self.board.get_valid_moves(self.player, self.repeated_capture)
+          self.get_valid_moves()
         )
         if token not in valid_moves or (
           non_capture_target_info not in valid_moves[token] and
@@ -390,7 +456,7 @@ class CheckersGame(TextGuessGame):
 
         self.make_move(token, target, CheckersInputMethod.REPLY)
         self.screen.stage = CheckersScreenStage.TOKEN
-        create_task(self.screen.show_buttons())
+        create_task(self.screen.show_move())
         return GuessOutcome.Valid
 
     def __str__(self) -> str:
@@ -398,7 +464,10 @@ class CheckersGame(TextGuessGame):
         challengee_mention = f'<@{self.challengee_id}>'
 
         # line 1
-        status = f'{challengee_mention} You have been challenged to Checkers!\n'
+        if self.against_bot:
+            status = f'{user_mention} has challenged {challengee_mention} to Checkers!\n'
+        else:
+            status = f'{challengee_mention} You have been challenged to Checkers!\n'
 
         # line 2
         status += f'Blue is {user_mention}, red is {challengee_mention}.\n'
@@ -429,8 +498,8 @@ class CheckersGame(TextGuessGame):
             status += 'The last move by '
 
             # self.make_move moved the cell from token to target so using target position
-            moved_cell: CheckersBoardCell = (
-              self.board.board[self._last_target.row][self._last_target.column]
+            moved_cell: CheckersBoardCell = self.board.get_cell(
+              self._last_target.row, self._last_target.column
             )
 
             assert moved_cell.player is not None
@@ -470,6 +539,10 @@ class CheckersGame(TextGuessGame):
                     status += 'the buttons'
                 case CheckersInputMethod.REPLY:
                     status += 'reply'
+                case CheckersInputMethod.BOT:
+                    status += 'search'
+                case CheckersInputMethod.PDN:
+                    status += 'PDN'
             status += '.\n'
 
         # line 7(optional)
@@ -488,7 +561,8 @@ class CheckersGame(TextGuessGame):
             status += '.\n'
 
         status += self.board.get_board(
-          self.screen.stage, self.screen.token, self.legacy
+          self.screen.stage, self.screen.token, self.legacy,
+          self.get_valid_moves()
         )
 
         match self.status:
@@ -506,6 +580,78 @@ class CheckersGame(TextGuessGame):
 
         return status
 
+    def get_state(self) -> Any:
+        positions = tuple(
+          None if position is None else (position.row, position.column)
+          for position in
+            (self._last_token, self._last_target, self._last_captured)
+        )
+        return (
+          # Cells are only needed by older versions, the PDN is replayed
+          int(self.challengee_id), self.legacy, b'', self.status.value,
+          self.player.value, self.repeated_capture, self.user_lost_token_count,
+          self.challengee_lost_token_count, positions,
+          None if self._last_captured_type is None
+            else self._last_captured_type.value,
+          None if self._last_input_method is None
+            else self._last_input_method.value,
+          self.against_bot, self.get_pdn(), self.archived
+        )
+
+    @classmethod
+    def from_state(
+      cls, user_id: Snowflake, multiguesser: bool, state: Any
+    ) -> 'CheckersGame':
+        (challengee_id, legacy, cells, status, player, repeated_capture,
+         user_lost_token_count, challengee_lost_token_count, positions,
+         last_captured_type, last_input_method, *optional) = state
+        against_bot: bool = len(optional) > 0 and optional[0]
+
+        screen = CheckersScreen(
+          Menu(), user_id, Snowflake(challengee_id), legacy, against_bot
+        )
+        game: CheckersGame = screen.game
+        game_screens[game] = screen
+
+        # Snapshots from older versions only have the cells
+        if len(optional) > 1:
+            game.load_pdn(read_pdn(optional[1]), CheckersInputMethod.PDN)
+            game.archived = optional[2]
+        else:
+            game.board.load_cells(cells)
+        game.status = CheckersGameStatus(status)
+        game.player = CheckersPlayer(player)
+        game.repeated_capture = repeated_capture
+        game.user_lost_token_count = user_lost_token_count
+        game.challengee_lost_token_count = challengee_lost_token_count
+        game._last_token, game._last_target, game._last_captured = (
+          None if position is None else CheckersBoardPosition(*position)
+          for position in positions
+        )
+        if last_captured_type is not None:
+            game._last_captured_type = CheckersTokenType(last_captured_type)
+        if last_input_method is not None:
+            game._last_input_method = CheckersInputMethod(last_input_method)
+        return game
+
+    async def restore_message(
+      self, app: RESTAware, channel_id: Snowflake, message_id: Snowflake
+    ) -> None:
+        screen_builder = await self.screen.menu.build_response_async(
+          plugin.model.miru, self.screen
+        )
+        self.message = await app.rest.edit_message(
+          channel_id, message_id, screen_builder.content,
+          components=screen_builder.components
+        )
+        plugin.model.miru.start_view(self.screen.menu, bind_to=self.message)
+        self.start_bot_turn()
+
+    def on_expired(self) -> None:
+        screen = game_screens.pop(self, None)
+        if screen is not None:
+            screen.menu.stop()
+
     def make_move(
       self, token: CheckersBoardPosition, target: CheckersBoardPosition,
       input_method: CheckersInputMethod
@@ -515,13 +661,18 @@ class CheckersGame(TextGuessGame):
         if target.row >= board_size or target.column >= board_size:
             return
 
+        token_square: Optional[int] = get_square(token.row, token.column)
+        target_square: Optional[int] = get_square(target.row, target.column)
+        if token_square is None or target_square is None:
+            return
+
         # Find info on current token location
-        token_cell: CheckersBoardCell = self.board.board[token.row][token.column]
+        token_cell: CheckersBoardCell = self.board.get_cell(token.row, token.column)
         if token_cell.token is CheckersTokenType.EMPTY or token_cell.player is not self.player:
             return
 
         # Find into on target location
-        target_cell: CheckersBoardCell = self.board.board[target.row][target.column]
+        target_cell: CheckersBoardCell = self.board.get_cell(target.row, target.column)
         if target_cell.token is not CheckersTokenType.EMPTY:
             return
 
@@ -530,56 +681,45 @@ class CheckersGame(TextGuessGame):
         self._last_target = target
         self._last_input_method = input_method
 
-        # Determine if move captures an opposing token
-        # (x + x + n) % 2 = (2x + n) % 2 = (2x % 2 + n % 2) % 2 = (n % 2) % 2 = n % 2
-        capturing: bool = (token.row + target.row) % 2 == 0
-
-        # Remove captured token(if any) and backup token for printing
+        # Backup captured token(if any) for printing
+        move: CheckersMove = (token_square, target_square)
+        capturing: bool = is_capture(move)
         if capturing:
-            self._last_captured = CheckersBoardPosition(
-              (token.row + target.row) // 2, (token.column + target.column) // 2
-            )
-            captured_cell: CheckersBoardCell = (
-              self.board.board[self._last_captured.row][self._last_captured.column]
-            )
-            self._last_captured_type = captured_cell.token
-            captured_cell.token = CheckersTokenType.EMPTY
-            captured_cell.player = None
+            self._last_captured = square_positions[get_captured_square(move)]
+            self._last_captured_type = self.board.get_cell(
+              self._last_captured.row, self._last_captured.column
+            ).token
         else:
             self._last_captured = None
             self._last_captured_type = None
 
-        # Move token to target position
-        target_cell.token = token_cell.token
-        target_cell.player = token_cell.player
-        token_cell.token = CheckersTokenType.EMPTY
-        token_cell.player = None
-
-        # Check for forced additional captures
-        if capturing:
-            valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]] = (
-                self.board.get_valid_moves(self.player, True, True)
-            )
+        # Move token to target position, removing any captured token
+        player1_to_move: bool = self.player is CheckersPlayer.PLAYER1
+        result: CheckersMoveResult = apply_move(
+          self.board.position, player1_to_move, move
+        )
+        self.board.position = result.position
 
-            self.repeated_capture = (
-              target in valid_moves and
-              len([move for move in valid_moves[target] if move[0]]) > 0
-            )
+        # A capture after the first is part of the same move
+        if self.repeated_capture:
+            self.history[-1] += (target_square,)
         else:
-            self.repeated_capture = False
+            self.history.append(move)
+
+        # Check for forced additional captures, a promoted token's turn ends
+        self.repeated_capture = (
+          capturing and not result.promoted and
+          len(get_jumps(result.position, player1_to_move, 1 << target_square)) > 0
+        )
 
-        # Check for king promotion, count lost tokens and switch player if no forced captures
+        # Count lost tokens and switch player if no forced captures
         match self.player:
             case CheckersPlayer.PLAYER1:
-                if target.row == 0:
-                    target_cell.token = CheckersTokenType.KING
                 if capturing:
                     self.challengee_lost_token_count += 1
                 if not self.repeated_capture:
                     self.player = CheckersPlayer.PLAYER2
             case CheckersPlayer.PLAYER2:
-                if target.row == board_size - 1:
-                    target_cell.token = CheckersTokenType.KING
                 if capturing:
                     self.user_lost_token_count += 1
                 if not self.repeated_capture:
@@ -587,14 +727,154 @@ class CheckersGame(TextGuessGame):
 
         # End game if no remaining moves
         valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]] = (
-          self.board.get_valid_moves(self.player, self.repeated_capture, True)
+          self.get_valid_moves()
         )
         if len(valid_moves) == 0:
             match self.player:
                 case CheckersPlayer.PLAYER1:
-                    self.status = CheckersGameStatus.PLAYER1_WON
+                    self.status = CheckersGameStatus.PLAYER2_WON
                 case CheckersPlayer.PLAYER2:
+                    self.status = CheckersGameStatus.PLAYER1_WON
+
+    def get_chain(self) -> Optional[int]:
+        """Find the square of the token that has to keep capturing, if any."""
+        if not self.repeated_capture or self._last_target is None:
+            return None
+        return get_square(self._last_target.row, self._last_target.column)
+
+    def get_valid_moves(
+      self
+    ) -> dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]]:
+        return self.board.get_valid_moves(self.player, self.get_chain())
+
+    def get_pdn(self, tags: Optional[dict[str, str]] = None) -> str:
+        """Write the moves so far as PDN, player 1 being black."""
+        result: str = unfinished_result
+        match self.status:
+            case CheckersGameStatus.PLAYER1_WON:
+                result = player1_win_result
+            case CheckersGameStatus.PLAYER2_WON:
+                result = player2_win_result
+            case CheckersGameStatus.STARTED:
+                pass
+        return write_pdn(
+          {} if tags is None else tags, self.history, result,
+          self.start_position, self.start_player1_to_move
+        )
+
+    def get_pdn_tags(self) -> dict[str, str]:
+        """Name the players for sharing a game outside of discord."""
+        names: list[str] = []
+        for user_id in (self.user_id, self.challengee_id):
+            user: Optional[User] = plugin.app.cache.get_user(user_id)
+            names.append(str(user_id) if user is None else user.username)
+        return {
+          'Event': 'PC Bot checkers', 'Date': strftime('%Y.%m.%d'),
+          'Black': names[0], 'White': names[1]
+        }
+
+    def load_pdn(
+      self, pdn: PdnGame, input_method: CheckersInputMethod
+    ) -> None:
+        """Replay the moves of a game, including the last one for printing."""
+        self.start_position = pdn.start_position
+        self.start_player1_to_move = pdn.start_player1_to_move
+        self.history = list(pdn.moves)
+        self.board.position = pdn.position
+        self.player = (CheckersPlayer.PLAYER1 if pdn.player1_to_move
+                       else CheckersPlayer.PLAYER2)
+        self.repeated_capture = pdn.chain is not None
+        self.user_lost_token_count = 0
+        self.challengee_lost_token_count = 0
+
+        position: CheckersPosition = pdn.start_position
+        player1_to_move: bool = pdn.start_player1_to_move
+        for path in pdn.moves:
+            for source, target in zip(path, path[1:]):
+                result: CheckersMoveResult = apply_move(
+                  position, player1_to_move, (source, target)
+                )
+                if result.captured is not None:
+                    if player1_to_move:
+                        self.challengee_lost_token_count += 1
+                    else:
+                        self.user_lost_token_count += 1
+                    self._last_captured = square_positions[result.captured]
+                    self._last_captured_type = (
+                      CheckersTokenType.KING
+                      if position.kings & 1 << result.captured
+                      else CheckersTokenType.REGULAR
+                    )
+                else:
+                    self._last_captured = None
+                    self._last_captured_type = None
+                self._last_token = square_positions[source]
+                self._last_target = square_positions[target]
+                self._last_input_method = input_method
+                position = result.position
+            player1_to_move = not player1_to_move
+
+        if len(self.get_valid_moves()) == 0:
+            match self.player:
+                case CheckersPlayer.PLAYER1:
                     self.status = CheckersGameStatus.PLAYER2_WON
+                case CheckersPlayer.PLAYER2:
+                    self.status = CheckersGameStatus.PLAYER1_WON
+
+    def archive_result(self) -> None:
+        """Add a finished game to the archive, only doing so once."""
+        if self.archived or self.status is CheckersGameStatus.STARTED:
+            return
+        self.archived = True
+        winner: int = no_winner
+        match self.status:
+            case CheckersGameStatus.PLAYER1_WON:
+                winner = player1_winner
+            case CheckersGameStatus.PLAYER2_WON:
+                winner = player2_winner
+            case CheckersGameStatus.STARTED:
+                pass
+        game_id: int = archive.add(
+          self.get_pdn(self.get_pdn_tags()), int(time()), self.user_id,
+          self.challengee_id, winner, len(self.history)
+        )
+        logger.info(f'Archived checkers game {game_id}')
+
+    def is_bot_turn(self) -> bool:
+        return (
+          self.against_bot and self.status is CheckersGameStatus.STARTED and
+          self.player is CheckersPlayer.PLAYER2
+        )
+
+    def start_bot_turn(self) -> None:
+        if self.is_bot_turn() and not self._bot_thinking:
+            create_task(self.play_bot_turn())
+
+    async def play_bot_turn(self) -> None:
+        """Make the bot's moves, searching on another thread so that the
+           event loop keeps running, then show the board."""
+        self._bot_thinking = True
+        try:
+            while self.is_bot_turn():
+                result: SearchResult = await get_running_loop().run_in_executor(
+                  search_executor, find_best_move, transposition_table,
+                  self.board.position, False, self.get_chain(),
+                  bot_move_seconds
+                )
+                # The game may have expired while searching
+                if self not in game_screens or result.move is None:
+                    return
+                logger.info(
+                  f'Checkers bot searched {result.nodes} positions to depth '
+                  f'{result.depth} in {result.seconds:.2f}s'
+                )
+                self.make_move(
+                  square_positions[result.move[0]],
+                  square_positions[result.move[1]], CheckersInputMethod.BOT
+                )
+        finally:
+            self._bot_thinking = False
+        await self.screen.show_buttons()
 
 def create_button(
   label: str,
@@ -618,10 +898,12 @@ class CheckersScreen(Screen):
 
     def __init__(
       self, menu: Menu, user_id: Snowflake, challengee_id: Snowflake,
-      legacy: bool
+      legacy: bool, against_bot: bool = False
     ):
         super().__init__(menu)
-        self.game = CheckersGame(user_id, challengee_id, legacy, self)
+        self.game = CheckersGame(
+          user_id, challengee_id, legacy, against_bot, self
+        )
 
     async def build_content(self) -> ScreenContent:
         if not self.created_initial_buttons:
@@ -640,11 +922,17 @@ class CheckersScreen(Screen):
             for child in self.menu.children:
                 child.disabled = True
 
-        await self.menu.update_message(await self.build_content())
+        content: ScreenContent = await self.build_content()
+        touch_game(self.game)
+        # This sends the latest board so any edit queued by a reply is stale
+        drop_pending_edit(self.menu.message.id)
+        await self.menu.update_message(content)
 
         if game_over:
+            self.game.archive_result()
             remove_game(self.menu.message.id)
             remove_game(self.menu.message.channel_id)
+            game_screens.pop(self.game, None)
             self.menu.stop()
 
     async def show_buttons(self) -> None:
@@ -656,9 +944,15 @@ class CheckersScreen(Screen):
               await self.show_target_buttons()
         await self.reload()
 
+    async def show_move(self) -> None:
+        """Show the board after a player moves, then let the bot move if it
+           is playing."""
+        await self.show_buttons()
+        self.game.start_bot_turn()
+
     async def show_token_buttons(self) -> None:
         valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]] = (
-            self.game.board.get_valid_moves(self.game.player, self.game.repeated_capture)
+            self.game.get_valid_moves()
         )
 
         token: CheckersBoardPosition
@@ -667,7 +961,7 @@ class CheckersScreen(Screen):
 
     async def show_target_buttons(self) -> None:
         valid_moves: dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]] = (
-            self.game.board.get_valid_moves(self.game.player, self.game.repeated_capture)
+            self.game.get_valid_moves()
         )
 
         assert self.token is not None
@@ -712,7 +1006,7 @@ class CheckersScreen(Screen):
         assert self.token is not None
         self.game.make_move(self.token, target, CheckersInputMethod.SCREEN)
 
-        await self.show_buttons()
+        await self.show_move()
 
     async def back_pressed(
       self, ctx: ViewContext, button: ScreenButton
@@ -722,6 +1016,72 @@ class CheckersScreen(Screen):
         await self.show_buttons()
 
 game_screens: dict[CheckersGame, CheckersScreen] = {}
+register_game_type(CheckersGame)
+# Kept when reloading, see the end of the file
+search_executor: ThreadPoolExecutor
+transposition_table: TranspositionTable
+archive: CheckersArchive
+
+# Longer games are sent as a file
+max_pdn_message_length: int = 1900
+
+
+async def start_game(
+  ctx: Context, screen: CheckersScreen, want_thread: bool, start_ns: int
+) -> None:
+    """Show the board and buttons of a new game."""
+    checkers_menu: Menu = screen.menu
+
+    in_correct_thread: bool
+    channel: Optional[TextableGuildChannel]
+    in_correct_thread, channel = await get_interaction_channel(
+      ctx, 'Checkers'
+    )
+    in_thread: bool = (
+      channel is not None and channel.type is ChannelType.GUILD_PUBLIC_THREAD
+    )
+
+    screen.game.in_thread = (not in_thread and want_thread) or in_correct_thread
+    screen_builder = await checkers_menu.build_response_async(
+        plugin.model.miru, screen
+    )
+    game_screens[screen.game] = screen
+
+    # TODO: Report want_thread being ignored if in wrong thread?
+    if not in_thread and want_thread:
+        thread: GuildThreadChannel = await start_game_thread(
+          ctx, 'Checkers'
+        )
+        screen.game.message = await screen_builder.send_to_channel(thread)
+
+        add_game(thread.id, screen.game)
+    else:
+        if channel is not None and in_correct_thread:
+            add_game(channel.id, screen.game)
+
+        screen.game.message = await ctx.respond_with_builder(
+          screen_builder, ensure_message=True
+        )
+        assert screen.game.message is not None
+
+    record_first_board('Checkers', start_ns)
+    add_game(screen.game.message.id, screen.game)
+
+    plugin.model.miru.start_view(
+      checkers_menu, bind_to=screen.game.message
+    )
+    # A loaded game can start on the bot's turn
+    screen.game.start_bot_turn()
+
+
+async def respond_with_pdn(ctx: Context, title: str, pdn: str) -> None:
+    if len(pdn) > max_pdn_message_length:
+        await ctx.respond(
+          f'{title}:', attachment=Bytes(pdn.encode(), 'checkers.pdn'),
+          user_mentions=False
+        )
+    else:
+        await ctx.respond(f'{title}:\n```\n{pdn}\n```', user_mentions=False)
 
 
 @plugin.include
@@ -735,62 +1095,164 @@ class CheckersCommand:
     Implemented by Joshua(somethingsensible) & Lachlan McKay(emiko_namami).
     """
 
-    user = option(User, 'User to challenge')
+    user = option(
+      User, 'User to challenge, leave empty to play the bot', default=None
+    )
     legacy = option(bool, 'Support legacy mobile devices', default=False)
 
     thread = option(bool, 'Automatically create a thread', default=False)
+    pdn = option(
+      str, 'PDN moves to continue a game from, you play black', default=None
+    )
 
     async def callback(self, ctx: Context) -> None:
         """Handle checkers command being run by showing board and buttons."""
+        start_ns: int = perf_counter_ns()
+
         logger.info(
           f'{ctx.user} is starting a game(user: {self.user}, ' +
-          f'legacy: {self.legacy}, thread: {self.thread})'
+          f'legacy: {self.legacy}, thread: {self.thread}, pdn: {self.pdn})'
         )
 
-        checkers_menu = Menu()
-        screen = CheckersScreen(
-          checkers_menu, ctx.user.id, self.user.id, self.legacy
-        )
+        pdn: Optional[PdnGame] = None
+        if self.pdn is not None:
+            try:
+                pdn = read_pdn(self.pdn)
+            except ValueError as error:
+                await ctx.respond(
+                  f'Unable to load PDN: {error}.', ephemeral=True
+                )
+                return
 
-        in_correct_thread: bool
-        channel: Optional[TextableGuildChannel]
-        in_correct_thread, channel = await get_interaction_channel(
-          ctx, 'Checkers'
-        )
-        in_thread: bool = (
-          channel is not None and channel.type is ChannelType.GUILD_PUBLIC_THREAD
+        bot_user: Optional[User] = plugin.app.get_me()
+        assert bot_user is not None
+        against_bot: bool = self.user is None or self.user.id == bot_user.id
+        challengee_id: Snowflake = (
+          bot_user.id if self.user is None else self.user.id
         )
 
-        screen.game.in_thread = (not in_thread and self.thread) or in_correct_thread
-        screen_builder = await checkers_menu.build_response_async(
-            plugin.model.miru, screen
+        screen = CheckersScreen(
+          Menu(), ctx.user.id, challengee_id, self.legacy, against_bot
         )
-        game_screens[screen.game] = screen
+        if pdn is not None:
+            screen.game.load_pdn(pdn, CheckersInputMethod.PDN)
+            # Only games played here are archived
+            if screen.game.status is not CheckersGameStatus.STARTED:
+                screen.game.archived = True
+                await ctx.respond(str(screen.game), user_mentions=False)
+                return
 
-        # TODO: Report want_thread being ignored if in wrong thread?
-        if not in_thread and self.thread:
-            # TODO: Avoid this message
-            await ctx.respond(
-              'Starting checkers game in thread!', ephemeral=True
+        await start_game(ctx, screen, self.thread, start_ns)
+
+
+@plugin.include
+@docstrings.parse_doc
+@command(name='checkersexport')
+class CheckersExportCommand:
+    """
+    Share the moves of a checkers game as PDN.
+
+    Requested by Lachlan McKay(emiko_namami).
+    Implemented by Joshua(somethingsensible).
+    """
+
+    game = option(
+      int, 'Archived game number, leave empty for your current or last game',
+      min_value=0, default=None
+    )
+
+    async def callback(self, ctx: Context) -> None:
+        """Handle export command being run by sending the game's PDN."""
+        if self.game is not None:
+            pdn: Optional[str] = archive.read_game(self.game)
+            if pdn is None:
+                await ctx.respond(
+                  f'There is no archived game {self.game}.', ephemeral=True
+                )
+                return
+            await respond_with_pdn(ctx, f'Checkers game {self.game}', pdn)
+            return
+
+        # Prefer a game in this channel, then any game still being played
+        playing: list[CheckersGame] = [
+          game for game in game_screens
+          if ctx.user.id in (game.user_id, game.challengee_id)
+        ]
+        playing.sort(key=lambda game: (
+          game.message is not None and game.message.channel_id == ctx.channel_id
+        ))
+        if playing:
+            game: CheckersGame = playing[-1]
+            await respond_with_pdn(
+              ctx, f'Checkers game between <@{game.user_id}> and '
+              f'<@{game.challengee_id}>', game.get_pdn(game.get_pdn_tags())
             )
+            return
 
-            thread: GuildThreadChannel = await ctx.app.rest.create_thread(
-              ctx.channel_id, ChannelType.GUILD_PUBLIC_THREAD, 'Checkers'
+        game_ids: list[int] = archive.get_user_games(ctx.user.id)
+        if not game_ids:
+            await ctx.respond(
+              'You have no checkers games to export, start one with /checkers.',
+              ephemeral=True
             )
-            screen.game.message = await screen_builder.send_to_channel(thread)
+            return
+        pdn = archive.read_game(game_ids[-1])
+        assert pdn is not None
+        await respond_with_pdn(ctx, f'Checkers game {game_ids[-1]}', pdn)
 
-            add_game(thread.id, screen.game)
-        else:
-            if channel is not None and in_correct_thread:
-                add_game(channel.id, screen.game)
 
-            screen.game.message = await ctx.respond_with_builder(
-              screen_builder, ensure_message=True
-            )
-            assert screen.game.message is not None
+@plugin.include
+@docstrings.parse_doc
+@command(name='checkersstats')
+class CheckersStatsCommand:
+    """
+    Show the results of archived checkers games against someone.
+
+    Requested by Lachlan McKay(emiko_namami).
+    Implemented by Joshua(somethingsensible).
+    """
 
-        add_game(screen.game.message.id, screen.game)
+    user = option(User, 'Opponent, leave empty for the bot', default=None)
 
-        plugin.model.miru.start_view(
-          checkers_menu, bind_to=screen.game.message
+    async def callback(self, ctx: Context) -> None:
+        """Handle stats command being run by showing the head to head."""
+        bot_user: Optional[User] = plugin.app.get_me()
+        assert bot_user is not None
+        opponent_id: Snowflake = (
+          bot_user.id if self.user is None else self.user.id
+        )
+        stats: CheckersHeadToHead = archive.get_head_to_head(
+          ctx.user.id, opponent_id
+        )
+        title: str = (
+          f'Checkers games between <@{ctx.user.id}> and <@{opponent_id}>'
+        )
+        if stats.games == 0:
+            await ctx.respond(
+              f'{title}:\nNo games have been finished yet.', user_mentions=False
+            )
+            return
+
+        recent: str = ', '.join(str(game_id) for game_id in stats.game_ids[-5:])
+        await ctx.respond(
+          f'{title}:\n{stats.games} played, <@{ctx.user.id}> won '
+          f'{stats.wins} and <@{opponent_id}> won {stats.losses}.\n'
+          f'Most recent games, see /checkersexport: {recent}',
+          user_mentions=False
         )
+
+
+# Only start the search thread the first time this module is imported so that
+# reloading it doesn't leave old threads running
+if 'search_executor' not in globals():
+    # A single thread so that searches share the table without locking
+    search_executor = ThreadPoolExecutor(
+      max_workers=1, thread_name_prefix='checkers-search'
+    )
+    transposition_table = TranspositionTable()
+
+# Only read the archive the first time this module is imported so that
+# reloading it keeps the open files
+if 'archive' not in globals():
+    archive = CheckersArchive()
+    archive.load()
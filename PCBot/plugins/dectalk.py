@@ -10,10 +10,7 @@ import socket
 import subprocess
 import sys
 from crescent.ext import docstrings
-from PCBot.botdata import (
-    BotData, lavalink_password_path, get_token_file_path,
-    ongaku_available
-)
+from PCBot.botdata import BotData, ongaku_available
 if not ongaku_available:
     raise Exception('dectalk uses hikari-ongaku which is not available')
 import ongaku
@@ -27,15 +24,13 @@ plugin = crescent.Plugin[hikari.GatewayBot, BotData]()
 lavalink_port = 2333
 first_call = True
 
-with open(get_token_file_path(lavalink_password_path)) as f:
-    lavalink_password = f.read().strip()
-
 
 def start_lavalink():
     """Start lavalink voice server."""
     environ = os.environ.copy()
     environ['SERVER_PORT'] = str(lavalink_port)
-    environ['LAVALINK_SERVER_PASSWORD'] = lavalink_password
+    environ['LAVALINK_SERVER_PASSWORD'] = \
+      plugin.model.settings.lavalink_password
     subprocess.Popen(
         ['java', '-jar', './Lavalink.jar'],
         cwd='./dectalk',
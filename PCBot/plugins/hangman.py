@@ -12,10 +12,11 @@ from hikari import GatewayBot, Message, Snowflake
 from linecache import getline
 from logging import getLogger, Logger
 from random import randrange
-from string import ascii_lowercase
-from typing import Optional
+from typing import Any, Optional
+from PCBot.guessparsing import parse_letter_guess, ParsedGuess
 from PCBot.plugins.replyhandler import (
-  GuessOutcome, remove_game, send_text_message, TextGuessGame
+  GuessOutcome, register_game_type, remove_game, send_text_message,
+  TextGuessGame
 )
 
 logger: Logger = getLogger(__name__)
@@ -57,12 +58,12 @@ class HangmanGame(TextGuessGame):
 
     def add_guess(self, user_id: Snowflake, guess: str) -> GuessOutcome:
         """Add a guess if it was not already made and reports any issues."""
-        if self.message is None or len(guess) != 1:
+        if self.message is None:
             return GuessOutcome.Invalid
-        processed_guess = guess.casefold().replace(' ', '')[0]
-
-        if processed_guess not in ascii_lowercase:
+        parsed_guess: Optional[ParsedGuess] = parse_letter_guess(guess)
+        if parsed_guess is None:
             return GuessOutcome.Invalid
+        processed_guess: str = parsed_guess.text
 
         if processed_guess in self.guesses:
             return GuessOutcome.AlreadyMade
@@ -70,6 +71,21 @@ class HangmanGame(TextGuessGame):
         self.guesses.append(processed_guess)
         return GuessOutcome.Valid
 
+    def get_state(self) -> Any:
+        """Produce the word and guesses for snapshots."""
+        return (self.word, self.guesses)
+
+    @classmethod
+    def from_state(
+      cls, user_id: Snowflake, multiguesser: bool, state: Any
+    ) -> 'HangmanGame':
+        """Recreate a hangman game from a snapshot without picking a word."""
+        game = cls.__new__(cls)
+        TextGuessGame.__init__(game, user_id, multiguesser)
+        game.word, guesses = state
+        game.guesses = list(guesses)
+        return game
+
     def __str__(self) -> str:
         """Produce a string to describe the current state of the game."""
         mistake_count = len([
@@ -171,6 +187,9 @@ class HangmanGame(TextGuessGame):
         return status + '```'
 
 
+register_game_type(HangmanGame)
+
+
 @plugin.include
 @docstrings.parse_doc
 @command(name='hangman')
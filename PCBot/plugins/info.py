@@ -7,10 +7,9 @@ import requests
 import time
 from crescent.ext import docstrings
 from jwt import JWT, jwk_from_pem
-from pathlib import Path
-from PCBot.botdata import gh_pem_path
+from PCBot.botdata import BotData
 
-plugin = crescent.Plugin[hikari.GatewayBot, None]()
+plugin = crescent.Plugin[hikari.GatewayBot, BotData]()
 
 github_app_client_id = '865339'
 github_app_installation_id = '49024845'
@@ -30,12 +29,7 @@ github_api_headers = {
 
 # From https://docs.github.com/en/apps/creating-github-apps/authenticating-with-a-github-app/generating-a-json-web-token-jwt-for-a-github-app#example-using-python-to-generate-a-jwt # noqa
 def gh_generate_jwt() -> str:
-    pem_path = Path(gh_pem_path)
-    if not pem_path.is_file():
-        raise Exception('Required private pem secret is missing')
-    with open(pem_path, 'rb') as pem_file:
-        pem = pem_file.read()
-        signing_key = jwk_from_pem(pem)
+    signing_key = jwk_from_pem(plugin.model.settings.gh_private_pem)
     current_time = int(time.time())
     jwt_payload = {
         # Allow for clock drift by issuing 1 minute in the past
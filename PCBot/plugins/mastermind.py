@@ -13,9 +13,11 @@ from crescent.ext import docstrings
 from hikari import GatewayBot, Message, Snowflake
 from logging import getLogger, Logger
 from random import randrange
-from typing import Optional
+from typing import Any, Optional
+from PCBot.guessparsing import parse_number_guess, ParsedGuess
 from PCBot.plugins.replyhandler import (
-  GuessOutcome, remove_game, send_text_message, TextGuessGame
+  GuessOutcome, register_game_type, remove_game, send_text_message,
+  TextGuessGame
 )
 
 logger: Logger = getLogger(__name__)
@@ -50,10 +52,10 @@ class MastermindGame(TextGuessGame):
         if self.message is None:
                 return GuessOutcome.Invalid
 
-        processed_guess: str = guess.strip()
-
-        if not processed_guess.isdecimal():
+        parsed_guess: Optional[ParsedGuess] = parse_number_guess(guess)
+        if parsed_guess is None:
             return GuessOutcome.Invalid
+        processed_guess: str = parsed_guess.text
 
         if processed_guess in self.guesses:
             return GuessOutcome.AlreadyMade
@@ -61,6 +63,21 @@ class MastermindGame(TextGuessGame):
         self.guesses.append(processed_guess)
         return GuessOutcome.Valid
 
+    def get_state(self) -> Any:
+        """Produce the number and guesses for snapshots."""
+        return (self.number, self.guesses)
+
+    @classmethod
+    def from_state(
+      cls, user_id: Snowflake, multiguesser: bool, state: Any
+    ) -> 'MastermindGame':
+        """Recreate a mastermind game from a snapshot."""
+        game = cls.__new__(cls)
+        TextGuessGame.__init__(game, user_id, multiguesser)
+        game.number, guesses = state
+        game.guesses = list(guesses)
+        return game
+
     def _get_guess_info_mastermind(self, guess: str) -> str:
         guess_value = int(guess)
         if guess_value < 10 ** (digit_count - 1):
@@ -161,6 +178,9 @@ class MastermindGame(TextGuessGame):
         return status + '```'
 
 
+register_game_type(MastermindGame)
+
+
 @plugin.include
 @docstrings.parse_doc
 @command(name='mastermind')
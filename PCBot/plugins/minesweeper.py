@@ -15,23 +15,37 @@
 # TODO: Reset buttons on reply? See create_task usage in checkers
 # Also see todos later in the file
 
+from base64 import b64decode, b64encode
 from crescent import command, Context, option, Plugin
 from crescent.ext import docstrings
-from dataclasses import dataclass
 from enum import Enum
+from functools import cache
 from hikari import (
-  ButtonStyle, ChannelType, GatewayBot, Message, GuildThreadChannel, Snowflake,
-  TextableGuildChannel
+  ButtonStyle, ChannelType, GatewayBot, Message, MessageFlag,
+  GuildThreadChannel, RESTAware, Snowflake, TextableGuildChannel
 )
-from miru import ViewContext
+from miru import Modal, ModalContext, TextInput, ViewContext
 from miru.ext import menu
 from miru.internal.types import InteractiveButtonStylesT
-from random import randrange
-from re import Match, IGNORECASE, search
-from typing import Awaitable, Callable, Optional
+from random import randrange, Random
+from struct import iter_unpack, Struct
+from time import perf_counter_ns, time
+from typing import Any, Awaitable, Callable, Iterable, NamedTuple, Optional
 from PCBot.botdata import BotData
+from PCBot.guessparsing import (
+  column_indices, get_column_label, parse_minesweeper_guess, ParsedGuess
+)
+from PCBot.minesweeperleaderboard import (
+  MinesweeperLeaderboard, MinesweeperResult
+)
+from PCBot.minesweepersolver import (
+  bomb_cell_value, count_3bv, count_adjacent_bombs, get_adjacent_cells,
+  get_hint, is_solvable_without_guessing, SolverHint
+)
 from PCBot.plugins.replyhandler import (
-  add_game, get_interaction_channel, GuessOutcome, remove_game, TextGuessGame
+  add_game, drop_pending_edit, get_interaction_channel, GuessOutcome,
+  record_first_board, register_game_type, remove_game, start_game_thread,
+  TextGuessGame, touch_game
 )
 
 plugin = Plugin[GatewayBot, BotData]()
@@ -46,6 +60,48 @@ class MinesweeperGridCellState(Enum):
     REVEALED  = 3
 
 
+# Used for the byte arrays in MinesweeperGrid
+covered_state: int = MinesweeperGridCellState.COVERED.value
+flagged_state: int = MinesweeperGridCellState.FLAGGED.value
+revealed_state: int = MinesweeperGridCellState.REVEALED.value
+
+# Rendered cell, including the following space, for each packed cell value
+# of state << 4 | adjacent bomb count, see MinesweeperGrid.get_cells
+cell_strings: list[str] = [
+  '\N{LARGE GREEN SQUARE} ' if cell >> 4 == covered_state
+  else '🚩 ' if cell >> 4 == flagged_state
+  else cell_revealed_chars[cell & 0xF] + ' ' if cell & 0xF <= bomb_cell_value
+  else ''
+  for cell in range(revealed_state << 4 | bomb_cell_value + 1)
+]
+
+max_grid_size: int = 50
+# Larger grids only show part of the grid at a time, see MinesweeperGrid
+max_unpaged_grid_size: int = 13
+# Give up on making a grid that can be solved without guessing after this
+no_guess_attempts: int = 100
+# Stop trying to make no guess grids once this has been spent on them
+no_guess_time_limit_ns: int = 500_000_000
+viewport_size: int = 10
+# Move logs are a header followed by a little endian u16 of
+# cell index << 1 | is_flag for each move that changed the grid. The header
+# ends with which no guess attempt was kept so that replays never depend on
+# how long generating took, version 1 logs are missing it.
+move_log_header = Struct('<BBHBIHB')
+move_log_header_v1 = Struct('<BBHBIH')
+move_log_version: int = 2
+move_log_no_first_click: int = 0xFFFF
+# Longer replay codes are not shown since messages are limited to 2000 chars
+max_shown_replay_code_length: int = 400
+# Button labels to the direction they move the viewport, rows then columns
+viewport_moves: dict[str, tuple[int, int]] = {
+  '\N{LEFTWARDS BLACK ARROW}': (0, -1),
+  '\N{UPWARDS BLACK ARROW}': (-1, 0),
+  '\N{DOWNWARDS BLACK ARROW}': (1, 0),
+  '\N{BLACK RIGHTWARDS ARROW}': (0, 1)
+}
+
+
 class MinesweeperGameStatus(Enum):
     STARTED = 1
     LOST    = 2
@@ -58,6 +114,8 @@ class MinesweeperOption(Enum):
     FAILED_FLAG_BY_REVEALED   = 3
     FAILED_REVEAL_BY_FLAGGED  = 4
     FAILED_REVEAL_BY_REVEALED = 5
+    # Reveal every unflagged cell around a number once it has enough flags
+    CHORD                     = 6
 
 
 class MinesweeperScreenStage(Enum):
@@ -69,228 +127,424 @@ class MinesweeperScreenStage(Enum):
 class MinesweeperInputMethod(Enum):
     SCREEN = 1
     REPLY  = 2
+    MODAL  = 3
 
 
-@dataclass
-class MinesweeperGridCell:
-    revealed_char_idx: int = 0
-    state = MinesweeperGridCellState.COVERED
-
-    def is_bomb(self) -> bool:
-        return self.revealed_char_idx == 9
+class MinesweeperMoveLog(NamedTuple):
+    """Everything needed to replay a game, see move_log_header."""
+    size: int
+    bomb_count: int
+    no_guess: bool
+    seed: int
+    first_click: Optional[int]
+    moves: bytes
+    # None for version 1 logs, which search for a solvable grid again
+    mine_attempt: Optional[int] = None
+
+    def to_bytes(self) -> bytes:
+        return move_log_header.pack(
+          move_log_version, self.size, self.bomb_count, self.no_guess,
+          self.seed,
+          move_log_no_first_click if self.first_click is None
+            else self.first_click,
+          self.mine_attempt or 0
+        ) + self.moves
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional['MinesweeperMoveLog']:
+        """Read a move log, returning None if it is not valid."""
+        header: Struct = move_log_header
+        if len(data) > 0 and data[0] == 1:
+            header = move_log_header_v1
+        if len(data) < header.size or (len(data) - header.size) % 2:
+            return None
+        version, size, bomb_count, no_guess, seed, first_click, \
+          *optional = header.unpack_from(data)
+        cell_count: int = size * size
+        if (version not in (1, move_log_version)
+            or not 4 <= size <= max_grid_size
+            or bomb_count >= cell_count - 9):
+            return None
+        mine_attempt: Optional[int] = optional[0] if optional else None
+        if mine_attempt is not None and mine_attempt >= no_guess_attempts:
+            return None
+
+        moves: bytes = data[header.size:]
+        if any(move >> 1 >= cell_count for move, in iter_unpack('<H', moves)):
+            return None
+        if first_click == move_log_no_first_click:
+            return cls(
+              size, bomb_count, bool(no_guess), seed, None, moves, mine_attempt
+            )
+        if first_click >= cell_count:
+            return None
+        return cls(
+          size, bomb_count, bool(no_guess), seed, first_click, moves,
+          mine_attempt
+        )
 
-    def make_bomb(self) -> bool:
-        was_bomb: bool = self.revealed_char_idx == 9
-        self.revealed_char_idx = 9
-        return not was_bomb
 
-    def increment_adjacent_bomb_count(self) -> None:
-        if self.revealed_char_idx == 9:
-            pass
-        elif self.revealed_char_idx <= 7:
-            self.revealed_char_idx += 1
-        else:
-            raise Exception('Cannot increment adjacent bomb count past 8')
+@cache
+def get_grid_header(first_column: int, last_column: int, last_row: int) -> str:
+    """Create the line of column letters shown above a grid."""
+    # It took ages to find a way to align the grid on discord, the best
+    # method found uses a list for the row numbers and regional indicators
+    # for the letters. Then to align letters to the grid that line needs to
+    # start with the same indent as the list indices which were found by
+    # trial and error for single and double digits.
+    letter_indent: str
+    if last_row <= 9:
+        # Braille pattern space, thin space, six-per-em space
+        letter_indent = '⠀  '
+    elif last_row <= 99:
+        # Braille pattern space, figure space, thin space, six-per-em space
+        letter_indent = '⠀   '
+    else:
+        raise Exception(f'First line indent for {last_row} not known')
+
+    # Columns after Z only show their last letter, paged grids report
+    # the full range of columns shown separately
+    a_val: int = ord('🇦')
+    return (
+      f'\n{letter_indent}'
+      + ' '.join([
+        chr(a_val + i % 26) for i in range(first_column, last_column)
+      ])
+    )
 
 
 class MinesweeperGrid:
-    """Class to store information about the minesweeper grid."""
+    """Class to store information about the minesweeper grid.
+
+       Cells are stored row by row in flat byte arrays with separate counts
+       kept for each cell state so the game state can be checked directly.
+    """
     size: int
     bomb_count: int
 
-    grid: list[list[MinesweeperGridCell]]
+    # Adjacent bomb count for each cell, or bomb_cell_value for bombs
+    adjacent_bombs: bytearray
+    # MinesweeperGridCellState value for each cell
+    states: bytearray
+    bomb_cells: list[int]
+    # Bombs are placed using this seed and the first revealed cell
+    seed: int
+    first_click: Optional[int] = None
+    # Which of the grids made from the seed was kept, see _generate_mines
+    mine_attempt: int = 0
     generated_mines: bool = False
+    no_guess: bool = False
+    solvable_without_guessing: bool = False
+
+    flagged_count: int = 0
+    revealed_count: int = 0
+    revealed_bomb: bool = False
+
+    # Part of the grid that is shown, the whole grid unless it is too large
+    viewport_size: int
+    viewport_row: int = 0
+    viewport_column: int = 0
+
+    # Rendered rows of cells within the viewport's columns, None once changed
+    rendered_rows: list[Optional[str]]
+    rendered_grid: Optional[str] = None
 
-    def __init__(self, size: int, bomb_count: int):
+    def __init__(self, size: int, bomb_count: int, no_guess: bool = False):
         self.size = size
         self.bomb_count = bomb_count
+        self.no_guess = no_guess
+        self.seed = randrange(2 ** 32)
+        if size <= max_unpaged_grid_size:
+            self.viewport_size = size
+        else:
+            self.viewport_size = viewport_size
 
-        self.grid = [
-          [MinesweeperGridCell() for _ in range(self.size)]
-          for _ in range(self.size)
-        ]
+        self.adjacent_bombs = bytearray(size * size)
+        self.states = bytearray([covered_state]) * (size * size)
+        self.bomb_cells = []
+        self.rendered_rows = [None] * size
 
     def __str__(self) -> str:
-        """Convert a grid into a string."""
-        # It took ages to find a way to align the grid on discord, the best
-        # method found uses a list for the row numbers and regional indicators
-        # for the letters. Then to align letters to the grid that line needs to
-        # start with the same indent as the list indices which were found by
-        # trial and error for single and double digits.
-        letter_indent: str
-        if self.size <= 9:
-            # Braille pattern space, thin space, six-per-em space
-            letter_indent = '⠀  '
-        elif self.size <= 99:
-            # Braille pattern space, figure space, thin space, six-per-em space
-            letter_indent = '⠀   '
-        else:
-            raise Exception(f'First line indent for {self.size} not known')
+        """Convert the visible part of a grid into a string."""
+        if self.rendered_grid is not None:
+            return self.rendered_grid
+
+        last_row: int = self.viewport_row + self.viewport_size
+        last_column: int = self.viewport_column + self.viewport_size
+        grid_parts: list[str] = [
+          get_grid_header(self.viewport_column, last_column, last_row)
+        ]
 
-        a_val: int = ord('🇦')
-        grid_message: str = (
-          f'\n{letter_indent}'
-          + ' '.join([chr(a_val + i) for i in range(self.size)])
+        rendered_rows: list[Optional[str]] = self.rendered_rows
+        for row in range(self.viewport_row, last_row):
+            rendered_row: Optional[str] = rendered_rows[row]
+            if rendered_row is None:
+                start_idx: int = row * self.size
+                rendered_row = f'\n{row + 1}. ' + ''.join([
+                  cell_strings[state << 4 | adjacent_bombs]
+                  for state, adjacent_bombs in zip(
+                    self.states[start_idx + self.viewport_column:
+                                start_idx + last_column],
+                    self.adjacent_bombs[start_idx + self.viewport_column:
+                                        start_idx + last_column]
+                  )
+                ])
+                rendered_rows[row] = rendered_row
+            grid_parts.append(rendered_row)
+
+        self.rendered_grid = ''.join(grid_parts)
+        return self.rendered_grid
+
+    def _mark_cells_changed(self, cells: Iterable[int]) -> None:
+        for idx in cells:
+            self.rendered_rows[idx // self.size] = None
+        self.rendered_grid = None
+
+    def _mark_all_changed(self) -> None:
+        self.rendered_rows = [None] * self.size
+        self.rendered_grid = None
+
+    def is_paged(self) -> bool:
+        return self.viewport_size < self.size
+
+    def describe_viewport(self) -> str:
+        last_row: int = self.viewport_row + self.viewport_size
+        last_column: int = self.viewport_column + self.viewport_size
+        return (
+          f'Showing columns {get_column_label(self.viewport_column)} to '
+          f'{get_column_label(last_column - 1)} and rows '
+          f'{self.viewport_row + 1} to {last_row} of the '
+          f'{self.size}x{self.size} grid.'
         )
 
-        global cell_revealed_chars
-        for row in range(self.size):
-            grid_message += f'\n{row + 1}. '
-            for column in range(self.size):
-                grid_cell: MinesweeperGridCell = self.grid[row][column]
-                match grid_cell.state:
-                    case MinesweeperGridCellState.COVERED:
-                        grid_message += '\N{LARGE GREEN SQUARE}'
-                    case MinesweeperGridCellState.FLAGGED:
-                        grid_message += '🚩'
-                    case MinesweeperGridCellState.REVEALED:
-                        grid_message += (
-                          cell_revealed_chars[grid_cell.revealed_char_idx]
-                        )
-                grid_message += ' '
-
-        return grid_message
-
-    def get_cell_flagged_status(self, row: int, column: int) -> bool:
+    def set_viewport(self, row: int, column: int) -> None:
+        """Move the viewport's top left cell, keeping it within the grid."""
+        max_start: int = self.size - self.viewport_size
+        row = min(max(row, 0), max_start)
+        column = min(max(column, 0), max_start)
+        if column != self.viewport_column:
+            # Cached rows only contain the previously visible columns
+            self._mark_all_changed()
+        elif row != self.viewport_row:
+            self.rendered_grid = None
+        self.viewport_row = row
+        self.viewport_column = column
+
+    def move_viewport(self, row_pages: int, column_pages: int) -> None:
+        """Move the viewport by half its size."""
+        step: int = self.viewport_size // 2
+        self.set_viewport(self.viewport_row + row_pages * step,
+                          self.viewport_column + column_pages * step)
+
+    def show_cell(self, row: int, column: int) -> None:
+        """Center the viewport on a cell if it is not already visible."""
+        new_row: int = self.viewport_row
+        new_column: int = self.viewport_column
+        if not (self.viewport_row <= row
+                < self.viewport_row + self.viewport_size):
+            new_row = row - self.viewport_size // 2
+        if not (self.viewport_column <= column
+                < self.viewport_column + self.viewport_size):
+            new_column = column - self.viewport_size // 2
+        self.set_viewport(new_row, new_column)
+
+    def _get_cell_idx(self, row: int, column: int) -> int:
         if row >= self.size or column >= self.size:
             raise Exception(f'Cell ({row}, {column}) is out of range')
+        return row * self.size + column
 
-        grid_cell: MinesweeperGridCell = self.grid[row][column]
-        return grid_cell.state is MinesweeperGridCellState.FLAGGED
+    def get_cells(self) -> bytes:
+        """Pack each cell into a byte, adjacent bomb count then state."""
+        return bytes(
+          adjacent_bombs | state << 4
+          for adjacent_bombs, state in zip(self.adjacent_bombs, self.states)
+        )
 
-    def toggle_cell_flagged_status(self, row: int, column: int) -> None:
-        if row >= self.size or column >= self.size:
-            raise Exception(f'Cell ({row}, {column}) is out of range')
+    def set_cells(self, cells: bytes) -> None:
+        """Restore cells packed by get_cells and recount cell states."""
+        self.adjacent_bombs = bytearray(cell & 0xF for cell in cells)
+        self.states = bytearray(cell >> 4 for cell in cells)
+        self.bomb_cells = [
+          idx for idx, adjacent_bombs in enumerate(self.adjacent_bombs)
+          if adjacent_bombs == bomb_cell_value
+        ]
+        self.flagged_count = self.states.count(flagged_state)
+        self.revealed_count = self.states.count(revealed_state)
+        self.revealed_bomb = any(
+          self.states[idx] == revealed_state for idx in self.bomb_cells
+        )
+        self._mark_all_changed()
+
+    def get_cell_flagged_status(self, row: int, column: int) -> bool:
+        return self.states[self._get_cell_idx(row, column)] == flagged_state
 
-        grid_cell: MinesweeperGridCell = self.grid[row][column]
-        match grid_cell.state:
-            case MinesweeperGridCellState.COVERED:
-                grid_cell.state = MinesweeperGridCellState.FLAGGED
-            case MinesweeperGridCellState.FLAGGED:
-                grid_cell.state = MinesweeperGridCellState.COVERED
-            case MinesweeperGridCellState.REVEALED:
+    def toggle_cell_flagged_status(self, row: int, column: int) -> None:
+        idx: int = self._get_cell_idx(row, column)
+        match self.states[idx]:
+            case MinesweeperGridCellState.COVERED.value:
+                self.states[idx] = flagged_state
+                self.flagged_count += 1
+                self._mark_cells_changed((idx,))
+            case MinesweeperGridCellState.FLAGGED.value:
+                self.states[idx] = covered_state
+                self.flagged_count -= 1
+                self._mark_cells_changed((idx,))
+            case _:
                     # TODO: Report failure
                     pass
 
-    def _generate_mines(self, except_row: int, except_column: int) -> None:
-        """Randomly scatters bombs in the grid."""
-        for _ in range(self.bomb_count):
-            while True:
-                row: int = randrange(self.size)
-                column: int = randrange(self.size)
-
-                if (abs(row - except_row) <= 1
-                    and abs(column - except_column) <= 1):
-                        continue
-
-                if self.grid[row][column].make_bomb():
-                  break
-
-            north_exists: bool = row > 0
-            east_exists: bool = column < self.size - 1
-            south_exists: bool = row < self.size - 1
-            west_exists: bool = column > 0
-
-            if north_exists:
-                self.grid[row - 1][column].increment_adjacent_bomb_count()
-            if north_exists and east_exists:
-                self.grid[row - 1][column + 1].increment_adjacent_bomb_count()
-            if east_exists:
-                self.grid[row][column + 1].increment_adjacent_bomb_count()
-            if south_exists and east_exists:
-                self.grid[row + 1][column + 1].increment_adjacent_bomb_count()
-            if south_exists:
-                self.grid[row + 1][column].increment_adjacent_bomb_count()
-            if south_exists and west_exists:
-                self.grid[row + 1][column - 1].increment_adjacent_bomb_count()
-            if west_exists:
-                self.grid[row][column - 1].increment_adjacent_bomb_count()
-            if north_exists and west_exists:
-                self.grid[row - 1][column - 1].increment_adjacent_bomb_count()
+    def _generate_mines(
+      self, except_row: int, except_column: int,
+      mine_attempt: Optional[int] = None
+    ) -> None:
+        """Randomly scatters bombs in the grid away from the first reveal.
+
+           In no guess mode, grids are regenerated until one can be solved
+           with logic alone, giving up after no_guess_attempts or
+           no_guess_time_limit_ns. Replays pass the attempt that was kept
+           instead so they make the same grid without a time limit.
+        """
+        start_idx: int = except_row * self.size + except_column
+        self.first_click = start_idx
+        random = Random(self.seed)
+        excluded: set[int] = {start_idx}
+        excluded.update(get_adjacent_cells(self.size)[start_idx])
+        allowed_cells: list[int] = [
+          idx for idx in range(self.size * self.size) if idx not in excluded
+        ]
+
+        if mine_attempt is not None:
+            for _ in range(mine_attempt):
+                random.sample(allowed_cells, self.bomb_count)
+            self.mine_attempt = mine_attempt
+            self.bomb_cells = random.sample(allowed_cells, self.bomb_count)
+            self.adjacent_bombs = count_adjacent_bombs(
+              self.size, self.bomb_cells
+            )
+            self.solvable_without_guessing = self.no_guess and \
+              is_solvable_without_guessing(
+                self.size, self.adjacent_bombs, self.bomb_count, start_idx
+              )
+            self.generated_mines = True
+            return
+
+        deadline: int = perf_counter_ns() + no_guess_time_limit_ns
+        for attempt in range(no_guess_attempts if self.no_guess else 1):
+            self.mine_attempt = attempt
+            self.bomb_cells = random.sample(allowed_cells, self.bomb_count)
+            self.adjacent_bombs = count_adjacent_bombs(
+              self.size, self.bomb_cells
+            )
+            if not self.no_guess or is_solvable_without_guessing(
+              self.size, self.adjacent_bombs, self.bomb_count, start_idx
+            ):
+                self.solvable_without_guessing = self.no_guess
+                break
+            if perf_counter_ns() > deadline:
+                break
 
         self.generated_mines = True
 
     def get_cell_revealed_status(self, row: int, column: int) -> bool:
-        if row >= self.size or column >= self.size:
-            raise Exception(f'Cell ({row}, {column}) is out of range')
+        return self.states[self._get_cell_idx(row, column)] == revealed_state
 
-        grid_cell: MinesweeperGridCell = self.grid[row][column]
-        return grid_cell.state is MinesweeperGridCellState.REVEALED
+    def reveal_cell(self, row: int, column: int) -> list[int]:
+        """Reveal a cell and flood outwards from cells with no adjacent bombs.
 
-    def reveal_cell(self, row: int, column: int, flooding: bool=False) -> None:
-        if row >= self.size or column >= self.size:
-            raise Exception(f'Cell ({row}, {column}) is out of range')
-
-        grid_cell: MinesweeperGridCell = self.grid[row][column]
-        match grid_cell.state:
-            case MinesweeperGridCellState.FLAGGED:
+           Returns the index of every revealed cell, row * size + column.
+           Flagged cells are left covered by the flood.
+        """
+        idx: int = self._get_cell_idx(row, column)
+        match self.states[idx]:
+            case MinesweeperGridCellState.FLAGGED.value:
                 raise Exception(
                     f'Cell ({row}, {column}) is flagged so cannot be uncovered'
                 )
-            case MinesweeperGridCellState.REVEALED:
-                if flooding:
-                    return
+            case MinesweeperGridCellState.REVEALED.value:
                 raise Exception(f'Cell ({row}, {column}) is already revealed')
-            case MinesweeperGridCellState.COVERED:
+            case _:
                 # TODO: Report failure
                 pass
 
         if not self.generated_mines:
             self._generate_mines(row, column)
 
-        grid_cell.state = MinesweeperGridCellState.REVEALED
-
-        if grid_cell.revealed_char_idx == 0:
-            north_exists: bool = row > 0
-            east_exists: bool = column < self.size - 1
-            south_exists: bool = row < self.size - 1
-            west_exists: bool = column > 0
-
-            if north_exists:
-                self.reveal_cell(row - 1, column, True)
-            if north_exists and east_exists:
-                self.reveal_cell(row - 1, column + 1, True)
-            if east_exists:
-                self.reveal_cell(row, column + 1, True)
-            if south_exists and east_exists:
-                self.reveal_cell(row + 1, column + 1, True)
-            if south_exists:
-                self.reveal_cell(row + 1, column, True)
-            if south_exists and west_exists:
-                self.reveal_cell(row + 1, column - 1, True)
-            if west_exists:
-                self.reveal_cell(row, column - 1, True)
-            if north_exists and west_exists:
-                self.reveal_cell(row - 1, column - 1, True)
+        states: bytearray = self.states
+        adjacent_bombs: bytearray = self.adjacent_bombs
+        adjacent_cells: tuple[tuple[int, ...], ...] = \
+          get_adjacent_cells(self.size)
+
+        states[idx] = revealed_state
+        revealed: list[int] = [idx]
+        if adjacent_bombs[idx] == bomb_cell_value:
+            self.revealed_bomb = True
+        elif adjacent_bombs[idx] == 0:
+            # Breadth first, revealed doubles as the queue and states as the
+            # visited set since cells are marked revealed when queued
+            for flood_idx in revealed:
+                if adjacent_bombs[flood_idx] != 0:
+                    continue
+                for adjacent_idx in adjacent_cells[flood_idx]:
+                    if states[adjacent_idx] == covered_state:
+                        states[adjacent_idx] = revealed_state
+                        revealed.append(adjacent_idx)
+
+        self.revealed_count += len(revealed)
+        self._mark_cells_changed(revealed)
+        return revealed
+
+    def can_chord_cell(self, row: int, column: int) -> bool:
+        """Check if a revealed number has as many flags around it."""
+        idx: int = self._get_cell_idx(row, column)
+        if (self.states[idx] != revealed_state
+            or self.adjacent_bombs[idx] in (0, bomb_cell_value)):
+            return False
+        adjacent_flags: int = sum(
+          self.states[adjacent_idx] == flagged_state
+          for adjacent_idx in get_adjacent_cells(self.size)[idx]
+        )
+        return adjacent_flags == self.adjacent_bombs[idx]
+
+    def chord_cell(self, row: int, column: int) -> list[int]:
+        """Reveal every covered cell around a number, see can_chord_cell."""
+        revealed: list[int] = []
+        for adjacent_idx in \
+          get_adjacent_cells(self.size)[self._get_cell_idx(row, column)]:
+            # Earlier reveals may have flooded into later cells
+            if self.states[adjacent_idx] == covered_state:
+                adjacent_row, adjacent_column = divmod(adjacent_idx, self.size)
+                revealed.extend(self.reveal_cell(adjacent_row, adjacent_column))
+        return revealed
+
+    def get_hint(self) -> Optional[SolverHint]:
+        if not self.generated_mines:
+            # Nothing is placed near the first reveal
+            return SolverHint(self.size // 2 * self.size + self.size // 2, 0)
+        return get_hint(
+          self.size, self.adjacent_bombs,
+          [state == revealed_state for state in self.states],
+          [state == flagged_state for state in self.states], self.bomb_count
+        )
 
     def reveal_bombs(self) -> None:
-        for row in range(self.size):
-            for column in range(self.size):
-                grid_cell = self.grid[row][column]
-                if grid_cell.is_bomb():
-                    grid_cell.state = MinesweeperGridCellState.REVEALED
+        for idx in self.bomb_cells:
+            if self.states[idx] == flagged_state:
+                self.flagged_count -= 1
+            if self.states[idx] != revealed_state:
+                self.states[idx] = revealed_state
+                self.revealed_count += 1
+        self._mark_cells_changed(self.bomb_cells)
 
     def get_cell_bomb_status(self, row: int, column: int) -> bool:
-        if row >= self.size or column >= self.size:
-            raise Exception(f'Cell ({row}, {column}) is out of range')
+        return self.adjacent_bombs[self._get_cell_idx(row, column)] \
+          == bomb_cell_value
 
-        grid_cell: MinesweeperGridCell = self.grid[row][column]
-        return grid_cell.is_bomb()
+    def check_game_lost(self) -> bool:
+        return self.revealed_bomb
 
-    # TODO: track covered_squares to remove the need for the loop
     def check_game_won(self) -> bool:
-        covered_squares: int = 0
-
-        for row in range(self.size):
-            for column in range(self.size):
-                grid_cell: MinesweeperGridCell = self.grid[row][column]
-                if grid_cell.state is not MinesweeperGridCellState.REVEALED:
-                    covered_squares += 1
-
-                if covered_squares > self.bomb_count:
-                    return False
-
-        return covered_squares == self.bomb_count
+        return (not self.revealed_bomb and self.revealed_count
+                == self.size * self.size - self.bomb_count)
 
 
 class MinesweeperGame(TextGuessGame):
@@ -304,44 +558,130 @@ class MinesweeperGame(TextGuessGame):
     last_row: Optional[int] = None    # Number
     last_option: Optional[MinesweeperOption] = None
     last_input_method: Optional[MinesweeperInputMethod] = None
+    # Cleared by the next move
+    hint: Optional[SolverHint] = None
+    # Packed moves for the move log, None if restored from a snapshot that
+    # was made before moves were logged
+    moves: Optional[bytearray]
+    # Set while replaying a move log so old wins are not recorded again
+    replaying: bool = False
+
+    # Timed games start at the first reveal and only count for the
+    # leaderboard if no hints were used
+    timed: bool = False
+    started_at: Optional[float] = None
+    win_time_ms: Optional[int] = None
+    used_hint: bool = False
+    leaderboard_place: Optional[int] = None
 
     def __init__(
       self, user_id: Snowflake, multiguesser: bool, grid_size: int,
-      bomb_count: int
+      bomb_count: int, no_guess: bool = False, timed: bool = False
     ):
         super().__init__(user_id, multiguesser)
 
-        self.grid = MinesweeperGrid(grid_size, bomb_count)
+        self.grid = MinesweeperGrid(grid_size, bomb_count, no_guess)
+        self.moves = bytearray()
+        self.timed = timed
+
+    def _log_move(self, row: int, column: int, is_flag: bool) -> None:
+        if self.moves is not None:
+            packed: int = (row * self.grid.size + column) << 1 | is_flag
+            self.moves += packed.to_bytes(2, 'little')
+
+    def get_move_log(self) -> Optional[MinesweeperMoveLog]:
+        if self.moves is None:
+            return None
+        return MinesweeperMoveLog(
+          self.grid.size, self.grid.bomb_count, self.grid.no_guess,
+          self.grid.seed, self.grid.first_click, bytes(self.moves),
+          self.grid.mine_attempt
+        )
+
+    def get_replay_code(self) -> Optional[str]:
+        """Encode the move log to share in messages or the replay option."""
+        move_log: Optional[MinesweeperMoveLog] = self.get_move_log()
+        if move_log is None:
+            return None
+        return b64encode(move_log.to_bytes()).decode()
+
+    def load_move_log(self, move_log: MinesweeperMoveLog) -> None:
+        """Replay every move from a log into this new game."""
+        grid: MinesweeperGrid = self.grid
+        grid.seed = move_log.seed
+        self.replaying = True
+        if move_log.first_click is not None:
+            grid._generate_mines(  # pyright: ignore [reportPrivateUsage]
+              *divmod(move_log.first_click, grid.size), move_log.mine_attempt
+            )
+        for move, in iter_unpack('<H', move_log.moves):
+            if self.status is not MinesweeperGameStatus.STARTED:
+                break
+            row, column = divmod(move >> 1, grid.size)
+            self.make_move(
+              row, column,
+              MinesweeperOption.FLAG if move & 1 else MinesweeperOption.REVEAL,
+              MinesweeperInputMethod.REPLY
+            )
+        self.replaying = False
+        self.last_column = None
+        self.last_row = None
+        self.last_option = None
+        self.last_input_method = None
+
+    def undo_flag(self) -> bool:
+        """Undo the last move if it was a flag, returning if it was undone."""
+        if not self.moves or self.status is not MinesweeperGameStatus.STARTED:
+            return False
+        move: int = int.from_bytes(self.moves[-2:], 'little')
+        if not move & 1:
+            return False
+
+        del self.moves[-2:]
+        self.grid.toggle_cell_flagged_status(*divmod(move >> 1, self.grid.size))
+        self.last_column = None
+        self.last_row = None
+        self.last_option = None
+        self.last_input_method = None
+        self.hint = None
+        return True
 
     # TODO: Report already made moves
     def add_guess(self, user_id: Snowflake, guess: str) -> GuessOutcome:
         """(Un)Flags or Reveals the guessed cell and reports any issues."""
         if self.message is None:
             return GuessOutcome.Invalid
-
-        regex: str = r'^\s*(f?)\s*([a-x])\s*(\d{1,2})\s*$'
-        guess_matches: Optional[Match[str]] = search(regex, guess, IGNORECASE)
-        if not guess_matches:
+        return self.apply_guess(guess, MinesweeperInputMethod.REPLY)
+
+    def apply_guess(
+      self, guess: str, input_method: MinesweeperInputMethod
+    ) -> GuessOutcome:
+        """Make the move described by a guess like C7, fB2 or hint."""
+        parsed_guess: Optional[ParsedGuess] = parse_minesweeper_guess(guess)
+        if parsed_guess is None:
             return GuessOutcome.Invalid
-        guess_groups: tuple[str, ...] = guess_matches.groups()
+
+        if parsed_guess.text == 'hint':
+            self.give_hint()
+            return GuessOutcome.Valid
+        if parsed_guess.text == 'undo':
+            if not self.undo_flag():
+                return GuessOutcome.Invalid
+            return GuessOutcome.Valid
 
         option: MinesweeperOption
-        if guess_groups[0].lower() == 'f':
+        if parsed_guess.prefix == 'f':
             option = MinesweeperOption.FLAG
         else:
             option = MinesweeperOption.REVEAL
 
-        column: int = ord(guess_groups[1].upper()[0]) - ord('A')
-        if column >= self.grid.size:
+        row, column = parsed_guess.cells[0]
+        if row < 0 or row >= self.grid.size or column >= self.grid.size:
             return GuessOutcome.Invalid
 
-        row = int(guess_groups[2]) - 1
-        if row >= self.grid.size:
-            return GuessOutcome.Invalid
+        self.grid.show_cell(row, column)
 
-        self.make_move(
-          row, column, option, MinesweeperInputMethod.REPLY
-        )
+        self.make_move(row, column, option, input_method)
 
         return GuessOutcome.Valid
 
@@ -355,7 +695,11 @@ class MinesweeperGame(TextGuessGame):
             status += 'sending'
         else:
             status += 'replying with'
-        status += ' a message like C7 to reveal a square or fB2 to flag instead.\n'
+        status += ' a message like C7 to reveal a square or fB2 to flag instead,'
+        status += ' which can also be typed in after pressing Square.\n'
+        status += ('Revealing a number with that many flags around it '
+                   'reveals the rest of the squares around it, hint '
+                   'suggests a move and undo takes back the last flag.\n')
 
         # lines 3 and 4(both optional)
         if (self.last_column is not None and self.last_row is not None
@@ -375,11 +719,13 @@ class MinesweeperGame(TextGuessGame):
                         status += 'try to flag'
                     case MinesweeperOption.REVEAL:
                         status += 'reveal'
+                    case MinesweeperOption.CHORD:
+                        status += 'reveal around'
                     case (MinesweeperOption.FAILED_REVEAL_BY_FLAGGED
                           | MinesweeperOption.FAILED_REVEAL_BY_REVEALED):
                         status += 'try to reveal'
 
-                last_column_letter = chr(ord('A') + self.last_column)
+                last_column_letter = get_column_label(self.last_column)
                 status += f' cell {last_column_letter}{self.last_row + 1} via '
 
                 match self.last_input_method:
@@ -387,18 +733,69 @@ class MinesweeperGame(TextGuessGame):
                         status += 'the buttons'
                     case MinesweeperInputMethod.REPLY:
                         status += 'reply'
+                    case MinesweeperInputMethod.MODAL:
+                        status += 'the square button'
                 status += '.\n'
 
+        if self.hint is not None:
+            hint_row, hint_column = divmod(self.hint.cell, self.grid.size)
+            hint_cell: str = f'{get_column_label(hint_column)}{hint_row + 1}'
+            if self.hint.bomb_probability == 0:
+                status += f'\nHint: {hint_cell} is safe to reveal.\n'
+            elif self.hint.bomb_probability == 1:
+                status += f'\nHint: {hint_cell} must be a bomb.\n'
+            else:
+                status += (
+                  '\nHint: No square is certain, the safest guess is '
+                  f'{hint_cell} with a {self.hint.bomb_probability:.0%} chance '
+                  'of being a bomb.\n'
+                )
+
+        if (self.grid.no_guess and self.grid.generated_mines
+            and not self.grid.solvable_without_guessing):
+            status += ('\nA grid that can be solved without guessing could '
+                       'not be made so guessing may be needed.\n')
+        elif self.grid.no_guess:
+            status += '\nThis grid can be solved without guessing.\n'
+
+        if self.timed and self.status is MinesweeperGameStatus.STARTED:
+            status += ('\nThis game is timed from the first reveal, using a '
+                       'hint keeps it off the leaderboard.\n')
+
+        if self.grid.is_paged():
+            status += '\n' + self.grid.describe_viewport()
         status += str(self.grid)
 
         match self.status:
             case MinesweeperGameStatus.LOST:
                 status += '\n\nYou have lost the game.'
             case MinesweeperGameStatus.WON:
-                status += '\n\nYou have won the game!'
+                status += '\n\nYou have won the game'
+                if self.win_time_ms is None:
+                    status += '!'
+                else:
+                    bbbv: int = count_3bv(
+                      self.grid.size, self.grid.adjacent_bombs
+                    )
+                    status += (
+                      f' in {self.win_time_ms / 1000:.3f} seconds with a 3BV '
+                      f'of {bbbv}, {bbbv * 1000 / self.win_time_ms:.2f} 3BV/s!'
+                    )
+                    if self.leaderboard_place is not None:
+                        status += (
+                          f' That is number {self.leaderboard_place} on the '
+                          f'{self.grid.size}x{self.grid.size} leaderboard for '
+                          f'{self.grid.bomb_count} bombs.'
+                        )
             case MinesweeperGameStatus.STARTED:
                 pass
 
+        if self.status is not MinesweeperGameStatus.STARTED:
+            replay_code: Optional[str] = self.get_replay_code()
+            if (replay_code is not None
+                and len(replay_code) <= max_shown_replay_code_length):
+                status += f'\nReplay code: `{replay_code}`'
+
         if (self.message is not None
               and self.status is not MinesweeperGameStatus.STARTED):
             remove_game(self.message.id)
@@ -408,6 +805,83 @@ class MinesweeperGame(TextGuessGame):
         # but not if they contain markup like italics
         return status + '\n_ _'
 
+    def get_state(self) -> Any:
+        move_log: Optional[MinesweeperMoveLog] = self.get_move_log()
+        return (
+          self.grid.size, self.grid.bomb_count, self.grid.generated_mines,
+          # Cells are only needed if there is no move log to replay
+          b'' if move_log is not None else self.grid.get_cells(),
+          self.status.value, self.last_column,
+          self.last_row,
+          None if self.last_option is None else self.last_option.value,
+          None if self.last_input_method is None
+            else self.last_input_method.value,
+          self.grid.viewport_row, self.grid.viewport_column,
+          self.grid.no_guess, self.grid.solvable_without_guessing,
+          None if move_log is None else move_log.to_bytes(), self.timed,
+          self.started_at, self.win_time_ms, self.used_hint,
+          self.leaderboard_place
+        )
+
+    @classmethod
+    def from_state(
+      cls, user_id: Snowflake, multiguesser: bool, state: Any
+    ) -> 'MinesweeperGame':
+        (size, bomb_count, generated_mines, cells, status, last_column,
+         last_row, last_option, last_input_method, *optional) = state
+
+        # Snapshots from older versions are missing later fields
+        no_guess: bool = len(optional) > 2 and optional[2]
+        screen = MinesweeperScreen(
+          menu.Menu(), user_id, multiguesser, size, bomb_count, no_guess
+        )
+        game: MinesweeperGame = screen.game
+        game_screens[game] = screen
+
+        move_log: Optional[MinesweeperMoveLog] = None
+        if len(optional) > 4 and optional[4] is not None:
+            move_log = MinesweeperMoveLog.from_bytes(optional[4])
+        if move_log is not None:
+            game.load_move_log(move_log)
+        else:
+            game.moves = None
+            game.grid.generated_mines = generated_mines
+            game.grid.set_cells(cells)
+            if len(optional) > 3:
+                game.grid.solvable_without_guessing = optional[3]
+        if optional:
+            game.grid.set_viewport(optional[0], optional[1])
+        if len(optional) > 5:
+            (game.timed, game.started_at, game.win_time_ms, game.used_hint,
+             game.leaderboard_place) = optional[5:10]
+
+        game.status = MinesweeperGameStatus(status)
+        game.last_column = last_column
+        game.last_row = last_row
+        if last_option is not None:
+            game.last_option = MinesweeperOption(last_option)
+        if last_input_method is not None:
+            game.last_input_method = MinesweeperInputMethod(last_input_method)
+        return game
+
+    async def restore_message(
+      self, app: RESTAware, channel_id: Snowflake, message_id: Snowflake
+    ) -> None:
+        screen: MinesweeperScreen = game_screens[self]
+        screen_builder = await screen.menu.build_response_async(
+          plugin.model.miru, screen
+        )
+        self.message = await app.rest.edit_message(
+          channel_id, message_id, screen_builder.content,
+          components=screen_builder.components
+        )
+        plugin.model.miru.start_view(screen.menu, bind_to=self.message)
+
+    def on_expired(self) -> None:
+        screen = game_screens.pop(self, None)
+        if screen is not None:
+            screen.menu.stop()
+
     def make_move(
       self, row: int, column: int, option: MinesweeperOption,
       input_method: MinesweeperInputMethod
@@ -419,6 +893,7 @@ class MinesweeperGame(TextGuessGame):
         self.last_row = row
         self.last_option = option
         self.last_input_method = input_method
+        self.hint = None
 
         match option:
             case MinesweeperOption.FLAG:
@@ -426,21 +901,30 @@ class MinesweeperGame(TextGuessGame):
                     self.last_option = MinesweeperOption.FAILED_FLAG_BY_REVEALED
                     return
                 self.grid.toggle_cell_flagged_status(row, column)
-            case MinesweeperOption.REVEAL:
+                self._log_move(row, column, True)
+            case MinesweeperOption.REVEAL | MinesweeperOption.CHORD:
                 if self.grid.get_cell_flagged_status(row, column):
                     self.last_option = MinesweeperOption.FAILED_REVEAL_BY_FLAGGED
                     return
-                if self.grid.get_cell_revealed_status(row, column):
+                if self.grid.can_chord_cell(row, column):
+                    self.last_option = MinesweeperOption.CHORD
+                    self.grid.chord_cell(row, column)
+                elif self.grid.get_cell_revealed_status(row, column):
                     self.last_option = MinesweeperOption.FAILED_REVEAL_BY_REVEALED
                     return
-
-                self.grid.reveal_cell(row, column)
-
-                if self.grid.get_cell_bomb_status(row, column):
+                else:
+                    self.last_option = MinesweeperOption.REVEAL
+                    if self.timed and self.started_at is None:
+                        self.started_at = time()
+                    self.grid.reveal_cell(row, column)
+                self._log_move(row, column, False)
+
+                if self.grid.check_game_lost():
                     self.status = MinesweeperGameStatus.LOST
                     self.grid.reveal_bombs()
                 elif self.grid.check_game_won():
                     self.status = MinesweeperGameStatus.WON
+                    self._record_win()
             case MinesweeperOption.FAILED_FLAG_BY_REVEALED:
                 # TODO: Report failure
                 pass
@@ -452,6 +936,30 @@ class MinesweeperGame(TextGuessGame):
                 pass
 
 
+    def _record_win(self) -> None:
+        """Time a won timed game and add it to the leaderboard."""
+        if not self.timed or self.started_at is None:
+            return
+        # At least 1ms so speeds can be worked out
+        self.win_time_ms = max(round((time() - self.started_at) * 1000), 1)
+        if self.replaying or self.used_hint:
+            return
+        bbbv: int = count_3bv(self.grid.size, self.grid.adjacent_bombs)
+        self.leaderboard_place = leaderboard.add(MinesweeperResult(
+          self.win_time_ms, int(time()), self.user_id, self.grid.size,
+          self.grid.bomb_count, bbbv
+        ))
+
+    def give_hint(self) -> None:
+        """Suggest the next move and make sure it is visible."""
+        if self.status is not MinesweeperGameStatus.STARTED:
+            return
+        self.used_hint = True
+        self.hint = self.grid.get_hint()
+        if self.hint is not None:
+            self.grid.show_cell(*divmod(self.hint.cell, self.grid.size))
+
+
 def create_button(
   label: str,
   callback: Callable[
@@ -466,6 +974,22 @@ def create_button(
     return button
 
 
+class MinesweeperMoveModal(Modal, title='Minesweeper'):
+    """Modal to make a move in one step by typing the square."""
+    square = TextInput(
+      label='Square', placeholder='C7 to reveal, fB2 to flag or hint',
+      required=True, min_length=2, max_length=5
+    )
+    screen: 'MinesweeperScreen'
+
+    def __init__(self, screen: 'MinesweeperScreen'):
+        super().__init__()
+        self.screen = screen
+
+    async def callback(self, ctx: ModalContext) -> None:
+        await self.screen.square_entered(ctx, ctx.values[self.square])
+
+
 class MinesweeperScreen(menu.Screen):
     created_initial_buttons = False
     column: Optional[int] = None
@@ -474,13 +998,43 @@ class MinesweeperScreen(menu.Screen):
     option: Optional[MinesweeperOption] = None
     game: MinesweeperGame
 
+    # Buttons are created once per screen since the grid size never changes,
+    # input buttons are keyed by stage and first row or column shown
+    option_buttons: list[menu.ScreenButton]
+    move_buttons: list[menu.ScreenButton]
+    input_buttons: dict[
+      tuple[MinesweeperScreenStage, int], list[menu.ScreenButton]
+    ]
+    back_button: menu.ScreenButton
+
     def __init__(
       self, menu: menu.Menu, user_id: Snowflake, multiguesser: bool,
-      grid_size: int, bomb_count: int
+      grid_size: int, bomb_count: int, no_guess: bool = False,
+      timed: bool = False
     ):
         super().__init__(menu)
         self.game = MinesweeperGame(
-          user_id, multiguesser, grid_size, bomb_count
+          user_id, multiguesser, grid_size, bomb_count, no_guess, timed
+        )
+
+        self.option_buttons = [
+          create_button('(Un)flag', self.flag_pressed),  # pyright: ignore [reportArgumentType]
+          create_button('Reveal', self.reveal_pressed),  # pyright: ignore [reportArgumentType]
+          create_button('Square', self.square_pressed),  # pyright: ignore [reportArgumentType]
+          create_button('Hint', self.hint_pressed, style=ButtonStyle.SUCCESS),  # pyright: ignore [reportArgumentType]
+          create_button('Undo flag', self.undo_pressed,  # pyright: ignore [reportArgumentType]
+                        style=ButtonStyle.SECONDARY)
+        ]
+        self.move_buttons = []
+        if self.game.grid.is_paged():
+            self.move_buttons = [
+              create_button(label, self.move_pressed,  # pyright: ignore [reportArgumentType]
+                            style=ButtonStyle.SECONDARY)
+              for label in viewport_moves
+            ]
+        self.input_buttons = {}
+        self.back_button = create_button(
+          'Back', self.back_pressed, style=ButtonStyle.DANGER  # pyright: ignore [reportArgumentType]
         )
 
     async def build_content(self) -> menu.ScreenContent:
@@ -490,7 +1044,9 @@ class MinesweeperScreen(menu.Screen):
 
         return menu.ScreenContent(content=str(self.game))
 
-    async def reload(self) -> None:
+    async def reload(self, modal_ctx: Optional[ModalContext] = None) -> None:
+        """Show the latest board, modal_ctx is required if the last button
+           pressed opened a modal since that interaction has no message."""
         if self.menu.message is None:
             return
 
@@ -500,43 +1056,77 @@ class MinesweeperScreen(menu.Screen):
             for child in self.menu.children:
                 child.disabled = True
 
-        await self.menu.update_message(await self.build_content())
+        content: menu.ScreenContent = await self.build_content()
+        touch_game(self.game)
+        # This sends the latest board so any edit queued by a reply is stale
+        drop_pending_edit(self.menu.message.id)
+        if modal_ctx is None:
+            await self.menu.update_message(content)
+        else:
+            await modal_ctx.edit_response(content.content, components=self.menu)
 
         if game_over:
             remove_game(self.menu.message.id)
             remove_game(self.menu.message.channel_id)
+            game_screens.pop(self.game, None)
             self.menu.stop()
 
-    async def show_option_buttons(self) -> None:
+    def _set_buttons(self, buttons: Iterable[menu.ScreenButton]) -> None:
         self.menu.clear_items()
-        self.menu.add_item(create_button('(Un)flag', self.flag_pressed))  # pyright: ignore [reportArgumentType]
-        self.menu.add_item(create_button('Reveal', self.reveal_pressed))  # pyright: ignore [reportArgumentType]
-        await self.reload()
+        for button in buttons:
+            self.menu.add_item(button)
 
-    async def show_input_buttons(self) -> None:
-        disable: bool = self.game.status is not MinesweeperGameStatus.STARTED
-        self.menu.clear_items()
-
-        for i in range(self.game.grid.size):
-            label: str
-            match self.state:
-                case MinesweeperScreenStage.LETTER:
-                    label = chr(ord('A') + i)
-                case MinesweeperScreenStage.NUMBER:
-                    label = str(i + 1)
-                case MinesweeperScreenStage.OPTION:
-                    raise Exception(
-                      f'Invalid state {self.state} found while updating' +
-                      'buttons'
-                    )
-            self.menu.add_item(
-              create_button(f'{label}', self.input_pressed, disabled=disable)  # pyright: ignore [reportArgumentType]
-            )
+    async def show_option_buttons(
+      self, modal_ctx: Optional[ModalContext] = None
+    ) -> None:
+        grid: MinesweeperGrid = self.game.grid
+        if grid.is_paged():
+            max_start: int = grid.size - grid.viewport_size
+            at_edge: list[bool] = [
+              grid.viewport_column == 0, grid.viewport_row == 0,
+              grid.viewport_row == max_start,
+              grid.viewport_column == max_start
+            ]
+            for button, disabled in zip(self.move_buttons, at_edge):
+                button.disabled = disabled
+
+        self._set_buttons(self.option_buttons + self.move_buttons)
+        await self.reload(modal_ctx)
+
+    def _get_input_buttons(self) -> list[menu.ScreenButton]:
+        """Get the buttons for the current stage, creating them if needed."""
+        # Only cells within the viewport can be picked using buttons
+        grid: MinesweeperGrid = self.game.grid
+        first: int
+        match self.state:
+            case MinesweeperScreenStage.LETTER:
+                first = grid.viewport_column
+            case MinesweeperScreenStage.NUMBER:
+                first = grid.viewport_row
+            case MinesweeperScreenStage.OPTION:
+                raise Exception(
+                  f'Invalid state {self.state} found while updating' +
+                  'buttons'
+                )
 
-        self.menu.add_item(create_button(
-          'Back', self.back_pressed, style=ButtonStyle.DANGER, disabled=disable  # pyright: ignore [reportArgumentType]
-        ))
+        buttons: Optional[list[menu.ScreenButton]] = \
+          self.input_buttons.get((self.state, first))
+        if buttons is None:
+            labels: list[str]
+            if self.state is MinesweeperScreenStage.LETTER:
+                labels = [
+                  get_column_label(first + i) for i in range(grid.viewport_size)
+                ]
+            else:
+                labels = [str(first + i + 1) for i in range(grid.viewport_size)]
+            buttons = [
+              create_button(label, self.input_pressed) for label in labels  # pyright: ignore [reportArgumentType]
+            ]
+            self.input_buttons[(self.state, first)] = buttons
+        return buttons
 
+    async def show_input_buttons(self) -> None:
+        self._set_buttons(self._get_input_buttons() + [self.back_button])
         await self.reload()
 
     async def flag_pressed(
@@ -553,6 +1143,61 @@ class MinesweeperScreen(menu.Screen):
         self.option = MinesweeperOption.REVEAL
         await self.show_input_buttons()
 
+    async def square_pressed(
+      self, ctx: ViewContext, button: menu.ScreenButton
+    ) -> None:
+        await ctx.respond_with_modal(MinesweeperMoveModal(self))
+
+    async def square_entered(self, ctx: ModalContext, square: str) -> None:
+        """Make the move typed into MinesweeperMoveModal with one edit."""
+        if self.game.status is not MinesweeperGameStatus.STARTED:
+            await ctx.respond(
+              f'{square} could not be played, the game has finished.',
+              flags=MessageFlag.EPHEMERAL
+            )
+            return
+        outcome: GuessOutcome = self.game.apply_guess(
+          square, MinesweeperInputMethod.MODAL
+        )
+        if outcome is GuessOutcome.Invalid:
+            await ctx.respond(
+              f'{square} could not be played, try something like C7, fB2, '
+              'hint or undo.', flags=MessageFlag.EPHEMERAL
+            )
+            return
+
+        self.state = MinesweeperScreenStage.OPTION
+        self.option = None
+        self.column = None
+        await self.show_option_buttons(ctx)
+
+    async def hint_pressed(
+      self, ctx: ViewContext, button: menu.ScreenButton
+    ) -> None:
+        self.game.give_hint()
+        await self.show_option_buttons()
+
+    async def undo_pressed(
+      self, ctx: ViewContext, button: menu.ScreenButton
+    ) -> None:
+        if not self.game.undo_flag():
+            await ctx.respond(
+              'Only a flag can be undone, and only if it was the last move.',
+              flags=MessageFlag.EPHEMERAL
+            )
+            return
+        await self.show_option_buttons()
+
+    async def move_pressed(
+      self, ctx: ViewContext, button: menu.ScreenButton
+    ) -> None:
+        if button.label is None:
+            return
+
+        row_pages, column_pages = viewport_moves[button.label]
+        self.game.grid.move_viewport(row_pages, column_pages)
+        await self.show_option_buttons()
+
     async def back_pressed(
       self, ctx: ViewContext, button: menu.ScreenButton
     ) -> None:
@@ -578,7 +1223,7 @@ class MinesweeperScreen(menu.Screen):
         match self.state:
             case MinesweeperScreenStage.LETTER:
                 self.state = MinesweeperScreenStage.NUMBER
-                self.column = ord(button.label[0]) - ord('A')
+                self.column = column_indices[button.label]
                 await self.show_input_buttons()
             case MinesweeperScreenStage.NUMBER:
                 if self.option is None or self.column is None:
@@ -599,6 +1244,9 @@ class MinesweeperScreen(menu.Screen):
                 )
 
 game_screens: dict[MinesweeperGame, MinesweeperScreen] = {}
+register_game_type(MinesweeperGame)
+# Kept when reloading, see the end of the file
+leaderboard: MinesweeperLeaderboard
 
 @plugin.include
 @docstrings.parse_doc
@@ -612,32 +1260,40 @@ class MinesweeperCommand:
     """
 
     grid_size = option(
-      int, 'Size of minesweeper grid', min_value=4, default=9, max_value=13
+      int, 'Size of minesweeper grid, larger than 13 is shown in parts',
+      min_value=4, default=9, max_value=max_grid_size
     )
     bomb_count = option(
       int, 'Number of bombs in the grid', min_value=1, default=5,
-      max_value=80
+      max_value=2000
     )
 
+    no_guess = option(
+      bool, 'Make a grid that can be solved without guessing', default=False
+    )
+    timed = option(
+      bool, 'Time the game and add wins without hints to the leaderboard',
+      default=False
+    )
     multiguesser = option(bool, 'Allow anyone to guess', default=False)
     thread = option(bool, 'Automatically create a thread', default=False)
+    replay = option(
+      str, 'Replay code from the end of a game to show it again, other '
+      'options are ignored', default=None
+    )
 
     async def callback(self, ctx: Context) -> None:
         """Handle minesweeper command being run by showing grid and buttons."""
-        # Avoid infinite loop from trying to place bombs in starting cell or any nearby ones
-        max_bomb_count: int = self.grid_size * self.grid_size - 9
-        if self.bomb_count >= max_bomb_count:
-            await ctx.respond(
-              f'Max bomb count for a {self.grid_size}x{self.grid_size} grid is'
-              + f' {max_bomb_count}.', ephemeral=True
-            )
-            return
+        start_ns: int = perf_counter_ns()
 
         minesweeper_menu = menu.Menu()
-        screen = MinesweeperScreen(
-          minesweeper_menu, ctx.user.id, self.multiguesser, self.grid_size,
-          self.bomb_count
-        )
+        screen: Optional[MinesweeperScreen]
+        if self.replay is not None:
+            screen = await self.create_replay_screen(ctx, minesweeper_menu)
+        else:
+            screen = await self.create_screen(ctx, minesweeper_menu)
+        if screen is None:
+            return
 
         in_correct_thread: bool
         channel: Optional[TextableGuildChannel]
@@ -656,13 +1312,8 @@ class MinesweeperCommand:
 
         # TODO: Report want_thread being ignored if in wrong thread?
         if not in_thread and self.thread:
-            # TODO: Avoid this message
-            await ctx.respond(
-              'Starting minesweeper game in thread!', ephemeral=True
-            )
-
-            thread: GuildThreadChannel = await ctx.app.rest.create_thread(
-              ctx.channel_id, ChannelType.GUILD_PUBLIC_THREAD, 'Minesweeper'
+            thread: GuildThreadChannel = await start_game_thread(
+              ctx, 'Minesweeper'
             )
             screen.game.message = await screen_builder.send_to_channel(thread)
 
@@ -676,8 +1327,108 @@ class MinesweeperCommand:
             )
             assert screen.game.message is not None
 
+        record_first_board('Minesweeper', start_ns)
         add_game(screen.game.message.id, screen.game)
 
         plugin.model.miru.start_view(
           minesweeper_menu, bind_to=screen.game.message
         )
+
+    async def create_screen(
+      self, ctx: Context, minesweeper_menu: menu.Menu
+    ) -> Optional[MinesweeperScreen]:
+        """Start a new game, reporting options that cannot be used."""
+        # Bombs are not placed in the starting cell or any nearby ones
+        max_bomb_count: int = self.grid_size * self.grid_size - 9
+        if self.bomb_count >= max_bomb_count:
+            await ctx.respond(
+              f'Max bomb count for a {self.grid_size}x{self.grid_size} grid is'
+              + f' {max_bomb_count}.', ephemeral=True
+            )
+            return None
+
+        return MinesweeperScreen(
+          minesweeper_menu, ctx.user.id, self.multiguesser, self.grid_size,
+          self.bomb_count, self.no_guess, self.timed
+        )
+
+    async def create_replay_screen(
+      self, ctx: Context, minesweeper_menu: menu.Menu
+    ) -> Optional[MinesweeperScreen]:
+        """Replay a shared game, showing it directly if it has finished."""
+        assert self.replay is not None
+        move_log: Optional[MinesweeperMoveLog] = None
+        try:
+            move_log = MinesweeperMoveLog.from_bytes(
+              b64decode(self.replay, validate=True)
+            )
+        except ValueError:
+            pass
+        if move_log is None:
+            await ctx.respond(
+              f'{self.replay} is not a valid replay code.', ephemeral=True
+            )
+            return None
+
+        screen = MinesweeperScreen(
+          minesweeper_menu, ctx.user.id, self.multiguesser, move_log.size,
+          move_log.bomb_count, move_log.no_guess
+        )
+        screen.game.load_move_log(move_log)
+        if screen.game.status is not MinesweeperGameStatus.STARTED:
+            await ctx.respond(str(screen.game))
+            return None
+        return screen
+
+
+@plugin.include
+@docstrings.parse_doc
+@command(name='minesweeperleaderboard')
+class MinesweeperLeaderboardCommand:
+    """
+    Show the fastest timed minesweeper wins for a grid.
+
+    Requested by Cam(camtas).
+    Implemented by Joshua(somethingsensible).
+    """
+
+    grid_size = option(
+      int, 'Size of minesweeper grid', min_value=4, default=9,
+      max_value=max_grid_size
+    )
+    bomb_count = option(
+      int, 'Number of bombs in the grid', min_value=1, default=5,
+      max_value=2000
+    )
+
+    async def callback(self, ctx: Context) -> None:
+        """Handle leaderboard command being run by showing the ranking."""
+        ranking: list[MinesweeperResult] = leaderboard.get_ranking(
+          self.grid_size, self.bomb_count
+        )
+        title: str = (
+          f'Fastest {self.grid_size}x{self.grid_size} minesweeper wins with '
+          f'{self.bomb_count} bombs'
+        )
+        if not ranking:
+            await ctx.respond(
+              f'{title}:\nNo timed games have been won yet, start one with '
+              '/minesweeper timed: True.'
+            )
+            return
+
+        lines: list[str] = [f'{title}:']
+        for place, result in enumerate(ranking, 1):
+            lines.append(
+              f'{place}. <@{result.user_id}> {result.time_ms / 1000:.3f}s, '
+              f'3BV {result.bbbv} ({result.bbbv * 1000 / result.time_ms:.2f}'
+              f'/s) <t:{result.finished_at}:d>'
+            )
+        await ctx.respond('\n'.join(lines), user_mentions=False)
+
+
+# Only read the results the first time this module is imported so that
+# reloading it keeps the open store
+if 'leaderboard' not in globals():
+    leaderboard = MinesweeperLeaderboard()
+    leaderboard.load()
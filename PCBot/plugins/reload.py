@@ -5,7 +5,8 @@ import hikari
 import logging
 from crescent.ext import docstrings
 from PCBot.pluginmanager import (
-    get_plugin_names, reload_handlers, reload_plugin_manager, reload_plugins
+    get_changed_plugins, get_plugin_names, register_commands, reload_handlers,
+    reload_plugin_manager, reload_plugins, restore_handlers
 )
 from typing import Optional
 
@@ -39,6 +40,8 @@ class ReloadCommand:
                                    default=False)
     reregister = crescent.option(bool, 'Reregister commands with discord.',
                                  default=True)
+    full = crescent.option(bool, 'Reload every plugin, not just changed ones.',
+                           default=False)
 
     async def callback(self, ctx: crescent.Context) -> None:
         """Handle reload command being run."""
@@ -66,6 +69,7 @@ class ReloadCommand:
         safe_mode: bool
         malformed_plugin_path: Optional[str] = None
         reloaded_text: str
+        changed_plugins: Optional[set[str]] = None
 
         await ctx.respond('Reloading...', ephemeral=True)
 
@@ -74,8 +78,12 @@ class ReloadCommand:
 
         try:
             reload_plugin_manager()
-            reload_handlers(plugins)
-            await reload_plugins(plugins, plugin_folder)
+            if not self.full:
+                changed_plugins = get_changed_plugins(plugin_folder)
+            reload_handlers(plugins, changed_plugins)
+            await reload_plugins(plugins, plugin_folder,
+                                 plugin_paths=changed_plugins)
+            restore_handlers(plugins, plugin.app, changed_plugins)
             safe_mode = False
         except:
             logger.exception('An error occurred while reloading plugins:')
@@ -98,6 +106,14 @@ class ReloadCommand:
             reloaded_text = 'Reloaded in safe mode'
             logger.warning(reloaded_text)
             await ctx.edit(reloaded_text)
+        elif changed_plugins is not None and not changed_plugins:
+            reloaded_text = 'No plugins changed'
+            logger.info(reloaded_text)
+            await ctx.edit(reloaded_text)
+        elif changed_plugins is not None:
+            reloaded_text = f'Reloaded {len(changed_plugins)} changed plugins'
+            logger.info(f'{reloaded_text}: {", ".join(sorted(changed_plugins))}')
+            await ctx.edit(reloaded_text)
         else:
             reloaded_text = 'Reloaded'
             logger.info(reloaded_text)
@@ -116,11 +132,15 @@ class ReloadCommand:
         if self.list_plugins:
             await ctx.respond(f'Loaded plugins: {loaded_list}')
 
-        # Reregister commands with discord
+        # Reregister commands with discord, only if they changed unless this
+        # is a full reload or the commands may be in an unknown state
         if self.reregister:
             await ctx.edit(reloaded_text + ', reregistering')
 
-            await plugin.client.commands.register_commands()
-
-            logger.info('Reregistered commands')
-            await ctx.edit(reloaded_text + ', reregistered')
+            if await register_commands(plugin.client,
+                                       force=self.full or safe_mode):
+                logger.info('Reregistered commands')
+                await ctx.edit(reloaded_text + ', reregistered')
+            else:
+                logger.info('Commands unchanged, skipped reregistering')
+                await ctx.edit(reloaded_text + ', commands unchanged')
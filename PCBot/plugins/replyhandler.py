@@ -3,18 +3,46 @@
 
 from abc import ABC, abstractmethod
 from abcattrs import Abstract, abstractattrs
+from asyncio import gather, sleep
+from collections import Counter, OrderedDict
 from crescent import Context, event, Plugin
+from crescent.ext import tasks
+from crescent.utils import create_task
+from dataclasses import dataclass, field
 from enum import Enum
 from hikari import (
-  ChannelType, CacheAware, GatewayBot, GuildThreadChannel, Message,
-  MessageCreateEvent, MessageFlag, PartialChannel, PartialMessage, Snowflake,
-  TextableGuildChannel
+  ChannelType, CacheAware, GatewayBot, GuildChannelDeleteEvent,
+  GuildChannelUpdateEvent, GuildThreadChannel, GuildThreadDeleteEvent,
+  GuildThreadUpdateEvent, Message, MessageCreateEvent, MessageFlag,
+  PartialChannel, PartialMessage, RESTAware, Snowflake, TextableGuildChannel
 )
-from typing import Optional
+from logging import getLogger, Logger
+from PCBot.gamesnapshots import GameSnapshotStore
+from time import monotonic, perf_counter_ns
+from typing import Any, Awaitable, Callable, Optional
 
+logger: Logger = getLogger(__name__)
 # TODO: Is this needed?
 plugin = Plugin[GatewayBot, None]()
 
+# Called with the event and the id of the message or thread it was routed by
+ReplyHandler = Callable[[MessageCreateEvent, Snowflake], Awaitable[None]]
+
+# Minimum time in seconds between edits to a game message and between deletes
+# in a channel. Discord allows about 5 edits every 5 seconds per channel so
+# anything sent within this window is combined into a single request.
+reply_flush_interval: float = 1.0
+
+# Acknowledge game commands while creating their thread rather than before
+concurrent_thread_start: bool = False
+# Start games in the thread left by the last game of the same type in the same
+# channel, if it is not being used by another game
+reuse_game_threads: bool = False
+
+# Most games that can be waiting for guesses at once, the least recently
+# played game is expired to make room for new ones
+max_live_games: int = 500
+
 
 class GuessOutcome(Enum):
     """List of outcomes of the add_guess function for text based games."""
@@ -32,6 +60,8 @@ class TextGuessGame(ABC):
     message: Abstract[Optional[Message]]
     multiguesser: bool
     in_thread: Abstract[bool]
+    # Seconds without a guess before the game is expired
+    idle_timeout: float = 2 * 60 * 60
 
     def __init__(self, user_id: Snowflake, multiguesser: bool):
         self.user_id = user_id
@@ -47,45 +77,520 @@ class TextGuessGame(ABC):
         """Produce a string to describe the current state of the game."""
         pass
 
+    @abstractmethod
+    def get_state(self) -> Any:
+        """Produce game specific state made of builtin types for snapshots."""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def from_state(
+      cls, user_id: Snowflake, multiguesser: bool, state: Any
+    ) -> 'TextGuessGame':
+        """Recreate a game from the result of get_state."""
+        pass
+
+    async def restore_message(
+      self, app: RESTAware, channel_id: Snowflake, message_id: Snowflake
+    ) -> None:
+        """Reattach a restored game to its message."""
+        self.message = await app.rest.edit_message(
+          channel_id, message_id, str(self)
+        )
+
+    def expired_message(self) -> str:
+        """Produce a string to replace the game message with on expiry."""
+        return f'{self}\nThis game has expired due to inactivity.'
+
+    def on_expired(self) -> None:
+        """Release anything else that refers to the game once it expires.
+
+           Also used when a game is unloaded before being restored.
+        """
+        pass
+
+
+@dataclass
+class LiveGame:
+    """Ids that a game is registered under and when it was last played."""
+
+    ids: set[Snowflake]
+    last_active: float
+
+
+@dataclass
+class LatencyStats:
+    """Running summary of how long something took."""
+
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.max_ns = max(self.max_ns, elapsed_ns)
+
+    def __str__(self) -> str:
+        if self.count == 0:
+            return 'No samples'
+        average_ms: float = self.total_ns / self.count / 1e6
+        return (
+          f'{self.count} samples, average {average_ms:.3f}ms, '
+          f'max {self.max_ns / 1e6:.3f}ms'
+        )
+
+
+@dataclass
+class PendingEdit:
+    """Latest content waiting to be sent to a game message."""
+
+    message: PartialMessage
+    content: Optional[str] = None
+
+
+@dataclass
+class PendingDeletes:
+    """Guess messages waiting to be deleted from a channel."""
+
+    message_ids: list[Snowflake] = field(default_factory=list[Snowflake])
+
+
+@dataclass
+class FlushStats:
+    """Number of edits and deletes sent and avoided by coalescing them."""
+
+    edits_sent: int = 0
+    edits_saved: int = 0
+    delete_requests_sent: int = 0
+    delete_requests_saved: int = 0
+
+    def __str__(self) -> str:
+        return (
+          f'{self.edits_sent} edits sent, {self.edits_saved} saved, '
+          f'{self.delete_requests_sent} delete requests sent, '
+          f'{self.delete_requests_saved} saved'
+        )
+
 
 # Cannot assign a value here because the assignment
 # would happen every time this module is imported
 games: dict[Snowflake, TextGuessGame]
+# Each game once, ordered from least to most recently played
+live_games: OrderedDict[TextGuessGame, LiveGame]
+# Message, thread or channel id to the handler for messages routed by it
+reply_routes: dict[Snowflake, ReplyHandler]
+# Route id to the channel that messages for it arrive in
+route_channels: dict[Snowflake, Snowflake]
+# Channel id to the number of routes within it, checked for every message
+routed_channels: dict[Snowflake, int]
+# Time taken to route messages to a reply handler
+dispatch_stats: LatencyStats
+# Game name to the time taken from a command being run to its board being sent
+first_board_stats: dict[str, LatencyStats]
+# Message id to an edit that is either in progress or waiting to be sent
+pending_edits: dict[Snowflake, PendingEdit]
+# Channel id to messages that are either being deleted or waiting to be
+pending_deletes: dict[Snowflake, PendingDeletes]
+flush_stats: FlushStats
+# Channel id to the guild text channel or thread, None for other channel types
+# Kept up to date by gateway events so entries never need to be refetched
+channel_cache: dict[Snowflake, Optional[TextableGuildChannel]]
+# Parent channel id and game name to the last thread created for that game
+game_threads: dict[tuple[Snowflake, str], Snowflake]
+
+
+# Unlike the above, these are kept when resetting so games can be restored
+# Class name to each text based game class, replaced by reloaded classes
+game_types: dict[str, type[TextGuessGame]]
+snapshot_store: GameSnapshotStore
 
 
 def reset_reply_handler() -> None:
     """Reset list of text based games on bot start and reload."""
-    global games
+    global games, live_games, reply_routes, route_channels, routed_channels
+    global dispatch_stats, first_board_stats, pending_edits, pending_deletes
+    global flush_stats, channel_cache, game_threads
+    # Games are recreated by restore_games so old ones, using classes from
+    # before reloading, need to stop taking button presses
+    if 'live_games' in globals():
+        for game in live_games:
+            game.on_expired()
+
     games = {}
+    live_games = OrderedDict()
+    reply_routes = {}
+    route_channels = {}
+    routed_channels = {}
+    dispatch_stats = LatencyStats()
+    first_board_stats = {}
+    pending_edits = {}
+    pending_deletes = {}
+    flush_stats = FlushStats()
+    channel_cache = {}
+    game_threads = {}
+
+
+def add_reply_route(
+  id: Snowflake, channel_id: Snowflake, handler: ReplyHandler
+) -> None:
+    """Route replies to a message, or messages within a thread, to handler.
 
+       For threads id and channel_id are both the thread's id.
+    """
+    remove_reply_route(id)
+    reply_routes[id] = handler
+    route_channels[id] = channel_id
+    routed_channels[channel_id] = routed_channels.get(channel_id, 0) + 1
 
-def add_game(id: Snowflake, game: TextGuessGame) -> None:
-    """Start processing replies for a text based game."""
-    if 'games' not in globals():
-        reset_reply_handler()
+
+def remove_reply_route(id: Snowflake) -> None:
+    """Stop routing replies to a message or messages within a thread."""
+    reply_routes.pop(id, None)
+    channel_id: Optional[Snowflake] = route_channels.pop(id, None)
+    if channel_id is None:
+        return
+
+    remaining: int = routed_channels[channel_id] - 1
+    if remaining == 0:
+        del routed_channels[channel_id]
+    else:
+        routed_channels[channel_id] = remaining
+
+
+def register_game_type(game_type: type[TextGuessGame]) -> None:
+    """Allow snapshots of a text based game to be restored."""
+    game_types[game_type.__name__] = game_type
+
+
+def save_game(game: TextGuessGame) -> None:
+    """Update the snapshot of a game so it can be restored after a restart."""
+    live_game: Optional[LiveGame] = live_games.get(game)
+    if live_game is None or game.message is None:
+        return
+
+    snapshot: tuple[Any, ...] = (
+      type(game).__name__, int(game.user_id), game.multiguesser, game.in_thread,
+      int(game.message.channel_id), tuple(int(id) for id in live_game.ids),
+      game.get_state()
+    )
+    snapshot_store.save(game.message.id, snapshot)
+
+
+def _forget_game(game: TextGuessGame) -> Optional[LiveGame]:
+    """Stop processing replies for a game and delete its snapshot."""
+    live_game: Optional[LiveGame] = live_games.pop(game, None)
+    if live_game is None:
+        return None
+    for id in live_game.ids:
+        games.pop(id, None)
+        remove_reply_route(id)
+
+    if game.message is not None:
+        snapshot_store.remove(game.message.id)
+    return live_game
+
+
+def _register_game(
+  id: Snowflake, channel_id: Snowflake, game: TextGuessGame
+) -> None:
+    live_game: Optional[LiveGame] = live_games.get(game)
+    if live_game is None:
+        while len(live_games) >= max_live_games:
+            expire_game(next(iter(live_games)))
+        live_game = LiveGame(set(), monotonic())
+        live_games[game] = live_game
+
+    live_game.ids.add(id)
     games[id] = game
+    add_reply_route(id, channel_id, handle_text_game_reply)
+
+
+def add_game(id: Snowflake, game: TextGuessGame) -> None:
+    """Start processing replies for a text based game.
+
+       id is either the game message's id or the id of the game's thread.
+       The message id must be added last, once all ids are known.
+    """
+    if game.message is not None and game.message.id == id:
+        _register_game(id, game.message.channel_id, game)
+        save_game(game)
+    else:
+        _register_game(id, id, game)
 
 
 def remove_game(id: Snowflake) -> None:
     """Stop processing replies for a text based game."""
-    if 'games' not in globals():
+    game: Optional[TextGuessGame] = games.pop(id, None)
+    if game is None:
+        return
+    remove_reply_route(id)
+
+    live_game: Optional[LiveGame] = live_games.get(game)
+    if live_game is None:
+        return
+    live_game.ids.discard(id)
+    if len(live_game.ids) == 0:
+        _forget_game(game)
+
+
+def touch_game(game: TextGuessGame) -> None:
+    """Record that a game was just played to delay it expiring."""
+    live_game: Optional[LiveGame] = live_games.get(game)
+    if live_game is None:
         return
-    games.pop(id, None)
+    live_game.last_active = monotonic()
+    live_games.move_to_end(game)
+    save_game(game)
+
+
+async def _send_expired_message(game: TextGuessGame, message: Message) -> None:
+    """Replace a game message, and any buttons, with its expired version."""
+    try:
+        await message.edit(game.expired_message(), components=[])
+    except Exception:
+        logger.exception(f'Failed to mark game message {message.id} expired:')
+
+
+def expire_game(game: TextGuessGame) -> None:
+    """Stop processing replies for a game and tell its players why."""
+    if _forget_game(game) is None:
+        return
+
+    game.on_expired()
+    logger.info(f'Expired {type(game).__name__} for user {game.user_id}')
+
+    if game.message is not None:
+        drop_pending_edit(game.message.id)
+        create_task(_send_expired_message(game, game.message))
+
+
+async def _restore_message(
+  game: TextGuessGame, app: RESTAware, channel_id: Snowflake,
+  message_id: Snowflake
+) -> None:
+    try:
+        await game.restore_message(app, channel_id, message_id)
+    except Exception:
+        logger.exception(f'Failed to restore game message {message_id}:')
+        _forget_game(game)
+        game.on_expired()
+
+
+def restore_games(app: RESTAware) -> None:
+    """Recreate games from their snapshots after a restart or reload.
+
+       Games can take guesses once their message has been reattached, which
+       happens in the background.
+    """
+    start_ns: int = perf_counter_ns()
+    snapshots: dict[int, Any] = snapshot_store.load()
+
+    restored_count: int = 0
+    for key, snapshot in snapshots.items():
+        try:
+            (type_name, user_id, multiguesser, in_thread, channel_id, ids,
+             state) = snapshot
+            game_type: Optional[type[TextGuessGame]] = game_types.get(type_name)
+            if game_type is None:
+                # Keep the snapshot in case the plugin is fixed and reloaded
+                logger.warning(f'Unable to restore {type_name}, not loaded')
+                continue
+
+            game: TextGuessGame = game_type.from_state(
+              Snowflake(user_id), multiguesser, state
+            )
+            game.in_thread = in_thread
+        except Exception:
+            logger.exception(f'Failed to restore game {key}:')
+            snapshot_store.remove(key)
+            continue
+
+        message_id = Snowflake(key)
+        for id in ids:
+            _register_game(
+              Snowflake(id), Snowflake(channel_id if id == key else id), game
+            )
+        create_task(
+          _restore_message(game, app, Snowflake(channel_id), message_id)
+        )
+        restored_count += 1
+
+    elapsed_ms: float = (perf_counter_ns() - start_ns) / 1e6
+    logger.info(f'Restored {restored_count} games in {elapsed_ms:.3f}ms')
+
+
+def get_live_game_counts() -> Counter[str]:
+    """Provide the number of games waiting for guesses of each type."""
+    return Counter(type(game).__name__ for game in live_games)
+
+
+@plugin.include
+@tasks.loop(minutes=1)
+async def expire_idle_games() -> None:
+    """Expire games that have not been played recently."""
+    now: float = monotonic()
+    idle_games: list[TextGuessGame] = [
+      game for game, live_game in live_games.items()
+      if now - live_game.last_active >= game.idle_timeout
+    ]
+    for game in idle_games:
+        expire_game(game)
+
+    logger.debug(f'Live games: {dict(get_live_game_counts())}')
+
+
+async def _flush_edits(pending: PendingEdit) -> None:
+    """Send the latest content for a message until no more is waiting."""
+    try:
+        while pending.content is not None:
+            content: str = pending.content
+            pending.content = None
+            await pending.message.edit(content)
+            flush_stats.edits_sent += 1
+            await sleep(reply_flush_interval)
+    except Exception:
+        logger.exception(f'Failed to edit game message {pending.message.id}:')
+    finally:
+        if pending_edits.get(pending.message.id) is pending:
+            del pending_edits[pending.message.id]
+
+
+def schedule_edit(message: PartialMessage, content: str) -> None:
+    """Edit a game message, combining edits made in quick succession.
+
+       The first edit is sent straight away, later ones within
+       reply_flush_interval only send the most recent content.
+    """
+    pending: Optional[PendingEdit] = pending_edits.get(message.id)
+    if pending is None:
+        pending = PendingEdit(message, content)
+        pending_edits[message.id] = pending
+        create_task(_flush_edits(pending))
+        return
+
+    if pending.content is not None:
+        flush_stats.edits_saved += 1
+        logger.debug(f'Replaced pending edit for message {message.id}')
+    pending.content = content
+
+
+def drop_pending_edit(message_id: Snowflake) -> None:
+    """Discard any queued content after the message was updated elsewhere."""
+    pending: Optional[PendingEdit] = pending_edits.get(message_id)
+    if pending is not None and pending.content is not None:
+        pending.content = None
+        flush_stats.edits_saved += 1
+
+
+async def _flush_deletes(
+  app: RESTAware, channel_id: Snowflake, pending: PendingDeletes
+) -> None:
+    """Delete waiting messages in bulk until no more are waiting."""
+    try:
+        while len(pending.message_ids) != 0:
+            message_ids: list[Snowflake] = pending.message_ids
+            pending.message_ids = []
+            await app.rest.delete_messages(channel_id, message_ids)
+            flush_stats.delete_requests_sent += 1
+            await sleep(reply_flush_interval)
+    except Exception:
+        logger.exception(f'Failed to delete messages in {channel_id}:')
+    finally:
+        if pending_deletes.get(channel_id) is pending:
+            del pending_deletes[channel_id]
+
+
+def schedule_delete(
+  app: RESTAware, channel_id: Snowflake, message_id: Snowflake
+) -> None:
+    """Delete a guess message, combining deletes made in quick succession."""
+    pending: Optional[PendingDeletes] = pending_deletes.get(channel_id)
+    if pending is None:
+        pending = PendingDeletes([message_id])
+        pending_deletes[channel_id] = pending
+        create_task(_flush_deletes(app, channel_id, pending))
+        return
+
+    if len(pending.message_ids) != 0:
+        flush_stats.delete_requests_saved += 1
+    pending.message_ids.append(message_id)
+
+
+def cache_channel(channel: TextableGuildChannel) -> None:
+    """Remember a channel or thread the bot has just created."""
+    channel_cache[channel.id] = channel
+
+
+async def get_channel(app: RESTAware, channel_id: Snowflake)\
+  -> Optional[TextableGuildChannel]:
+    """Find a guild text channel or thread, only fetching it the first time."""
+    if channel_id in channel_cache:
+        return channel_cache[channel_id]
+
+    channel: Optional[PartialChannel] = None
+    if isinstance(app, CacheAware):
+        channel = app.cache.get_thread(channel_id)
+        if channel is None:
+            channel = app.cache.get_guild_channel(channel_id)
+    if channel is None:
+        channel = await app.rest.fetch_channel(channel_id)
+
+    text_channel: Optional[TextableGuildChannel] = (
+      channel if isinstance(channel, TextableGuildChannel) else None
+    )
+    channel_cache[channel_id] = text_channel
+    return text_channel
+
+
+def _update_cached_channel(
+  channel_id: Snowflake, channel: Optional[PartialChannel]
+) -> None:
+    """Replace a cached channel, if present, after discord reports a change."""
+    if channel_id not in channel_cache:
+        return
+    if channel is None:
+        del channel_cache[channel_id]
+    elif isinstance(channel, TextableGuildChannel):
+        channel_cache[channel_id] = channel
+    else:
+        channel_cache[channel_id] = None
+
+
+@plugin.include
+@event
+async def on_channel_update(event: GuildChannelUpdateEvent) -> None:
+    """Keep cached channels up to date."""
+    _update_cached_channel(event.channel_id, event.channel)
+
+
+@plugin.include
+@event
+async def on_channel_delete(event: GuildChannelDeleteEvent) -> None:
+    """Forget deleted channels."""
+    _update_cached_channel(event.channel_id, None)
+
+
+@plugin.include
+@event
+async def on_thread_update(event: GuildThreadUpdateEvent) -> None:
+    """Keep cached threads up to date, including renames and archiving."""
+    _update_cached_channel(event.thread_id, event.thread)
+
+
+@plugin.include
+@event
+async def on_thread_delete(event: GuildThreadDeleteEvent) -> None:
+    """Forget deleted threads."""
+    _update_cached_channel(event.thread_id, None)
 
 
-# TODO: Try ctx.channel
 async def get_interaction_channel(ctx: Context, name: str)\
   -> tuple[bool, Optional[TextableGuildChannel]]:
     """Fetch current channel and check if a thread for the current game."""
-    thread: Optional[TextableGuildChannel] = None
-    if isinstance(ctx.app, CacheAware):
-        thread = ctx.app.cache.get_thread(ctx.channel_id)
-    if thread is None:
-        fetched_thread: Optional[PartialChannel] = (
-          await ctx.app.rest.fetch_channel(ctx.channel_id)
-        )
-        if isinstance(fetched_thread, TextableGuildChannel):
-            thread = fetched_thread
+    thread: Optional[TextableGuildChannel] = (
+      await get_channel(ctx.app, ctx.channel_id)
+    )
 
     in_correct_thread: bool = (
       thread is not None and thread.type is ChannelType.GUILD_PUBLIC_THREAD
@@ -95,10 +600,66 @@ async def get_interaction_channel(ctx: Context, name: str)\
     return (in_correct_thread, thread)
 
 
+def _find_reusable_thread(
+  channel_id: Snowflake, name: str
+) -> Optional[GuildThreadChannel]:
+    """Find a thread from an earlier game that does not have a live game."""
+    thread_id: Optional[Snowflake] = game_threads.get((channel_id, name))
+    if thread_id is None or thread_id in reply_routes:
+        return None
+
+    thread: Optional[TextableGuildChannel] = channel_cache.get(thread_id)
+    if (not isinstance(thread, GuildThreadChannel) or thread.is_locked
+          or thread.name != name):
+        del game_threads[(channel_id, name)]
+        return None
+    return thread
+
+
+async def start_game_thread(ctx: Context, name: str) -> GuildThreadChannel:
+    """Acknowledge a game command and provide a thread to start it in."""
+    lower_name: str = name.casefold()
+    # TODO: Avoid this message
+    acknowledgement_text = f'Starting {lower_name} game in thread!'
+
+    thread: Optional[GuildThreadChannel] = None
+    if reuse_game_threads:
+        thread = _find_reusable_thread(ctx.channel_id, name)
+    if thread is not None:
+        await ctx.respond(acknowledgement_text, ephemeral=True)
+        return thread
+
+    if concurrent_thread_start:
+        _, thread = await gather(
+          ctx.respond(acknowledgement_text, ephemeral=True),
+          ctx.app.rest.create_thread(
+            ctx.channel_id, ChannelType.GUILD_PUBLIC_THREAD, name
+          )
+        )
+    else:
+        await ctx.respond(acknowledgement_text, ephemeral=True)
+        thread = await ctx.app.rest.create_thread(
+          ctx.channel_id, ChannelType.GUILD_PUBLIC_THREAD, name
+        )
+
+    cache_channel(thread)
+    game_threads[(ctx.channel_id, name)] = thread.id
+    return thread
+
+
+def record_first_board(name: str, start_ns: int) -> None:
+    """Record how long a game command took to send its board."""
+    elapsed_ns: int = perf_counter_ns() - start_ns
+    first_board_stats.setdefault(name, LatencyStats()).add(elapsed_ns)
+    logger.info(f'Sent {name.casefold()} board after {elapsed_ns / 1e6:.1f}ms')
+
+
 async def send_text_message(
   ctx: Context, want_thread: bool, name: str, game: TextGuessGame
 ) -> None:
     """Send game message in either the current channel or a new thread."""
+    start_ns: int = perf_counter_ns()
+
     in_correct_thread: bool
     channel: Optional[TextableGuildChannel]
     in_correct_thread, channel = await get_interaction_channel(ctx, name)
@@ -110,15 +671,7 @@ async def send_text_message(
 
     # TODO: Report want_thread being ignored if in wrong thread?
     if not in_thread and want_thread:
-        # TODO: Avoid this message
-        lower_name: str = name.casefold()
-        await ctx.respond(
-          f'Starting {lower_name} game in thread!', ephemeral=True
-        )
-
-        thread: GuildThreadChannel = await ctx.app.rest.create_thread(
-            ctx.channel_id, ChannelType.GUILD_PUBLIC_THREAD, name
-        )
+        thread: GuildThreadChannel = await start_game_thread(ctx, name)
         game.message = await thread.send(message)
 
         game.in_thread = True
@@ -131,31 +684,48 @@ async def send_text_message(
         game.message = await ctx.respond(message, ensure_message=True)
         assert game.message is not None
 
+    record_first_board(name, start_ns)
     add_game(game.message.id, game)
 
 
 @plugin.include
 @event
 async def on_message_create(event: MessageCreateEvent) -> None:
-    """Pass messages to each registered reply handler."""
-    if 'games' not in globals():
-        return
-
-    game_message: PartialMessage
-    if event.message.referenced_message is not None:
-        game_message = event.message.referenced_message
-    elif event.channel_id in games:
-        thread_message: Optional[Message] = games[event.channel_id].message
-        if thread_message is not None:
-            game_message = thread_message
-        else:
-            return
-    else:
+    """Pass messages to the reply handler registered for them, if any."""
+    # Almost every message is unrelated to a game so drop those first
+    channel_id: Snowflake = event.channel_id
+    if channel_id not in routed_channels:
+        return
+
+    start_ns: int = perf_counter_ns()
+
+    # Replies are only routed by the message they reply to, even in threads
+    referenced_message: Optional[Message] = event.message.referenced_message
+    route_id: Snowflake = (
+      channel_id if referenced_message is None else referenced_message.id
+    )
+    handler: Optional[ReplyHandler] = reply_routes.get(route_id)
+    if handler is None:
         return
 
-    if not game_message or game_message.id not in games:
+    await handler(event, route_id)
+
+    elapsed_ns: int = perf_counter_ns() - start_ns
+    dispatch_stats.add(elapsed_ns)
+    logger.debug(f'Dispatched message {event.message_id} in {elapsed_ns}ns')
+
+
+async def handle_text_game_reply(
+  event: MessageCreateEvent, route_id: Snowflake
+) -> None:
+    """Pass a message to the text based game it was routed to."""
+    game_info: Optional[TextGuessGame] = games.get(route_id)
+    if game_info is None:
+        return
+
+    game_message: Optional[Message] = game_info.message
+    if game_message is None:
         return
-    game_info: TextGuessGame = games[game_message.id]
 
     if (not game_info.multiguesser
           and event.message.author.id != game_info.user_id):
@@ -180,5 +750,17 @@ async def on_message_create(event: MessageCreateEvent) -> None:
     elif outcome is type(outcome).Invalid:
         return
 
-    await game_message.edit(str(game_info))
-    await event.message.delete()
+    # Rendering straight away lets games that have now ended stop taking
+    # guesses, only sending the message waits
+    content: str = str(game_info)
+    touch_game(game_info)
+    schedule_edit(game_message, content)
+    schedule_delete(event.app, event.channel_id, event.message_id)
+
+
+# Only build the routing index the first time this module is imported so that
+# reloading it, including the reload straight after loading, keeps any games
+if 'games' not in globals():
+    reset_reply_handler()
+    game_types = {}
+    snapshot_store = GameSnapshotStore()
@@ -6,6 +6,7 @@ import os.path
 from cffi import FFI
 from crescent.ext import docstrings
 from enum import Enum
+from PCBot.plugins.replyhandler import add_reply_route, remove_reply_route
 from typing import Any, Optional
 
 if (not os.path.isfile('GameData.json') or not os.path.isfile('game.so')
@@ -155,6 +156,7 @@ async def handle_output(message: hikari.Message):
     if (not succeeded):
         gamelib.CleanupGame(game)
         games.pop(message.id, None)
+        remove_reply_route(message.id)
         await message.edit("Unable to get game state")
         return
 
@@ -191,26 +193,18 @@ async def handle_input(message: hikari.Message, input_index: int, input_str: str
         case InputOutcome.QuitGame:
             gamelib.CleanupGame(game)
             games.pop(message.id, None)
+            remove_reply_route(message.id)
             await message.edit('The game is over!')
 
 
-@plugin.include
-@crescent.event
-async def on_game_message_create(event: hikari.MessageCreateEvent):
-    """Handle users replying to game messages."""
-    if event.message.referenced_message is None:
-        return
+async def on_game_reply(
+  event: hikari.MessageCreateEvent, message_id: hikari.Snowflake
+):
+    """Handle users replying to game messages, routed by replyhandler."""
     game_message = event.message.referenced_message
-
-    if game_message.author == hikari.undefined.UNDEFINED:
-        return
-
-    if game_message.author.id != plugin.app.get_me().id:
-        return
-
-    if game_message.id not in games:
+    if game_message is None or message_id not in games:
         return
-    game = games[game_message.id]
+    game = games[message_id]
 
     input_index = 0
     input_str = ''
@@ -256,4 +250,5 @@ class TextCommand:
 
         message = await ctx.respond('Setting up game', ensure_message=True)
         games[message.id] = ffi.new("struct GameState *")
+        add_reply_route(message.id, message.channel_id, on_game_reply)
         await handle_output(message)
@@ -6,6 +6,7 @@ import crescent
 from hikari import Message, MessageCreateEvent, GatewayBot
 from hikari.snowflakes import Snowflake
 from PCBot.PCGame import backend_ActionScreen, backend_GameState, backend_ScreenActionOutcome
+from PCBot.plugins.replyhandler import add_reply_route, remove_reply_route
 
 
 plugin = crescent.Plugin[GatewayBot, None]()
@@ -48,21 +49,16 @@ async def handle_input(message: Message, index: int) -> None:
         case backend_ScreenActionOutcome.QuitGame:
             await message.edit('Game is over')
             del games[message.id]
+            remove_reply_route(message.id)
         case _:
             await message.edit('Unable to process selected action')
 
 # TODO: Reuse hangman input method with thread support
-@plugin.include
-@crescent.event
-async def on_game_message_create(event: MessageCreateEvent) -> None:
-    """Handle users replying to game messages."""
+async def on_game_reply(event: MessageCreateEvent, message_id: Snowflake) -> None:
+    """Handle users replying to game messages, routed by replyhandler."""
     game_message = event.message.referenced_message
-    if game_message is None:
-        return
-
-    if game_message.id not in games:
+    if game_message is None or message_id not in games:
         return
-    game = games[game_message.id]
 
     user_input = event.message.content.replace(' ', '')
     if not user_input.isdigit():
@@ -89,4 +85,5 @@ class TextCommand:
 
         message = await ctx.respond('Setting up game', ensure_message=True)
         games[message.id] = backend_GameState()
+        add_reply_route(message.id, message.channel_id, on_game_reply)
         await handle_output(message)
@@ -9,10 +9,11 @@ from hikari import (
 )
 from logging import getLogger, Logger
 from random import choice, sample
-from string import ascii_lowercase
-from typing import Optional
+from typing import Any, Optional
+from PCBot.guessparsing import parse_word_guess, ParsedGuess
 from PCBot.plugins.replyhandler import (
-  GuessOutcome, remove_game, send_text_message, TextGuessGame
+  GuessOutcome, register_game_type, remove_game, send_text_message,
+  TextGuessGame
 )
 
 logger: Logger = getLogger(__name__)
@@ -95,10 +96,10 @@ class WordManipulationGame(TextGuessGame):
             return GuessOutcome.Invalid
 
         """Add a guess if it was not already made and reports any issues."""
-        processed_guess: str = guess.strip().casefold()
-
-        if set(processed_guess) - set(ascii_lowercase) != set():
+        parsed_guess: Optional[ParsedGuess] = parse_word_guess(guess)
+        if parsed_guess is None:
             return GuessOutcome.Invalid
+        processed_guess: str = parsed_guess.text
 
         if processed_guess in self.guesses:
             return GuessOutcome.AlreadyMade
@@ -106,6 +107,24 @@ class WordManipulationGame(TextGuessGame):
         self.guesses.append(processed_guess)
         return GuessOutcome.Valid
 
+    def get_state(self) -> Any:
+        """Produce the words, minigame and guesses for snapshots."""
+        return (
+          self.word, self.manipulated_word, self.minigame.name, self.guesses
+        )
+
+    @classmethod
+    def from_state(
+      cls, user_id: Snowflake, multiguesser: bool, state: Any
+    ) -> 'WordManipulationGame':
+        """Recreate a word manipulation game from a snapshot."""
+        game = cls.__new__(cls)
+        TextGuessGame.__init__(game, user_id, multiguesser)
+        game.word, game.manipulated_word, minigame, guesses = state
+        game.minigame = Minigame[minigame]
+        game.guesses = list(guesses)
+        return game
+
     def _get_guess_info(self, guess: str) -> str:
         info: str = ''
 
@@ -168,6 +187,9 @@ class WordManipulationGame(TextGuessGame):
         return status + '```'
 
 
+register_game_type(WordManipulationGame)
+
+
 @plugin.include
 @docstrings.parse_doc
 @command(name='words')
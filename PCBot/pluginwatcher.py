@@ -0,0 +1,183 @@
+"""This module contains the file watcher used to reload plugins on save."""
+# pyright: strict
+
+from asyncio import Event, get_running_loop, sleep, TimeoutError, wait_for
+from crescent import Client
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from logging import getLogger, Logger
+from os import close, O_CLOEXEC, O_NONBLOCK, read, stat_result
+from pathlib import Path
+from struct import Struct
+from time import perf_counter
+from typing import Optional
+import PCBot.pluginmanager as pluginmanager
+
+logger: Logger = getLogger(__name__)
+
+# Wait for saves to stop for this long before reloading
+debounce_interval: float = 0.2
+# How often to check plugin files when inotify is not available
+poll_interval: float = 0.5
+
+# From linux/inotify.h
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_DELETE_SELF: int = 0x00000400
+inotify_mask: int = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO \
+                    | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+inotify_event = Struct('iIII')
+
+
+class InotifyWatcher:
+    """Signal changes to python files in a set of directories using inotify."""
+
+    changed: Event
+    fd: int
+
+    def __init__(self, directories: list[Path]):
+        libc_name: Optional[str] = find_library('c')
+        if libc_name is None:
+            raise OSError('Unable to find libc')
+        libc: CDLL = CDLL(libc_name, use_errno=True)
+
+        self.fd = libc.inotify_init1(O_NONBLOCK | O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(get_errno(), 'inotify_init1 failed')
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, str(directory).encode(),
+                                      inotify_mask) < 0:
+                close(self.fd)
+                raise OSError(get_errno(), f'Unable to watch {directory}')
+
+        self.changed = Event()
+        get_running_loop().add_reader(self.fd, self._read_events)
+
+    def _read_events(self) -> None:
+        try:
+            data: bytes = read(self.fd, 64 * inotify_event.size + 4096)
+        except BlockingIOError:
+            return
+
+        offset: int = 0
+        while offset + inotify_event.size <= len(data):
+            mask: int
+            length: int
+            _, mask, _, length = inotify_event.unpack_from(data, offset)
+            offset += inotify_event.size
+            name: bytes = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            # Skip editor swap and backup files
+            if name.endswith(b'.py') or mask & IN_DELETE_SELF:
+                self.changed.set()
+
+    async def wait(self) -> None:
+        """Wait until a file changes."""
+        await self.changed.wait()
+        self.changed.clear()
+
+    def close(self) -> None:
+        get_running_loop().remove_reader(self.fd)
+        close(self.fd)
+
+
+class PollingWatcher:
+    """Signal changes to python files in a set of directories by polling."""
+
+    directories: list[Path]
+    files: dict[Path, tuple[int, int]]
+
+    def __init__(self, directories: list[Path]):
+        self.directories = directories
+        self.files = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        files: dict[Path, tuple[int, int]] = {}
+        for directory in self.directories:
+            for file_path in directory.glob('*.py'):
+                try:
+                    stats: stat_result = file_path.stat()
+                except OSError:
+                    continue
+                files[file_path] = (stats.st_mtime_ns, stats.st_size)
+        return files
+
+    async def wait(self) -> None:
+        """Wait until a file changes."""
+        while True:
+            await sleep(poll_interval)
+            files: dict[Path, tuple[int, int]] = self._scan()
+            if files != self.files:
+                self.files = files
+                return
+
+    def close(self) -> None:
+        pass
+
+
+async def reload_changed_plugins(client: Client, path: str) -> None:
+    """Reload plugins that changed, logging how long it took."""
+    start_time: float = perf_counter()
+    # Pick up changes to the plugin manager itself, same as /reload
+    pluginmanager.reload_plugin_manager()
+    changed_plugins: set[str] = pluginmanager.get_changed_plugins(path)
+    if not changed_plugins:
+        return
+
+    plugins = client.plugins
+    pluginmanager.reload_handlers(plugins, changed_plugins)
+    await pluginmanager.reload_plugins(plugins, path,
+                                       plugin_paths=changed_plugins)
+    pluginmanager.restore_handlers(plugins, client.app, changed_plugins)
+    reload_time: float = perf_counter() - start_time
+
+    failed_plugins: list[str] = sorted(
+      plugin_path for plugin_path in changed_plugins
+      if plugin_path not in plugins.plugins
+      and plugin_path in pluginmanager.plugin_fingerprints
+    )
+    if failed_plugins:
+        logger.warning(f'Auto reload failed for {", ".join(failed_plugins)}')
+    logger.info(f'Auto reloaded {", ".join(sorted(changed_plugins))} in '
+                f'{reload_time * 1000:.1f} ms')
+
+    if await pluginmanager.register_commands(client):
+        logger.info('Reregistered commands')
+
+
+async def watch_plugins(client: Client, path: str) -> None:
+    """Reload plugins whenever their files are saved, runs until cancelled."""
+    plugin_folder: Path = Path(*path.split('.'))
+    directories: list[Path] = [plugin_folder] + sorted(
+      directory for directory in plugin_folder.glob('**/')
+      if directory != plugin_folder and directory.name != '__pycache__'
+    )
+
+    watcher: InotifyWatcher | PollingWatcher
+    try:
+        watcher = InotifyWatcher(directories)
+        logger.info(f'Watching {plugin_folder} for changes using inotify')
+    except (AttributeError, OSError) as error:
+        watcher = PollingWatcher(directories)
+        logger.info(f'Watching {plugin_folder} for changes using polling as '
+                    f'inotify is not available: {error}')
+
+    try:
+        while True:
+            await watcher.wait()
+            # Editors often write several times per save
+            while True:
+                try:
+                    await wait_for(watcher.wait(), debounce_interval)
+                except TimeoutError:
+                    break
+
+            try:
+                await reload_changed_plugins(client, path)
+            except Exception:
+                logger.exception('An error occurred while auto reloading:')
+    finally:
+        watcher.close()
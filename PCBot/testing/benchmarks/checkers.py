@@ -0,0 +1,224 @@
+"""This module contains benchmarks for checkers move generation and search.
+
+   Run with python -m PCBot.testing.benchmarks.checkers
+"""
+
+import random
+from asyncio import get_running_loop, run, sleep
+from concurrent.futures import ThreadPoolExecutor
+from tabulate import tabulate
+from time import perf_counter
+from typing import Callable, Optional
+from PCBot.checkersai import find_best_move, SearchResult, TranspositionTable
+from PCBot.checkersengine import (
+  apply_move, board_size, CheckersMove, CheckersMovePath, CheckersPosition,
+  get_jumps, get_legal_moves, get_simple_moves, initial_position
+)
+from PCBot.plugins.checkers import (
+  CheckersBoard, CheckersBoardCell, CheckersBoardPosition, CheckersPlayer,
+  CheckersTokenType
+)
+
+games = 50
+repeats = 20
+search_positions = 6
+search_seconds = 0.5
+
+ValidMoves = dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]]
+
+
+def old_get_valid_moves(
+  board: list[list[CheckersBoardCell]], player: CheckersPlayer,
+  repeated_capture: bool
+) -> ValidMoves:
+    """Find moves the way CheckersBoard did before it used bitboards."""
+    valid_moves: ValidMoves = {}
+    for row in range(board_size):
+        for column in range(board_size):
+            cell: CheckersBoardCell = board[row][column]
+            moves: set[tuple[bool, CheckersBoardPosition]] = set()
+            if cell.player is not player:
+                continue
+
+            directions: list[tuple[int, int]] = []
+            if cell.can_move_up():
+                directions += [(-1, -1), (-1, 1)]
+            if cell.can_move_down():
+                directions += [(1, -1), (1, 1)]
+
+            for row_step, column_step in directions:
+                next_row: int = row + row_step
+                next_column: int = column + column_step
+                if not (0 <= next_row < board_size and
+                        0 <= next_column < board_size):
+                    continue
+                next_cell: CheckersBoardCell = board[next_row][next_column]
+                if next_cell.token is CheckersTokenType.EMPTY:
+                    if not repeated_capture:
+                        moves.add(
+                          (False, CheckersBoardPosition(next_row, next_column))
+                        )
+                    continue
+                next_row += row_step
+                next_column += column_step
+                if (next_cell.player is not player and
+                    0 <= next_row < board_size and
+                    0 <= next_column < board_size and
+                    board[next_row][next_column].token
+                      is CheckersTokenType.EMPTY):
+                    moves.add(
+                      (True, CheckersBoardPosition(next_row, next_column))
+                    )
+
+            if len(moves) > 0:
+                valid_moves[CheckersBoardPosition(row, column)] = moves
+    return valid_moves
+
+
+def play_games() -> list[tuple[CheckersPosition, bool]]:
+    """Play random games, returning every position and who was to move."""
+    positions: list[tuple[CheckersPosition, bool]] = []
+    for _ in range(games):
+        position: CheckersPosition = initial_position
+        player1_to_move: bool = True
+        for _ in range(200):
+            positions.append((position, player1_to_move))
+            moves: list[CheckersMove] = (
+              get_jumps(position, player1_to_move) or
+              get_simple_moves(position, player1_to_move)
+            )
+            if len(moves) == 0:
+                break
+            position = apply_move(
+              position, player1_to_move, random.choice(moves)
+            ).position
+            player1_to_move = not player1_to_move
+    return positions
+
+
+def time_per_position(
+  positions: list[tuple[CheckersPosition, bool]],
+  generate: Callable[[CheckersPosition, bool], object]
+) -> float:
+    """Time generate for every position, returning µs per position."""
+    start_time: float = perf_counter()
+    for _ in range(repeats):
+        for position, player1_to_move in positions:
+            generate(position, player1_to_move)
+    total: float = perf_counter() - start_time
+    return total / repeats / len(positions) * 1e6
+
+
+async def time_searches(
+  positions: list[tuple[CheckersPosition, bool]]
+) -> list[tuple[int, str, int, str, str]]:
+    """Search each position on another thread while measuring how late the
+       event loop wakes up from short sleeps."""
+    table = TranspositionTable()
+    rows: list[tuple[int, str, int, str, str]] = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for move_number, (position, player1_to_move) in enumerate(positions):
+            search_future = get_running_loop().run_in_executor(
+              executor, find_best_move, table, position, player1_to_move, None,
+              search_seconds
+            )
+            max_lag: float = 0
+            while not search_future.done():
+                sleep_start: float = perf_counter()
+                await sleep(0.001)
+                max_lag = max(max_lag, perf_counter() - sleep_start - 0.001)
+            result: SearchResult = search_future.result()
+            rows.append((
+              move_number, f'{result.seconds:.2f}', result.depth,
+              f'{result.nodes / result.seconds:.0f}', f'{max_lag * 1000:.1f}'
+            ))
+    return rows
+
+
+def main() -> None:
+    uncached_legal_moves: Callable[
+      [CheckersPosition, bool, Optional[int]], tuple[CheckersMovePath, ...]
+    ] = get_legal_moves.__wrapped__
+    random.seed(0)
+    positions: list[tuple[CheckersPosition, bool]] = play_games()
+
+    board = CheckersBoard()
+    old_boards: dict[CheckersPosition, list[list[CheckersBoardCell]]] = {}
+    for position, _ in positions:
+        board.position = position
+        old_boards[position] = [
+          [board.get_cell(row, column) for column in range(board_size)]
+          for row in range(board_size)
+        ]
+
+    def get_player(player1_to_move: bool) -> CheckersPlayer:
+        if player1_to_move:
+            return CheckersPlayer.PLAYER1
+        return CheckersPlayer.PLAYER2
+
+    def old_view(position: CheckersPosition, player1_to_move: bool) -> ValidMoves:
+        valid_moves: ValidMoves = old_get_valid_moves(
+          old_boards[position], get_player(player1_to_move), False
+        )
+        # Captures are mandatory
+        captures: ValidMoves = {
+          token: {move for move in moves if move[0]}
+          for token, moves in valid_moves.items()
+          if any(move[0] for move in moves)
+        }
+        return captures or valid_moves
+
+    def new_view(position: CheckersPosition, player1_to_move: bool) -> ValidMoves:
+        board.position = position
+        return board.get_valid_moves(get_player(player1_to_move))
+
+    def legal_moves(
+      position: CheckersPosition, player1_to_move: bool
+    ) -> tuple[CheckersMovePath, ...]:
+        return uncached_legal_moves(position, player1_to_move, None)
+
+    def bitboards(
+      position: CheckersPosition, player1_to_move: bool
+    ) -> list[CheckersMove]:
+        return (get_jumps(position, player1_to_move) +
+                get_simple_moves(position, player1_to_move))
+
+    for position, player1_to_move in positions:
+        if old_view(position, player1_to_move) != \
+          new_view(position, player1_to_move):
+            raise Exception(f'Move generators disagree on {position}')
+
+    old_time: float = time_per_position(positions, old_view)
+    rows: list[tuple[str, str, str]] = [
+      ('Board of cells', f'{old_time:.2f}', '1.0x')
+    ]
+    for name, generate in (('Bitboard move list', bitboards),
+                           ('Legal moves', legal_moves),
+                           ('Cached legal moves dict view', new_view)):
+        new_time: float = time_per_position(positions, generate)
+        rows.append(
+          (name, f'{new_time:.2f}', f'{old_time / new_time:.1f}x')
+        )
+
+    print(f'{len(positions)} positions from {games} random games')
+    print(tabulate(
+      rows, headers=['Generator', 'µs per position', 'Speedup'],
+      disable_numparse=True
+    ))
+
+    # Positions from the first game, spread from the start to the end
+    first_game: list[tuple[CheckersPosition, bool]] = positions[
+      :positions.index((initial_position, True), 1)
+    ]
+    step: int = max(1, len(first_game) // search_positions)
+    print(f'\nBot searches of {search_seconds}s on another thread')
+    print(tabulate(
+      run(time_searches(first_game[::step][:search_positions])),
+      headers=['Position', 'Seconds', 'Depth', 'Nodes per second',
+               'Max event loop lag ms'],
+      disable_numparse=True
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""This module contains benchmarks for checkers PDN and the game archive.
+
+   Run with python -m PCBot.testing.benchmarks.checkersarchive
+"""
+
+import random
+from hikari import Snowflake
+from miru.ext.menu import Menu
+from os.path import join
+from tabulate import tabulate
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable
+from PCBot.checkersarchive import CheckersArchive, CheckersHeadToHead
+from PCBot.checkersengine import (
+  apply_path, CheckersMovePath, CheckersPosition, get_legal_moves,
+  initial_position
+)
+from PCBot.checkerspdn import (
+  format_move, PdnGame, player1_win_result, player2_win_result, read_pdn,
+  to_pdn_square, write_pdn
+)
+from PCBot.plugins.checkers import CheckersInputMethod, CheckersScreen
+
+games = 200
+archive_sizes = [1000, 10000, 100000]
+users = 50
+queries = 10000
+
+
+def play_game() -> tuple[list[CheckersMovePath], CheckersPosition, str]:
+    """Play random moves until someone can't move or 200 moves are made."""
+    position: CheckersPosition = initial_position
+    player1_to_move: bool = True
+    moves: list[CheckersMovePath] = []
+    result: str = '*'
+    for _ in range(200):
+        legal_moves: tuple[CheckersMovePath, ...] = get_legal_moves(
+          position, player1_to_move
+        )
+        if len(legal_moves) == 0:
+            result = (player2_win_result if player1_to_move
+                      else player1_win_result)
+            break
+        path: CheckersMovePath = random.choice(legal_moves)
+        moves.append(path)
+        position = apply_path(position, player1_to_move, path)
+        player1_to_move = not player1_to_move
+    return moves, position, result
+
+
+def time_per_game(texts: list[str], action: Callable[[str], object]) -> float:
+    """Run action on every text, returning µs per game."""
+    start_time: float = perf_counter()
+    for text in texts:
+        action(text)
+    return (perf_counter() - start_time) / len(texts) * 1e6
+
+
+def replay(text: str) -> None:
+    screen = CheckersScreen(Menu(), Snowflake(1), Snowflake(2), False)
+    screen.game.load_pdn(read_pdn(text), CheckersInputMethod.PDN)
+
+
+def main() -> None:
+    random.seed(0)
+    played: list[tuple[list[CheckersMovePath], CheckersPosition, str]] = [
+      play_game() for _ in range(games)
+    ]
+
+    start_time: float = perf_counter()
+    texts: list[str] = [
+      write_pdn({'Black': 'a', 'White': 'b'}, moves, result)
+      for moves, _, result in played
+    ]
+    write_time: float = (perf_counter() - start_time) / games * 1e6
+
+    shortened: int = 0
+    for text, (moves, position, result) in zip(texts, played):
+        pdn: PdnGame = read_pdn(text)
+        if list(pdn.moves) != moves or pdn.position != position or \
+          pdn.result != result:
+            raise Exception(f'PDN did not round trip:\n{text}')
+        # Multi-jumps can be written as just the first and last square if no
+        # other capture joins them
+        before: CheckersPosition = initial_position
+        player1_to_move: bool = True
+        for path in moves:
+            if len(path) > 2 and [
+              legal_move[0] == path[0] and legal_move[-1] == path[-1]
+              for legal_move in get_legal_moves(before, player1_to_move)
+            ].count(True) == 1:
+                short: str = text.replace(
+                  format_move(path),
+                  f'{to_pdn_square(path[0])}x{to_pdn_square(path[-1])}'
+                )
+                if read_pdn(short).position != position:
+                    raise Exception(f'Shortened PDN did not match:\n{short}')
+                shortened += 1
+                break
+            before = apply_path(before, player1_to_move, path)
+            player1_to_move = not player1_to_move
+
+    move_count: int = sum(len(moves) for moves, _, _ in played)
+    print(f'{games} random games of {move_count / games:.0f} moves on '
+          f'average, {shortened} also read with shortened multi-jumps')
+    print(tabulate(
+      [('Write', f'{write_time:.0f}'),
+       ('Read and check moves', f'{time_per_game(texts, read_pdn):.0f}'),
+       ('Replay into a game', f'{time_per_game(texts, replay):.0f}')],
+      headers=['PDN', 'µs per game'], disable_numparse=True
+    ))
+
+    rows: list[tuple[int, str, str, str]] = []
+    with TemporaryDirectory() as directory:
+        for size in archive_sizes:
+            games_path: str = join(directory, f'{size}.pdn')
+            index_path: str = join(directory, f'{size}.idx')
+            archive = CheckersArchive(games_path, index_path)
+            start_time = perf_counter()
+            for game_id in range(size):
+                player1_id, player2_id = random.sample(range(users), 2)
+                archive.add(
+                  texts[game_id % games], game_id, player1_id, player2_id,
+                  random.randrange(3), len(played[game_id % games][0])
+                )
+            add_time: float = (perf_counter() - start_time) / size * 1e6
+            archive.close()
+
+            loaded = CheckersArchive(games_path, index_path)
+            start_time = perf_counter()
+            loaded.load()
+            load_time: float = perf_counter() - start_time
+            if loaded.entries != archive.entries:
+                raise Exception(f'Archive of {size} games did not reload')
+            if loaded.read_game(size - 1) != texts[(size - 1) % games]:
+                raise Exception(f'Archive of {size} games lost a game')
+
+            start_time = perf_counter()
+            for _ in range(queries):
+                stats: CheckersHeadToHead = loaded.get_head_to_head(
+                  *random.sample(range(users), 2)
+                )
+                assert stats.games >= stats.wins + stats.losses
+            query_time: float = (perf_counter() - start_time) / queries * 1e6
+            rows.append((
+              size, f'{add_time:.1f}', f'{load_time * 1000:.1f}',
+              f'{query_time:.2f}'
+            ))
+
+    print(f'\nArchives of games between {users} users')
+    print(tabulate(
+      rows,
+      headers=['Games', 'Add µs per game', 'Load ms', 'Head to head µs'],
+      disable_numparse=True
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""This module contains perft checks and benchmarks for checkers moves.
+
+   Perft counts every position reached after playing each legal move to a
+   depth, which is compared to published counts for the starting position.
+
+   Run with python -m PCBot.testing.benchmarks.checkersperft
+"""
+
+from hikari import Snowflake
+from miru.ext.menu import Menu
+from tabulate import tabulate
+from time import perf_counter
+from typing import Callable, Optional
+from PCBot.checkersengine import (
+  apply_path, CheckersMovePath, CheckersPosition, get_legal_moves,
+  initial_position
+)
+from PCBot.plugins.checkers import (
+  CheckersBoardPosition, CheckersGame, CheckersGameStatus, CheckersInputMethod,
+  CheckersPlayer, CheckersScreen
+)
+
+# Starting position counts for English draughts, a multi-jump is one move
+expected_counts = [
+  1, 7, 49, 302, 1469, 7361, 36768, 179740, 845931, 3963680
+]
+max_depth = 8
+game_depth = 4
+
+MoveGenerator = Callable[
+  [CheckersPosition, bool, Optional[int]], tuple[CheckersMovePath, ...]
+]
+
+
+def perft(
+  generate: MoveGenerator, position: CheckersPosition, player1_to_move: bool,
+  depth: int
+) -> int:
+    if depth == 0:
+        return 1
+    moves: tuple[CheckersMovePath, ...] = generate(
+      position, player1_to_move, None
+    )
+    if depth == 1:
+        return len(moves)
+    return sum(
+      perft(generate, apply_path(position, player1_to_move, path),
+            not player1_to_move, depth - 1)
+      for path in moves
+    )
+
+
+def game_perft(game: CheckersGame, depth: int) -> int:
+    """Count positions by making each step through CheckersGame, checking
+       that its moves agree with the legal move generator."""
+    if depth == 0:
+        return 1
+
+    player: CheckersPlayer = game.player
+    chain: Optional[int] = game.get_chain()
+    first_steps: set[tuple[int, int]] = {
+      (path[0], path[1]) for path in get_legal_moves(
+        game.board.position, player is CheckersPlayer.PLAYER1, chain
+      )
+    }
+    position: CheckersPosition = game.board.position
+    repeated_capture: bool = game.repeated_capture
+    # The chain is found from the last target
+    last_target: Optional[CheckersBoardPosition] = game._last_target  # pyright: ignore [reportPrivateUsage]
+
+    count: int = 0
+    steps: int = 0
+    for token, targets in list(game.get_valid_moves().items()):
+        for _, target in targets:
+            steps += 1
+            game.make_move(token, target, CheckersInputMethod.REPLY)
+            # A multi-jump is a single move
+            count += game_perft(
+              game, depth if game.player is player else depth - 1
+            )
+            game.board.position = position
+            game.player = player
+            game.repeated_capture = repeated_capture
+            game._last_target = last_target  # pyright: ignore [reportPrivateUsage]
+            game.status = CheckersGameStatus.STARTED
+
+    if steps != len(first_steps):
+        raise Exception(f'Game allows {steps} steps instead of '
+                        f'{len(first_steps)} in {game.board.position}')
+    return count
+
+
+def time_perft(generate: MoveGenerator, depth: int) -> tuple[int, float]:
+    start_time: float = perf_counter()
+    count: int = perft(generate, initial_position, True, depth)
+    return count, perf_counter() - start_time
+
+
+def main() -> None:
+    uncached_generator: MoveGenerator = get_legal_moves.__wrapped__
+
+    rows: list[tuple[int, int, str, str, str, str]] = []
+    for depth in range(1, max_depth + 1):
+        get_legal_moves.cache_clear()
+        uncached_count, uncached_time = time_perft(uncached_generator, depth)
+        cached_count, cached_time = time_perft(get_legal_moves, depth)
+        for count in (uncached_count, cached_count):
+            if count != expected_counts[depth]:
+                raise Exception(f'Perft {depth} found {count} positions '
+                                f'instead of {expected_counts[depth]}')
+        hits: int = get_legal_moves.cache_info().hits
+        rows.append((
+          depth, cached_count, f'{uncached_time * 1000:.1f}',
+          f'{cached_time * 1000:.1f}',
+          f'{hits / (hits + get_legal_moves.cache_info().misses):.0%}',
+          f'{cached_count / cached_time / 1000:.0f}'
+        ))
+
+    print(tabulate(
+      rows,
+      headers=['Depth', 'Positions', 'Uncached ms', 'Cached ms',
+               'Cache hits', 'Thousand positions per second'],
+      disable_numparse=True
+    ))
+
+    screen = CheckersScreen(Menu(), Snowflake(1), Snowflake(2), False)
+    start_time: float = perf_counter()
+    count: int = game_perft(screen.game, game_depth)
+    if count != expected_counts[game_depth]:
+        raise Exception(f'Game perft {game_depth} found {count} positions '
+                        f'instead of {expected_counts[game_depth]}')
+    print(f'\nGame perft {game_depth} matched {count} positions in '
+          f'{(perf_counter() - start_time) * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""This module contains benchmarks for drawing checkers boards.
+
+   Run with python -m PCBot.testing.benchmarks.checkersrendering
+"""
+
+import random
+from colorama import Back, Fore, Style
+from tabulate import tabulate
+from time import perf_counter
+from typing import Callable, Optional
+from PCBot.checkersengine import (
+  apply_path, board_size, CheckersMovePath, CheckersPosition, get_legal_moves,
+  initial_position
+)
+from PCBot.plugins.checkers import (
+  CheckersBoard, CheckersBoardCell, CheckersBoardPosition, CheckersPlayer,
+  CheckersScreenStage, CheckersTokenType, square_positions
+)
+
+games = 20
+repeats = 20
+
+ValidMoves = dict[CheckersBoardPosition, set[tuple[bool, CheckersBoardPosition]]]
+# Position, stage, selected token and moves shown
+Frame = tuple[
+  CheckersPosition, CheckersScreenStage, Optional[CheckersBoardPosition],
+  ValidMoves
+]
+
+
+def old_get_board(
+  board: CheckersBoard, stage: CheckersScreenStage,
+  token: Optional[CheckersBoardPosition], legacy: bool, valid_moves: ValidMoves
+) -> str:
+    """Convert a board into a string the way CheckersBoard did before it
+       cached rows."""
+    board_message: str = '```ansi\n'
+
+    target_positions: Optional[set[CheckersBoardPosition]] = None
+    if stage is CheckersScreenStage.TARGET and token in valid_moves:
+        target_positions = {move[1] for move in valid_moves[token]}
+
+    # Three-per-em space
+    cell_padding = ' '
+    # Thin space
+    # Used for regular chars(letters and space)
+    full_padding: str = cell_padding + ' '
+
+    underline: str
+    reset_underline: str
+    reset_all: str
+    if legacy:
+        underline = ''
+        reset_underline = ''
+        reset_all = ''
+    else:
+        # ESC[1;2m and ESC[22m, neither are in colorama as it doesn't do style
+        underline = '[1;2m'
+        reset_underline = '[22m'
+        reset_all = Style.RESET_ALL
+
+
+    board_message += reset_all + underline + '  '
+    for column in range(board_size):
+        column_letter: str = chr(ord('A') + column)
+        board_message += full_padding + column_letter + full_padding
+
+    for row in range(board_size):
+        row_number = str(board_size - row)
+        board_message += '\n' + reset_all
+        board_message += underline + row_number + reset_underline
+        board_message += ' '
+
+        for column in range(board_size):
+            cell: CheckersBoardCell = board.get_cell(row, column)
+            position = CheckersBoardPosition(row, column)
+
+            highlight_token: bool = (
+              stage is CheckersScreenStage.TOKEN and
+              position in valid_moves
+            )
+
+            highlight_cell: bool = (
+              target_positions is not None and
+              position in target_positions
+            )
+
+            if not legacy:
+                match cell.player:
+                    case CheckersPlayer.PLAYER1:
+                        if highlight_token:
+                            board_message += Fore.CYAN
+                        else:
+                            board_message += Fore.BLUE
+                    case CheckersPlayer.PLAYER2:
+                        if highlight_token:
+                            board_message += Fore.MAGENTA
+                        else:
+                            board_message += Fore.RED
+                    case None:
+                        pass
+
+                if row % 2 == column % 2:
+                    board_message += Back.WHITE
+                elif highlight_cell:
+                    board_message += Back.BLUE # Gray on Discord
+                else:
+                    board_message += Back.BLACK # Firefly dark blue on Discord
+
+            if cell.token is CheckersTokenType.EMPTY:
+                board_message += full_padding + ' ' + full_padding
+            else:
+                board_message += cell_padding
+                if (cell.token is CheckersTokenType.REGULAR and
+                      cell.player is CheckersPlayer.PLAYER1):
+                    # Bold Circled White Bullet
+                    board_message += underline + '⦾' + reset_underline
+                elif (cell.token is CheckersTokenType.KING and
+                      cell.player is CheckersPlayer.PLAYER1):
+                    # White Chess King
+                    board_message += '♔'
+                elif (cell.token is CheckersTokenType.REGULAR and
+                      cell.player is CheckersPlayer.PLAYER2):
+                    # Bold Circled Bullet
+                    board_message += underline + '⦿' + reset_underline
+                elif (cell.token is CheckersTokenType.KING and
+                      cell.player is CheckersPlayer.PLAYER2):
+                    # Black Chess King
+                    board_message += '♚'
+                board_message += cell_padding
+
+    return board_message + '```'
+
+
+def play_games() -> list[Frame]:
+    """Play random games, returning the board shown after each button press,
+       first when picking a token and then when picking its target."""
+    board = CheckersBoard()
+    frames: list[Frame] = []
+    for _ in range(games):
+        position: CheckersPosition = initial_position
+        player1_to_move: bool = True
+        for _ in range(200):
+            moves: tuple[CheckersMovePath, ...] = get_legal_moves(
+              position, player1_to_move
+            )
+            if len(moves) == 0:
+                break
+            board.position = position
+            valid_moves: ValidMoves = dict(board.get_valid_moves(
+              CheckersPlayer.PLAYER1 if player1_to_move
+                else CheckersPlayer.PLAYER2
+            ))
+            path: CheckersMovePath = random.choice(moves)
+            frames.append(
+              (position, CheckersScreenStage.TOKEN, None, valid_moves)
+            )
+            frames.append((
+              position, CheckersScreenStage.TARGET, square_positions[path[0]],
+              valid_moves
+            ))
+            position = apply_path(position, player1_to_move, path)
+            player1_to_move = not player1_to_move
+    return frames
+
+
+def time_renderer(
+  frames: list[Frame], legacy: bool,
+  render: Callable[[CheckersBoard, Frame, bool], str]
+) -> float:
+    """Draw every frame in order, returning µs per frame."""
+    board = CheckersBoard()
+    start_time: float = perf_counter()
+    for _ in range(repeats):
+        for frame in frames:
+            render(board, frame, legacy)
+    total: float = perf_counter() - start_time
+    return total / repeats / len(frames) * 1e6
+
+
+def old_render(board: CheckersBoard, frame: Frame, legacy: bool) -> str:
+    board.position = frame[0]
+    return old_get_board(board, frame[1], frame[2], legacy, frame[3])
+
+
+def new_render(board: CheckersBoard, frame: Frame, legacy: bool) -> str:
+    board.position = frame[0]
+    return board.get_board(frame[1], frame[2], legacy, frame[3])
+
+
+def uncached_render(board: CheckersBoard, frame: Frame, legacy: bool) -> str:
+    """Draw with a new board each time so that every row is redrawn."""
+    return new_render(CheckersBoard(), frame, legacy)
+
+
+def main() -> None:
+    random.seed(0)
+    frames: list[Frame] = play_games()
+
+    rows: list[tuple[str, str, str, str]] = []
+    for legacy in (False, True):
+        board = CheckersBoard()
+        for frame in frames:
+            if old_render(board, frame, legacy) != \
+              new_render(board, frame, legacy):
+                raise Exception(f'Renderers disagree on {frame[0]}')
+
+        old_time: float = time_renderer(frames, legacy, old_render)
+        rows.append(
+          ('Rebuild every cell', 'Yes' if legacy else 'No', f'{old_time:.1f}',
+           '1.0x')
+        )
+        for name, render in (('Cell fragments', uncached_render),
+                             ('Cell fragments and cached rows', new_render)):
+            new_time: float = time_renderer(frames, legacy, render)
+            rows.append((
+              name, 'Yes' if legacy else 'No', f'{new_time:.1f}',
+              f'{old_time / new_time:.1f}x'
+            ))
+
+    print(f'{len(frames)} boards from {games} random games')
+    print(tabulate(
+      rows, headers=['Renderer', 'Legacy', 'µs per board', 'Speedup'],
+      disable_numparse=True
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""This module contains benchmarks for the text game guess parsers.
+
+   Run with python -m PCBot.testing.benchmarks.guessparsing
+"""
+
+from re import IGNORECASE, search
+from string import ascii_lowercase
+from tabulate import tabulate
+from time import perf_counter
+from typing import Any, Callable, Optional
+from PCBot.guessparsing import (
+  parse_checkers_guess, parse_letter_guess, parse_minesweeper_guess,
+  parse_number_guess, parse_word_guess
+)
+
+repeats = 2000
+
+# Messages seen in game threads, mostly chat with the odd move for each game
+chat_messages = [
+  'gg', 'lol', 'nice', 'oh no', 'wait what', 'how do I play this?',
+  'I think it is the one on the left', ':(', '<@123456789012345678> your turn',
+  'https://en.wikipedia.org/wiki/Minesweeper_(video_game)',
+  'Can someone explain the rules again, I have never played checkers before '
+  'and the buttons are confusing me a bit',
+  '😂😂😂', '```python\nprint("hello")\n```', 'brb', 'ok', '50/50 guess time',
+  'hint?', 'is it b7', 'c3 d4 is a bad move'
+]
+move_messages = [
+  'C7', 'fB2', ' f b 2 ', 'hint', 'AX50', 'c3 d4', 'C3,D4', 'e', 'Q', '1234',
+  '  9876 ', 'apple', 'Banana '
+]
+messages = chat_messages * 3 + move_messages
+
+
+def old_minesweeper(guess: str) -> Optional[Any]:
+    """Parse a guess the way MinesweeperGame did before guessparsing."""
+    if guess.strip().lower() == 'hint':
+        return 'hint'
+    regex: str = r'^\s*(f?)\s*([a-z]{1,2})\s*(\d{1,2})\s*$'
+    guess_matches = search(regex, guess, IGNORECASE)
+    if not guess_matches:
+        return None
+    guess_groups: tuple[str, ...] = guess_matches.groups()
+    column: int = 0
+    for char in guess_groups[1].upper():
+        column = column * 26 + ord(char) - ord('A') + 1
+    return guess_groups[0].lower(), column - 1, int(guess_groups[2]) - 1
+
+
+def old_checkers(guess: str) -> Optional[Any]:
+    """Parse a guess the way CheckersGame did before guessparsing."""
+    regex: str = r'^\s*([a-h][1-8])\s*[,\s]\s*([a-h][1-8])\s*$'
+    guess_matches = search(regex, guess, IGNORECASE)
+    if not guess_matches:
+        return None
+    guess_groups: tuple[str, ...] = guess_matches.groups()
+    return (
+      8 - int(guess_groups[0][1]), ord(guess_groups[0][0].upper()) - ord('A'),
+      8 - int(guess_groups[1][1]), ord(guess_groups[1][0].upper()) - ord('A')
+    )
+
+
+def old_letter(guess: str) -> Optional[Any]:
+    """Parse a guess the way HangmanGame did before guessparsing."""
+    if len(guess) != 1:
+        return None
+    processed_guess = guess.casefold().replace(' ', '')[0]
+    if processed_guess not in ascii_lowercase:
+        return None
+    return processed_guess
+
+
+def old_number(guess: str) -> Optional[Any]:
+    """Parse a guess the way MastermindGame did before guessparsing."""
+    processed_guess: str = guess.strip()
+    if not processed_guess.isdecimal():
+        return None
+    return processed_guess
+
+
+def old_word(guess: str) -> Optional[Any]:
+    """Parse a guess the way WordGame did before guessparsing."""
+    processed_guess: str = guess.strip().casefold()
+    if set(processed_guess) - set(ascii_lowercase) != set():
+        return None
+    return processed_guess
+
+
+parsers: list[tuple[str, Callable[[str], Optional[Any]],
+                    Callable[[str], Optional[Any]]]] = [
+  ('Minesweeper', old_minesweeper, parse_minesweeper_guess),
+  ('Checkers', old_checkers, parse_checkers_guess),
+  ('Hangman', old_letter, parse_letter_guess),
+  ('Mastermind', old_number, parse_number_guess),
+  ('Word games', old_word, parse_word_guess)
+]
+
+
+def time_parser(parse: Callable[[str], Optional[Any]]) -> tuple[float, int]:
+    """Time parsing every message, returning ns per message and how many
+       messages were moves."""
+    moves: int = sum(parse(message) is not None for message in messages)
+    start_time: float = perf_counter()
+    for _ in range(repeats):
+        for message in messages:
+            parse(message)
+    total: float = perf_counter() - start_time
+    return total / repeats / len(messages) * 1e9, moves
+
+
+def main() -> None:
+    rows: list[tuple[str, int, str, str, str]] = []
+    for name, old_parse, new_parse in parsers:
+        old_time, old_moves = time_parser(old_parse)
+        new_time, new_moves = time_parser(new_parse)
+        if old_moves != new_moves:
+            raise Exception(f'{name} parsers accept different messages: '
+                            f'{old_moves} != {new_moves}')
+        rows.append((
+          name, new_moves, f'{old_time:.0f}', f'{new_time:.0f}',
+          f'{old_time / new_time:.1f}x'
+        ))
+
+    print(f'{len(messages)} messages, {len(move_messages)} of them moves')
+    print(tabulate(
+      rows, headers=['Game', 'Moves', 'Old ns', 'New ns', 'Speedup'],
+      disable_numparse=True
+    ))
+
+
+if __name__ == '__main__':
+    main()
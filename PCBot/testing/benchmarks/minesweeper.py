@@ -0,0 +1,273 @@
+"""This module contains benchmarks for the minesweeper grid.
+
+   Run with python -m PCBot.testing.benchmarks.minesweeper
+"""
+
+import random
+import sys
+from random import randrange
+from tabulate import tabulate
+from time import perf_counter
+from typing import Callable, Optional
+from PCBot.minesweepersolver import get_adjacent_cells
+from PCBot.plugins.minesweeper import (
+  bomb_cell_value, covered_state, MinesweeperGame, MinesweeperGameStatus,
+  MinesweeperGrid, MinesweeperInputMethod, MinesweeperMoveLog,
+  MinesweeperOption, revealed_state
+)
+
+grid_sizes = [13, 25, 50]
+# Low enough that the first reveal floods most of the grid
+bomb_density = 0.05
+repeats = 200
+# Fractions of the cells away from the first reveal that are bombs
+generation_densities = [0.1, 0.5, 0.9]
+generation_sizes = [13, 50]
+generation_repeats = 50
+no_guess_densities = [0.1, 0.15, 0.2]
+no_guess_repeats = 20
+replay_sizes = [9, 13, 50]
+replay_repeats = 20
+
+
+def recursive_reveal_cell(
+  grid: MinesweeperGrid, row: int, column: int, flooding: bool = False
+) -> None:
+    """Reveal cells the way MinesweeperGrid did before using a queue."""
+    idx: int = row * grid.size + column
+    if grid.states[idx] != covered_state:
+        if flooding:
+            return
+        raise Exception(f'Cell ({row}, {column}) is not covered')
+
+    grid.states[idx] = revealed_state
+    grid.revealed_count += 1
+    if grid.adjacent_bombs[idx] == bomb_cell_value:
+        grid.revealed_bomb = True
+
+    if grid.adjacent_bombs[idx] == 0:
+        for adjacent_row in range(max(row - 1, 0), min(row + 2, grid.size)):
+            for adjacent_column in range(max(column - 1, 0),
+                                         min(column + 2, grid.size)):
+                recursive_reveal_cell(grid, adjacent_row, adjacent_column, True)
+
+
+def queue_reveal_cell(grid: MinesweeperGrid, row: int, column: int) -> None:
+    grid.reveal_cell(row, column)
+
+
+def make_grid(size: int) -> MinesweeperGrid:
+    grid = MinesweeperGrid(size, int(size * size * bomb_density))
+    grid._generate_mines(0, 0)  # pyright: ignore [reportPrivateUsage]
+    return grid
+
+
+def time_reveal(
+  grid: MinesweeperGrid,
+  reveal: Callable[[MinesweeperGrid, int, int], None]
+) -> tuple[float, int]:
+    """Time revealing the top left cell, returning ms per reveal and cells."""
+    initial_states = bytes([covered_state]) * (grid.size * grid.size)
+    total: float = 0
+    for _ in range(repeats):
+        grid.states[:] = initial_states
+        grid.revealed_count = 0
+        start_time: float = perf_counter()
+        reveal(grid, 0, 0)
+        total += perf_counter() - start_time
+    return total / repeats * 1000, grid.revealed_count
+
+
+def rejection_generate_mines(
+  grid: MinesweeperGrid, except_row: int, except_column: int
+) -> None:
+    """Place bombs the way MinesweeperGrid did before sampling them."""
+    grid.adjacent_bombs = bytearray(grid.size * grid.size)
+    grid.bomb_cells = []
+    for _ in range(grid.bomb_count):
+        while True:
+            row: int = randrange(grid.size)
+            column: int = randrange(grid.size)
+
+            if (abs(row - except_row) <= 1
+                and abs(column - except_column) <= 1):
+                    continue
+
+            if grid.adjacent_bombs[row * grid.size + column] \
+              != bomb_cell_value:
+                break
+
+        grid.adjacent_bombs[row * grid.size + column] = bomb_cell_value
+        grid.bomb_cells.append(row * grid.size + column)
+
+        for adjacent_idx in \
+          get_adjacent_cells(grid.size)[row * grid.size + column]:
+            if grid.adjacent_bombs[adjacent_idx] != bomb_cell_value:
+                grid.adjacent_bombs[adjacent_idx] += 1
+
+    grid.generated_mines = True
+
+
+def sample_generate_mines(
+  grid: MinesweeperGrid, except_row: int, except_column: int
+) -> None:
+    grid._generate_mines(  # pyright: ignore [reportPrivateUsage]
+      except_row, except_column
+    )
+
+
+def time_generation(
+  size: int, bomb_count: int,
+  generate: Callable[[MinesweeperGrid, int, int], None], no_guess: bool,
+  repeats: int
+) -> tuple[float, int]:
+    """Time generating grids from the centre, returning ms per grid and how
+       many of them could be solved without guessing."""
+    total: float = 0
+    solvable: int = 0
+    for _ in range(repeats):
+        grid = MinesweeperGrid(size, bomb_count, no_guess)
+        start_time: float = perf_counter()
+        generate(grid, size // 2, size // 2)
+        total += perf_counter() - start_time
+        solvable += grid.solvable_without_guessing
+    return total / repeats * 1000, solvable
+
+
+def benchmark_reveal() -> None:
+    rows: list[tuple[str, int, str, str, str]] = []
+    for size in grid_sizes:
+        grid: MinesweeperGrid = make_grid(size)
+        recursive_time, recursive_cells = time_reveal(
+          grid, recursive_reveal_cell
+        )
+        queue_time, queue_cells = time_reveal(grid, queue_reveal_cell)
+        if recursive_cells != queue_cells:
+            raise Exception(f'Reveals differ for {size}x{size}: '
+                            f'{recursive_cells} != {queue_cells}')
+        rows.append((
+          f'{size}x{size}', queue_cells, f'{recursive_time:.3f}',
+          f'{queue_time:.3f}', f'{recursive_time / queue_time:.1f}x'
+        ))
+
+    print(tabulate(
+      rows, headers=['Grid', 'Cells', 'Recursive ms', 'Queue ms', 'Speedup'],
+      disable_numparse=True
+    ))
+
+
+def benchmark_generation() -> None:
+    rows: list[tuple[str, int, str, str, str]] = []
+    for size in generation_sizes:
+        for density in generation_densities:
+            bomb_count: int = int((size * size - 9) * density)
+            rejection_time, _ = time_generation(
+              size, bomb_count, rejection_generate_mines, False,
+              generation_repeats
+            )
+            sample_time, _ = time_generation(
+              size, bomb_count, sample_generate_mines, False,
+              generation_repeats
+            )
+            rows.append((
+              f'{size}x{size}', bomb_count, f'{rejection_time:.3f}',
+              f'{sample_time:.3f}', f'{rejection_time / sample_time:.1f}x'
+            ))
+
+    print(tabulate(
+      rows, headers=['Grid', 'Bombs', 'Rejection ms', 'Sample ms', 'Speedup'],
+      disable_numparse=True
+    ))
+
+
+def benchmark_no_guess_generation() -> None:
+    rows: list[tuple[str, int, str, str]] = []
+    for size in generation_sizes:
+        for density in no_guess_densities:
+            bomb_count: int = int(size * size * density)
+            no_guess_time, solvable = time_generation(
+              size, bomb_count, sample_generate_mines, True, no_guess_repeats
+            )
+            rows.append((
+              f'{size}x{size}', bomb_count, f'{no_guess_time:.3f}',
+              f'{solvable / no_guess_repeats:.0%}'
+            ))
+
+    print(tabulate(
+      rows, headers=['Grid', 'Bombs', 'No guess ms', 'Solvable'],
+      disable_numparse=True
+    ))
+
+
+def play_full_game(size: int) -> MinesweeperGame:
+    """Win a game by flagging every bomb and revealing cells in a random
+       order, like a player that never guesses wrong."""
+    game = MinesweeperGame(0, False, size, int(size * size * 0.15))
+    game.make_move(size // 2, size // 2, MinesweeperOption.REVEAL,
+                   MinesweeperInputMethod.REPLY)
+    cells: list[int] = list(range(size * size))
+    random.shuffle(cells)
+    for idx in cells:
+        if game.status is not MinesweeperGameStatus.STARTED:
+            break
+        row, column = divmod(idx, size)
+        if game.grid.get_cell_bomb_status(row, column):
+            game.make_move(row, column, MinesweeperOption.FLAG,
+                           MinesweeperInputMethod.REPLY)
+        elif not game.grid.get_cell_revealed_status(row, column):
+            game.make_move(row, column, MinesweeperOption.REVEAL,
+                           MinesweeperInputMethod.REPLY)
+    if game.status is not MinesweeperGameStatus.WON:
+        raise Exception(f'Full {size}x{size} game was not won')
+    return game
+
+
+def benchmark_replay() -> None:
+    rows: list[tuple[str, int, int, str, int, str]] = []
+    for size in replay_sizes:
+        game: MinesweeperGame = play_full_game(size)
+        move_log: Optional[MinesweeperMoveLog] = game.get_move_log()
+        assert move_log is not None
+        log_bytes: bytes = move_log.to_bytes()
+
+        total: float = 0
+        for _ in range(replay_repeats):
+            replayed = MinesweeperGame(
+              0, False, move_log.size, move_log.bomb_count, move_log.no_guess
+            )
+            start_time: float = perf_counter()
+            replayed.load_move_log(MinesweeperMoveLog.from_bytes(log_bytes))  # pyright: ignore [reportArgumentType]
+            total += perf_counter() - start_time
+            if replayed.grid.get_cells() != game.grid.get_cells():
+                raise Exception(f'Replay of {size}x{size} game differs')
+
+        rows.append((
+          f'{size}x{size}', len(move_log.moves) // 2, len(log_bytes),
+          f'{len(move_log.moves) / (len(move_log.moves) // 2):.1f}',
+          len(game.grid.get_cells()), f'{total / replay_repeats * 1000:.3f}'
+        ))
+
+    print(tabulate(
+      rows,
+      headers=['Grid', 'Moves', 'Log bytes', 'Bytes per move', 'Cell bytes',
+               'Replay ms'],
+      disable_numparse=True
+    ))
+
+
+def main() -> None:
+    random.seed(0)
+    # The recursive version needs a stack frame per flooded cell
+    sys.setrecursionlimit(10000)
+
+    benchmark_reveal()
+    print()
+    benchmark_generation()
+    print()
+    benchmark_no_guess_generation()
+    print()
+    benchmark_replay()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""This module contains benchmarks for the minesweeper leaderboard store.
+
+   Run with python -m PCBot.testing.benchmarks.minesweeperleaderboard
+"""
+
+import random
+from pathlib import Path
+from tabulate import tabulate
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from PCBot.minesweeperleaderboard import (
+  MinesweeperLeaderboard, MinesweeperResult
+)
+
+history_sizes = [1000, 10000, 100000]
+# Common boards get most games, like the command defaults
+boards = [(9, 5)] * 5 + [(9, 10), (13, 30), (16, 40), (30, 99)]
+query_repeats = 10000
+add_repeats = 1000
+
+
+def make_result() -> MinesweeperResult:
+    size, bomb_count = random.choice(boards)
+    return MinesweeperResult(
+      random.randrange(5000, 600000), random.randrange(1700000000, 1800000000),
+      random.randrange(1, 200), size, bomb_count, random.randrange(5, 200)
+    )
+
+
+def main() -> None:
+    random.seed(0)
+
+    rows: list[tuple[int, str, str, str]] = []
+    for history_size in history_sizes:
+        with TemporaryDirectory() as directory:
+            path: str = str(Path(directory) / 'results.bin')
+            store = MinesweeperLeaderboard(path)
+            for _ in range(history_size):
+                store.add(make_result())
+            store.close()
+
+            store = MinesweeperLeaderboard(path)
+            start_time: float = perf_counter()
+            store.load()
+            load_time: float = perf_counter() - start_time
+
+            start_time = perf_counter()
+            for _ in range(query_repeats):
+                store.get_ranking(9, 5)
+            query_time: float = (perf_counter() - start_time) / query_repeats
+
+            start_time = perf_counter()
+            for _ in range(add_repeats):
+                store.add(make_result())
+            add_time: float = (perf_counter() - start_time) / add_repeats
+            store.close()
+
+        rows.append((
+          history_size, f'{load_time * 1000:.1f}', f'{query_time * 1e6:.2f}',
+          f'{add_time * 1e6:.1f}'
+        ))
+
+    print(tabulate(
+      rows, headers=['Results', 'Load ms', 'Top 10 query µs', 'Add µs'],
+      disable_numparse=True
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""This module contains benchmarks for the minesweeper solver.
+
+   Run with python -m PCBot.testing.benchmarks.minesweepersolver
+"""
+
+import random
+from tabulate import tabulate
+from time import perf_counter
+from typing import Optional
+from PCBot.minesweepersolver import get_hint, SolverHint
+from PCBot.plugins.minesweeper import (
+  flagged_state, MinesweeperGrid, revealed_state
+)
+
+grid_size = 13
+bomb_counts = [20, 30, 40]
+games = 50
+
+
+def play_game(
+  size: int, bomb_count: int, hint_times: list[float]
+) -> tuple[bool, int]:
+    """Play a game by following hints, returning if it was won and how many
+       hints were guesses."""
+    grid = MinesweeperGrid(size, bomb_count)
+    grid.reveal_cell(size // 2, size // 2)
+    guesses: int = 0
+    while not grid.check_game_lost() and not grid.check_game_won():
+        revealed: list[bool] = [state == revealed_state for state in grid.states]
+        flagged: list[bool] = [state == flagged_state for state in grid.states]
+        start_time: float = perf_counter()
+        hint: Optional[SolverHint] = get_hint(
+          size, grid.adjacent_bombs, revealed, flagged, bomb_count
+        )
+        hint_times.append(perf_counter() - start_time)
+        if hint is None:
+            break
+
+        row, column = divmod(hint.cell, size)
+        if hint.bomb_probability == 1:
+            grid.toggle_cell_flagged_status(row, column)
+            continue
+        if hint.bomb_probability != 0:
+            guesses += 1
+        if grid.get_cell_flagged_status(row, column):
+            grid.toggle_cell_flagged_status(row, column)
+        grid.reveal_cell(row, column)
+    return grid.check_game_won(), guesses
+
+
+def main() -> None:
+    random.seed(0)
+
+    rows: list[tuple[str, int, str, str, str, str]] = []
+    for bomb_count in bomb_counts:
+        hint_times: list[float] = []
+        wins: int = 0
+        guesses: int = 0
+        for _ in range(games):
+            won, game_guesses = play_game(grid_size, bomb_count, hint_times)
+            wins += won
+            guesses += game_guesses
+        rows.append((
+          f'{grid_size}x{grid_size}', bomb_count,
+          f'{sum(hint_times) / len(hint_times) * 1000:.3f}',
+          f'{max(hint_times) * 1000:.3f}', f'{guesses / games:.1f}',
+          f'{wins / games:.0%}'
+        ))
+
+    print(tabulate(
+      rows,
+      headers=['Grid', 'Bombs', 'Mean hint ms', 'Max hint ms',
+               'Guesses per game', 'Won'],
+      disable_numparse=True
+    ))
+
+
+if __name__ == '__main__':
+    main()